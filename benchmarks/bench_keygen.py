@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark in-process keypair generation against the old openssl pipeline
+
+Usage: python3 benchmarks/bench_keygen.py [--count N] [--verify N]
+
+The legacy path spawns `openssl ecparam -genkey` and `openssl ec -pubout`
+per key, as /api/deadman/generate-keys used to. --verify cross-checks N
+in-process public keys against openssl's derivation of the same secrets.
+"""
+
+import argparse
+import base64
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kaspa_tools import keys
+
+OPENSSL_GENKEY = ["openssl", "ecparam", "-genkey", "-name", "secp256k1"]
+OPENSSL_PUBOUT = ["openssl", "ec", "-pubout"]
+
+# ECPrivateKey DER around a 32-byte secret, with the secp256k1 curve OID
+_EC_PRIVATE_KEY_HEAD = bytes.fromhex("302e0201010420")
+_EC_PRIVATE_KEY_TAIL = bytes.fromhex("a00706052b8104000a")
+
+
+def legacy_keypair():
+    """The two-process openssl pipeline the dashboard used before"""
+    priv_pem = subprocess.run(OPENSSL_GENKEY, capture_output=True, timeout=10).stdout
+    pub_pem = subprocess.run(OPENSSL_PUBOUT, input=priv_pem, capture_output=True, timeout=10).stdout
+    lines = pub_pem.decode().split("\n")
+    return base64.b64decode("".join(l for l in lines if not l.startswith("-----")))
+
+
+def legacy_keypairs(count):
+    return [legacy_keypair() for _ in range(count)]
+
+
+def openssl_public_key(secret):
+    """Uncompressed public key openssl derives for secret"""
+    der = _EC_PRIVATE_KEY_HEAD + secret + _EC_PRIVATE_KEY_TAIL
+    result = subprocess.run(
+        ["openssl", "ec", "-inform", "DER", "-pubout", "-outform", "DER"],
+        input=der, capture_output=True, timeout=10, check=True,
+    )
+    return result.stdout[-65:]
+
+
+def bench(name, fn, count):
+    start = time.perf_counter()
+    fn(count)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<12} {count / elapsed:>12,.0f} keys/s  ({elapsed * 1000 / count:.2f} ms/key)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200, help="keypairs per run (default: 200)")
+    parser.add_argument("--verify", type=int, default=5, help="keys to cross-check with openssl (default: 5)")
+    args = parser.parse_args()
+
+    backend = "coincurve" if keys.coincurve is not None else "pure Python"
+    print(f"Generating {args.count:,} keypairs (in-process backend: {backend})")
+    legacy = bench("openssl", legacy_keypairs, args.count)
+    native = bench("in-process", keys.generate_keypairs, args.count)
+    print(f"  speedup      {legacy / native:.2f}x")
+
+    for secret, compressed in keys.generate_keypairs(args.verify):
+        expected = openssl_public_key(secret)
+        if keys.public_key(secret, compressed=False) != expected or compressed[1:] != expected[1:33]:
+            sys.exit(f"public key mismatch for {secret.hex()}")
+    if args.verify:
+        print(f"  verified     {args.verify} keys against openssl")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass log classifier against the old per-line loop
+
+Usage: python3 benchmarks/bench_logparse.py [LOG_FILE] [--lines N]
+
+Without LOG_FILE a synthetic kaspad log of N lines is generated.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kaspa_tools.logparse import LogMetrics
+
+
+def synthetic_log(n, seed=12):
+    """Generate n lines shaped like rusty-kaspa's INFO output"""
+    rng = random.Random(seed)
+    daa = 80_000_000
+    lines = []
+    for _ in range(n):
+        ts = "2026-02-14 06:26:12.123+00:00"
+        kind = rng.random()
+        if kind < 0.55:
+            daa += rng.randint(1, 12)
+            block_hash = "%064x" % rng.getrandbits(256)
+            lines.append(f"{ts} [INFO ] Accepted {rng.randint(1, 12)} blocks ...{block_hash[-16:]} via relay\n")
+        elif kind < 0.65:
+            lines.append(f"{ts} [INFO ] Tx throughput stats: {rng.uniform(0, 300):.2f} u-tps, {rng.uniform(0, 100):.2f}% e-tps (in: 12 via RPC, 3 via P2P, out: 15 via accepted blocks)\n")
+        elif kind < 0.72:
+            lines.append(f"{ts} [INFO ] DAA score: {daa}\n")
+        elif kind < 0.75:
+            lines.append(f"{ts} [INFO ] Block count: {daa // 2}, Header count: {daa // 2 + 3}, Difficulty: {rng.uniform(1e6, 1e7):.2f}\n")
+        elif kind < 0.76:
+            lines.append(f"{ts} [INFO ] Pruning point: {'%064x' % rng.getrandbits(256)}\n")
+        else:
+            lines.append(f"{ts} [INFO ] Processed {rng.randint(50, 150)} blocks and {rng.randint(50, 150)} headers in the last 10.00s (1200 transactions; 120 UTXO-validated blocks; 9.50 parents; 8.20 mergeset; 10.10 TPB; 22.1 mass)\n")
+    return lines
+
+
+def legacy_parse(lines):
+    """The per-line substring + re.search loop the dashboard used before"""
+    stats = {"blockCount": 0, "headerCount": 0, "difficulty": 0, "daaScore": 0, "blueScore": 0,
+             "pruningPoint": "", "blockRate": 0, "txRate": 0, "recentBlocks": []}
+    for line in reversed(lines):
+        if "Block count:" in line and not stats["blockCount"]:
+            match = re.search(r'Block count:\s*(\d+)', line)
+            if match:
+                stats["blockCount"] = int(match.group(1))
+        if "Header count:" in line and not stats["headerCount"]:
+            match = re.search(r'Header count:\s*(\d+)', line)
+            if match:
+                stats["headerCount"] = int(match.group(1))
+        if "Difficulty:" in line and not stats["difficulty"]:
+            match = re.search(r'Difficulty:\s*([\d.]+)', line)
+            if match:
+                stats["difficulty"] = float(match.group(1))
+        if "DAA score:" in line:
+            match = re.search(r'DAA score:\s*(\d+)', line)
+            if match:
+                stats["blueScore"] = int(match.group(1))
+                stats["daaScore"] = int(match.group(1))
+        if "Pruning point:" in line and not stats["pruningPoint"]:
+            match = re.search(r'Pruning point:\s*([a-f0-9]+)', line)
+            if match:
+                stats["pruningPoint"] = match.group(1)[:16] + "..."
+        if "Accepted" in line and "blocks" in line:
+            match = re.search(r'Accepted\s+(\d+)\s+blocks\s+\.\.\.([a-f0-9]+)', line)
+            if match:
+                stats["blockRate"] = int(match.group(1))
+                block_hash = match.group(2)
+                if block_hash not in [b['hash'] for b in stats["recentBlocks"]]:
+                    stats["recentBlocks"].append({
+                        "hash": block_hash[:16] + "...",
+                        "fullHash": block_hash,
+                        "blueScore": stats["blueScore"]
+                    })
+                    if len(stats["recentBlocks"]) > 10:
+                        stats["recentBlocks"] = stats["recentBlocks"][:10]
+        if "Tx throughput" in line:
+            match = re.search(r'([\d.]+)\s+u-tps', line)
+            if match:
+                stats["txRate"] = float(match.group(1))
+    return stats
+
+
+def classifier_parse(lines):
+    metrics = LogMetrics(recent_blocks=10)
+    metrics.feed(lines)
+    return metrics.snapshot()
+
+
+def bench(name, fn, lines, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(lines)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<12} {len(lines) / best:>14,.0f} lines/s  ({best * 1000:.1f} ms)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log_file", nargs="?", help="kaspad log to parse (default: synthetic)")
+    parser.add_argument("--lines", type=int, default=500_000, help="synthetic log size (default: 500000)")
+    args = parser.parse_args()
+
+    if args.log_file:
+        with open(args.log_file, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    else:
+        lines = synthetic_log(args.lines)
+
+    print(f"Parsing {len(lines):,} lines")
+    legacy = bench("legacy", legacy_parse, lines)
+    single = bench("classifier", classifier_parse, lines)
+    print(f"  speedup      {legacy / single:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
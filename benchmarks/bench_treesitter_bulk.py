@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk SilverScript parsing against the one-Parser-per-file loop
+
+Usage: python3 benchmarks/bench_treesitter_bulk.py [DIR ...] [--copies N] [--workers N]
+
+Needs the tree-sitter-silverscript binding installed with its "core"
+extra (pip install ./tree-sitter[core]). Without DIR the .sil examples
+in this repo are used, repeated --copies times to make a corpus.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from tree_sitter import Language, Parser
+
+import tree_sitter_silverscript as ts
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def naive_loop(sources):
+    """What consumers do today: a fresh Parser per file, one core"""
+    summaries = []
+    for path, data in sources:
+        parser = Parser(Language(ts.language()))
+        summaries.append(ts.summarize(parser.parse(data), path))
+    return summaries
+
+
+def bench(name, fn, count, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<16} {count / best:>10,.0f} files/s  ({best * 1000:.1f} ms)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dirs", nargs="*", help="directories of .sil files (default: repo examples)")
+    parser.add_argument("--copies", type=int, default=20, help="times to repeat the corpus (default: 20)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="pool size (default: CPU count)")
+    args = parser.parse_args()
+
+    dirs = args.dirs or [REPO_ROOT / "silverscript-lang" / "tests" / "examples", REPO_ROOT]
+    paths = sorted({str(p) for d in dirs for p in Path(d).glob("*.sil")})
+    if not paths:
+        sys.exit("no .sil files found")
+    sources = [(path, Path(path).read_bytes()) for path in paths] * args.copies
+    count = len(sources)
+
+    print(f"Parsing {count:,} sources ({len(paths)} distinct, {args.workers} workers)")
+    naive = bench("naive loop", lambda: naive_loop(sources), count)
+    reused = bench("reused parser", lambda: list(ts.parse_many(sources, workers=1)), count)
+    pooled = bench("process pool", lambda: list(ts.parse_many(sources, workers=args.workers)), count)
+    print(f"  parser reuse     {naive / reused:.2f}x")
+    print(f"  pool vs naive    {naive / pooled:.2f}x")
+
+    assert naive_loop(sources[:len(paths)]) == list(ts.parse_many(sources[:len(paths)], workers=args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental reparsing (EditSession) against a full parse per keystroke
+
+Usage: python3 benchmarks/bench_treesitter_edit.py [--functions N ...] [--edits N]
+
+Needs the tree-sitter-silverscript binding installed with its "core"
+extra (pip install ./tree-sitter[core]). A contract with N functions is
+generated and a character is typed into the middle of it and deleted
+again, --edits times.
+"""
+
+import argparse
+import time
+
+from tree_sitter import Language, Parser
+
+import tree_sitter_silverscript as ts
+
+FUNCTION = """
+    entrypoint function spend{i}(sig s, int amount) {{
+        require(amount > {i});
+        require(checkSig(s, owner));
+    }}
+"""
+
+
+def make_contract(functions):
+    body = "".join(FUNCTION.format(i=i) for i in range(functions))
+    return f"pragma silverscript ^0.1.0;\n\ncontract Big(pubkey owner) {{{body}}}\n".encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--functions", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    full_parser = Parser(Language(ts.language()))
+    print(f"{'functions':>10} {'bytes':>10} {'full parse':>12} {'incremental':>12} {'speedup':>8}")
+    for functions in args.functions:
+        source = make_contract(functions)
+        offset = source.index(b"require(amount", len(source) // 2)
+
+        session = ts.EditSession(source)
+        start = time.perf_counter()
+        for _ in range(args.edits):
+            session.edit(offset, offset, b"x")
+            session.edit(offset, offset + 1, b"")
+        incremental = (time.perf_counter() - start) / (2 * args.edits)
+        assert session.text == source and not session.diagnostics
+
+        start = time.perf_counter()
+        for _ in range(args.edits):
+            typed = source[:offset] + b"x" + source[offset:]
+            full_parser.parse(typed)
+            full_parser.parse(source)
+        full = (time.perf_counter() - start) / (2 * args.edits)
+
+        print(f"{functions:>10,} {len(source):>10,} {full * 1e3:>10.3f}ms {incremental * 1e3:>10.3f}ms {full / incremental:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
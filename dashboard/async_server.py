@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+asyncio serving mode for the Kaspa Dashboard
+
+Same routes as server.py, served by Quart on one event loop. Node RPC
+goes over non-blocking streams and rothschild runs through
+asyncio.create_subprocess_exec, so a slow probe never ties up a worker
+and many dashboard and API clients can be served while probes are in
+flight. Stats composition, history, the deadman watcher and the request
+helpers come from kaspa_tools.dashboard, shared with server.py; the
+blocking collector listeners run on worker threads, not the loop.
+
+    pip install quart
+    python3 dashboard/async_server.py
+"""
+
+import asyncio
+import os
+import sys
+
+try:
+    from quart import Quart, Response, jsonify, make_response, render_template, request
+except ImportError:
+    sys.exit("The async dashboard needs Quart: pip install quart (or run server.py)")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kaspa_tools.aiorpc import AsyncRpcClient, utxos_by_addresses
+from kaspa_tools.collector import StatsCollector
+from kaspa_tools.dashboard import (
+    PORT, ROTHSCHILD_BIN, STATS_INTERVALS, STREAM_KEEPALIVE, WALLET_KEY, DashboardState, bulk_args_format,
+    bulk_args_lines, bulk_args_params, compose_stats, count_peers, create_args_request, generate_keys_request,
+    kaspad_running, log_request, metrics_text, rothschild_node_info,
+)
+from kaspa_tools.events import format_sse
+from kaspa_tools.metrics import CONTENT_TYPE
+from kaspa_tools.node import node_snapshot_async
+from kaspa_tools.rpc import RpcError
+
+app = Quart(__name__)
+
+rpc = AsyncRpcClient()
+
+# Stores are opened in startup(), not on import
+state = DashboardState()
+
+async def run_rothschild(timeout, max_lines=None):
+    """Coroutine version of server.run_rothschild"""
+    proc = await asyncio.create_subprocess_exec(
+        ROTHSCHILD_BIN, "-k", WALLET_KEY,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT
+    )
+    lines = []
+
+    async def read():
+        async for line in proc.stdout:
+            lines.append(line.decode('utf-8', errors='replace'))
+            if max_lines and len(lines) >= max_lines:
+                break
+
+    try:
+        await asyncio.wait_for(read(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+    return "".join(lines)
+
+async def probe_node():
+    """Liveness and chain figures: RPC first, /proc and rothschild as fallback"""
+    try:
+        node = await node_snapshot_async(rpc)
+        node["status"] = "online"
+        return node
+    except RpcError:
+        pass
+
+    if not await asyncio.to_thread(kaspad_running):
+        return {"status": "offline"}
+
+    info = {"status": "online"}
+    try:
+        info.update(rothschild_node_info(await run_rothschild(timeout=8, max_lines=15)))
+    except Exception:
+        pass
+    info["peers"] = await asyncio.to_thread(count_peers)
+    return info
+
+async def probe_wallet():
+    """Wallet UTXO count and balance, from the UTXO index while it is live
+    (as server.load_wallet_balance does), else over RPC"""
+    address = state.wallet_address
+    try:
+        entries = await asyncio.to_thread(state.indexed_wallet_entries)
+        if entries is None:
+            node, utxos = await asyncio.gather(node_snapshot_async(rpc), utxos_by_addresses([address], rpc))
+            entries = utxos[address]
+        else:
+            node = await node_snapshot_async(rpc)
+        return state.wallet_balance_from_utxos(entries, node)
+    except RpcError:
+        return state.wallet_balance_from_rothschild(await run_rothschild(timeout=30))
+
+_listener_tasks = set()
+
+def in_thread(listener):
+    """Collector listener that hands (previous, snapshot) to listener on a
+    worker thread, for listeners that touch SQLite or take locks"""
+    def schedule(previous, snapshot):
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(listener, previous, snapshot))
+        _listener_tasks.add(task)
+        task.add_done_callback(_listener_tasks.discard)
+    return schedule
+
+# probe_log and probe_process only read files, so the collector runs them
+# on worker threads; node and wallet probes run on the loop itself.
+collector = StatsCollector(
+    lambda results: compose_stats(
+        results.get("node", {}), results.get("process", {}), results.get("log", {}), results.get("wallet")
+    )
+)
+collector.add_source("node", probe_node, STATS_INTERVALS["node"])
+collector.add_source("log", state.probe_log, STATS_INTERVALS["log"])
+collector.add_source("process", state.probe_process, STATS_INTERVALS["process"])
+collector.add_source("wallet", probe_wallet, STATS_INTERVALS["wallet"])
+collector.add_listener(state.publish_stats_delta)
+collector.add_listener(in_thread(state.record_history))
+collector.add_listener(in_thread(state.advance_deadman))
+
+@app.before_serving
+async def startup():
+    await asyncio.to_thread(state.start)
+    collector.start_async()
+
+@app.after_serving
+async def shutdown():
+    collector.stop()
+    await asyncio.to_thread(state.stop)
+    rpc.close()
+
+async def stats_snapshot():
+    """Current snapshot, waiting (without blocking the loop) for the first node probe"""
+    if not collector.wait_ready(["node"], timeout=0):
+        await asyncio.to_thread(collector.wait_ready, ["node"], 10)
+    return collector.snapshot()
+
+def no_cache(resp):
+    resp.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    resp.headers['Pragma'] = 'no-cache'
+    resp.headers['Expires'] = '0'
+    return resp
+
+@app.route('/')
+async def index():
+    return no_cache(await make_response(await render_template('index.html')))
+
+@app.route('/api/stats')
+async def api_stats():
+    return no_cache(Response((await stats_snapshot()).json, mimetype='application/json'))
+
+@app.route('/api/stream')
+async def api_stream():
+    import json
+
+    sub = state.events.subscribe_async()
+
+    async def stream():
+        try:
+            snapshot = await stats_snapshot()
+            yield format_sse("snapshot", snapshot.json.decode('utf-8'))
+            while True:
+                item = await sub.get(timeout=STREAM_KEEPALIVE)
+                if sub.overflowed:
+                    sub.overflowed = False
+                    snapshot = collector.snapshot()
+                    yield format_sse("snapshot", snapshot.json.decode('utf-8'))
+                    continue
+                if item is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event, data = item
+                # Deltas queued before the snapshot was taken are already in it
+                if event == "stats" and data["generatedAt"] <= snapshot.generated_at:
+                    continue
+                yield format_sse(event, json.dumps(data))
+        finally:
+            state.events.unsubscribe(sub)
+
+    resp = Response(stream(), mimetype='text/event-stream')
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'
+    resp.timeout = None
+    return resp
+
+@app.route('/api/history')
+async def api_history():
+    return jsonify(await asyncio.to_thread(state.history_query, request.args))
+
+@app.route('/metrics')
+async def metrics():
+    # No probe cache counters: the async probes do not go through probe_cache
+    return Response(metrics_text(collector), content_type=CONTENT_TYPE)
+
+@app.route('/api/log')
+async def api_log():
+    return jsonify(await asyncio.to_thread(log_request))
+
+@app.route('/deadman')
+async def deadman():
+    return await render_template('deadman.html')
+
+@app.route('/api/deadman/generate-keys', methods=['POST'])
+async def deadman_generate_keys():
+    data = await request.get_json(silent=True)
+    # Bulk requests are CPU-bound without coincurve; keep them off the loop
+    return jsonify(await asyncio.to_thread(generate_keys_request, data, request.args))
+
+@app.route('/api/deadman/create-args', methods=['POST'])
+async def deadman_create_args():
+    return jsonify(create_args_request(await request.get_json()))
+
+@app.route('/api/deadman/create-args/bulk', methods=['POST'])
+async def deadman_create_args_bulk():
+    try:
+        params = bulk_args_params(request.args)
+        fmt = bulk_args_format(request.args, request.content_type)
+    except (OSError, ValueError, KeyError) as e:
+        return jsonify({"success": False, "error": str(e)})
+    text = await request.get_data(as_text=True)
+
+    async def lines():
+        for line in bulk_args_lines(text, fmt, params):
+            yield line
+
+    return Response(lines(), mimetype='application/x-ndjson')
+
+@app.route('/api/deadman/check-utxo', methods=['GET'])
+async def deadman_check_utxo():
+    import json
+
+    try:
+        address = request.args.get('address', '')
+        if not address:
+            return jsonify({"success": False, "error": "No address provided"})
+
+        result = await rpc.call("getUTXOsByAddresses", {"addresses": [address]})
+        return jsonify({"success": True, "utxoResponse": json.dumps({"result": result})})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+@app.route('/api/deadman/status')
+async def deadman_status():
+    return jsonify(await asyncio.to_thread(state.deadman_status))
+
+@app.route('/api/deadman/contracts', methods=['GET', 'POST'])
+async def deadman_contracts():
+    data = await request.get_json() if request.method == 'POST' else None
+    return jsonify(await asyncio.to_thread(state.contracts_request, request.method, data, request.args))
+
+if __name__ == '__main__':
+    print(f"Starting Kaspa Dashboard (asyncio) on http://localhost:{PORT}")
+    app.run(host='0.0.0.0', port=PORT, debug=False)
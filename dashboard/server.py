@@ -7,318 +7,172 @@ Serves the dashboard and proxies log data
 from flask import Flask, render_template, jsonify, Response, make_response, request
 import subprocess
 import threading
-import time
 import os
-import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kaspa_tools.cache import SingleFlightCache
+from kaspa_tools.collector import StatsCollector
+from kaspa_tools.dashboard import (
+    PORT, ROTHSCHILD_BIN, STATS_INTERVALS, STREAM_KEEPALIVE, WALLET_KEY, DashboardState, bulk_args_format,
+    bulk_args_lines, bulk_args_params, compose_stats, count_peers, create_args_request, generate_keys_request,
+    kaspad_running, log_request, metrics_text, parse_rothschild_output, rothschild_node_info,
+)
+from kaspa_tools.events import format_sse
+from kaspa_tools.metrics import CONTENT_TYPE
+from kaspa_tools.node import node_snapshot
+from kaspa_tools.rpc import RpcError, get_client, iter_utxos
 
 app = Flask(__name__)
 
-LOG_FILE = "/tmp/kaspad_tn12.log"
-PORT = 8080
+# Per-source (ttl, stale window) in seconds for probe_cache
+CACHE_TTLS = {"node_info": (15, 60), "wallet": (25, 120)}
+
+# Stores are opened by start_background(), not on import
+state = DashboardState()
 
-WALLET_KEY = "39186751d974432cb50431befe5575e3d138f66c218a1018f8fa2959dc8de6aa"
-ROTHSCHILD_BIN = "/Users/4dsto/kaspa-node/kaspa-testnet-12-main/rothschild"
+def run_rothschild(timeout, max_lines=None):
+    """Run the rothschild wallet and return its output.
 
-wallet_cache = {"data": None, "timestamp": 0}
-node_info_cache = {"data": None, "timestamp": 0}
-CACHE_DURATION = 15
+    Stops after max_lines lines or timeout seconds, whichever comes first."""
+    proc = subprocess.Popen(
+        [ROTHSCHILD_BIN, "-k", WALLET_KEY],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    lines = []
+    try:
+        for line in proc.stdout:
+            lines.append(line)
+            if max_lines and len(lines) >= max_lines:
+                break
+    finally:
+        timer.cancel()
+        proc.kill()
+        proc.wait()
+    return "".join(lines)
+
+def load_node_info():
+    """Basic node info over RPC, falling back to rothschild"""
+    try:
+        node = node_snapshot()
+        return {"blockCount": node["blockCount"], "difficulty": node["difficulty"], "daaScore": node["daaScore"]}
+    except RpcError:
+        parsed = parse_rothschild_output(run_rothschild(timeout=50, max_lines=20))
+        return {
+            "blockCount": parsed.get("blockCount", 0),
+            "difficulty": parsed.get("difficulty", 0),
+            "daaScore": parsed.get("daaScore", 0),
+        }
 
 def get_node_info():
-    """Get basic node info from rothschild (fast, cached)"""
-    global node_info_cache
-    
-    now = time.time()
-    if node_info_cache["data"] and (now - node_info_cache["timestamp"]) < CACHE_DURATION:
-        return node_info_cache["data"]
-    
+    """Get basic node info over RPC, falling back to rothschild (cached)"""
     try:
-        # Use shell with timeout to get block count
-        result = subprocess.run(
-            f"timeout 50 {ROTHSCHILD_BIN} -k {WALLET_KEY} 2>&1 | head -20",
-            shell=True,
-            capture_output=True,
-            timeout=55,
-            text=True
-        )
-        
-        text = result.stdout
-        
-        info = {"blockCount": 0, "difficulty": 0, "daaScore": 0}
-        
-        for line in text.split("\n"):
-            line_lower = line.lower()
-            if "block count:" in line_lower:
-                try:
-                    info["blockCount"] = int(line_lower.split("block count:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-            elif "difficulty:" in line_lower:
-                try:
-                    info["difficulty"] = float(line_lower.split("difficulty:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-            elif "daa score:" in line_lower:
-                try:
-                    info["daaScore"] = int(line_lower.split("daa score:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-            elif "difficulty:" in line.lower():
-                try:
-                    info["difficulty"] = float(line.split("difficulty:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-            elif "daa score:" in line.lower():
-                try:
-                    info["daaScore"] = int(line.split("daa score:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-        
-        node_info_cache["data"] = info
-        node_info_cache["timestamp"] = time.time()
-        return info
-        
+        return probe_cache.get("node_info")
     except Exception as e:
         return {"error": str(e)}
 
+def load_wallet_balance():
+    """Wallet balance over RPC once the address is known, else via rothschild"""
+    try:
+        node = node_snapshot()
+        entries = state.indexed_wallet_entries()
+        if entries is None:
+            entries = iter_utxos([state.wallet_address])
+        return state.wallet_balance_from_utxos(entries, node)
+    except RpcError:
+        return state.wallet_balance_from_rothschild(run_rothschild(timeout=30))
+
 def get_wallet_balance():
-    """Get wallet balance using rothschild"""
-    global wallet_cache
-    
-    now = time.time()
-    if wallet_cache["data"] and (now - wallet_cache["timestamp"]) < CACHE_DURATION:
-        return wallet_cache["data"]
+    """Get wallet balance over RPC once the address is known, else via rothschild (cached)"""
     try:
-        result = subprocess.run(
-            [ROTHSCHILD_BIN, "-k", WALLET_KEY],
-            capture_output=True,
-            timeout=30
-        )
-        
-        output = (result.stdout + result.stderr).decode('utf-8', errors='replace')
-        
-        balance_info = {"utxos": 0, "avgUtxo": 0, "balance": 0, "address": "", "blockCount": 0, "difficulty": 0, "daaScore": 0}
-        
-        for line in output.split("\n"):
-            if "from address:" in line.lower():
-                balance_info["address"] = line.split("from address:")[-1].strip()
-            elif "avg UTXO amount:" in line.lower():
-                amount = line.split("avg UTXO amount:")[-1].strip().replace(",", "")
-                try:
-                    balance_info["avgUtxo"] = int(amount)
-                except:
-                    pass
-            elif "estimated available UTXOs:" in line.lower():
-                count = line.split("estimated available UTXOs:")[-1].strip().replace(",", "")
-                try:
-                    balance_info["utxos"] = int(count)
-                except:
-                    pass
-            elif "block count:" in line.lower():
-                try:
-                    balance_info["blockCount"] = int(line.split("block count:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-            elif "difficulty:" in line.lower():
-                try:
-                    balance_info["difficulty"] = float(line.split("difficulty:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-            elif "daa score:" in line.lower():
-                try:
-                    balance_info["daaScore"] = int(line.split("daa score:")[-1].strip().replace(",", ""))
-                except:
-                    pass
-        
-        if balance_info["avgUtxo"] > 0 and balance_info["utxos"] > 0:
-            balance_info["balance"] = (balance_info["avgUtxo"] * balance_info["utxos"]) / 1e8
-        
-        wallet_cache["data"] = balance_info
-        wallet_cache["timestamp"] = time.time()
-        
-        return balance_info
+        return probe_cache.get("wallet")
     except Exception as e:
         return {"error": str(e)}
 
-def get_node_stats():
-    """Parse kaspad.log for stats"""
-    stats = {
-        "status": "offline",
-        "blockCount": 0,
-        "headerCount": 0,
-        "difficulty": 0,
-        "daaScore": 0,
-        "blueScore": 0,
-        "peers": 0,
-        "mempool": 0,
-        "pruningPoint": "",
-        "lastBlock": "",
-        "lastBlueScore": 0,
-        "txRate": 0,
-        "blockRate": 0,
-        "synced": False,
-        "recentBlocks": [],
-        "uptime": "",
-        "memory": ""
-    }
+# However many requests find an entry expired, only one of them runs the
+# (possibly 50 s) rothschild fallback; the rest wait for or reuse its result.
+probe_cache = SingleFlightCache()
+probe_cache.add_source("node_info", load_node_info, *CACHE_TTLS["node_info"])
+probe_cache.add_source("wallet", load_wallet_balance, *CACHE_TTLS["wallet"])
+
+def probe_node():
+    """Liveness and chain figures: RPC first, /proc and rothschild as fallback"""
+    # Ask the node directly; only fall back to probing the process
+    # and scraping rothschild when the RPC endpoint is unreachable.
+    try:
+        node = node_snapshot()
+        node["status"] = "online"
+        return node
+    except RpcError:
+        pass
+    
+    if not kaspad_running():
+        return {"status": "offline"}
     
+    info = {"status": "online"}
+    
+    # Get node info - fall back to rothschild with short timeout
     try:
-        # Check if node is running
-        result = subprocess.run(
-            ["lsof", "-i", ":16210"],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        if "kaspad" not in result.stdout:
-            return stats
-        
-        # Get memory for kaspad process
-        result = subprocess.run(
-            ["ps", "-o", "rss=", "-p", ""],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        pid_match = re.search(r'(\d+)\s+.*kaspad', result.stdout if result.stdout else "")
-        if pid_match:
-            pid = pid_match.group(1)
-            mem_result = subprocess.run(
-                ["ps", "-o", "rss=", "-p", pid],
-                capture_output=True,
-                text=True
-            )
-            if mem_result.stdout.strip():
-                mem_kb = int(mem_result.stdout.strip())
-                mem_gb = mem_kb / 1024 / 1024
-                stats["memory"] = f"{mem_gb:.1f} GB"
-        
-        # Get disk space used by node
-        node_dir = os.path.expanduser("~/.rusty-kaspa/kaspa-testnet-12")
-        if os.path.exists(node_dir):
-            try:
-                result = subprocess.run(
-                    ["du", "-sh", node_dir],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.stdout:
-                    stats["memory"] = result.stdout.split()[0]
-            except:
-                pass
-        
-        stats["status"] = "online"
-        
-        # Get node info - try rothschild with short timeout
-        try:
-            result = subprocess.run(
-                f"timeout 8 {ROTHSCHILD_BIN} -k {WALLET_KEY} 2>&1 | head -15",
-                shell=True,
-                capture_output=True,
-                timeout=10,
-                text=True
-            )
-            text = result.stdout
-            for line in text.split("\n"):
-                line_lower = line.lower()
-                if "block count:" in line_lower:
-                    try:
-                        stats["blockCount"] = int(line_lower.split("block count:")[-1].strip().replace(",", ""))
-                    except:
-                        pass
-                elif "difficulty:" in line_lower:
-                    try:
-                        stats["difficulty"] = float(line_lower.split("difficulty:")[-1].strip().replace(",", ""))
-                    except:
-                        pass
-                elif "daa score:" in line_lower:
-                    try:
-                        stats["daaScore"] = int(line_lower.split("daa score:")[-1].strip().replace(",", ""))
-                        stats["blueScore"] = stats["daaScore"]
-                    except:
-                        pass
-                elif "pruning point:" in line_lower:
-                    try:
-                        pp = line_lower.split("pruning point:")[-1].strip().replace(",", "")
-                        stats["pruningPoint"] = pp[:16] + "..."
-                    except:
-                        pass
-        except:
-            pass
-        
-        # Read log file for realtime stats
-        if os.path.exists(LOG_FILE):
-            try:
-                with open(LOG_FILE, 'r', encoding='utf-8', errors='replace') as f:
-                    lines = f.readlines()[-500:]
-            except Exception as e:
-                lines = []
-            
-            for line in reversed(lines):
-                if "Block count:" in line and not stats["blockCount"]:
-                    match = re.search(r'Block count:\s*(\d+)', line)
-                    if match:
-                        stats["blockCount"] = int(match.group(1))
-                
-                if "Header count:" in line and not stats["headerCount"]:
-                    match = re.search(r'Header count:\s*(\d+)', line)
-                    if match:
-                        stats["headerCount"] = int(match.group(1))
-                
-                if "Difficulty:" in line and not stats["difficulty"]:
-                    match = re.search(r'Difficulty:\s*([\d.]+)', line)
-                    if match:
-                        stats["difficulty"] = float(match.group(1))
-                
-                if "DAA score:" in line:
-                    match = re.search(r'DAA score:\s*(\d+)', line)
-                    if match:
-                        stats["blueScore"] = int(match.group(1))
-                        stats["daaScore"] = int(match.group(1))
-                
-                if "Pruning point:" in line and not stats["pruningPoint"]:
-                    match = re.search(r'Pruning point:\s*([a-f0-9]+)', line)
-                    if match:
-                        stats["pruningPoint"] = match.group(1)[:16] + "..."
-                
-                if "Accepted" in line and "blocks" in line:
-                    match = re.search(r'Accepted\s+(\d+)\s+blocks\s+\.\.\.([a-f0-9]+)', line)
-                    if match:
-                        stats["blockRate"] = int(match.group(1))
-                        block_hash = match.group(2)
-                        if block_hash not in [b['hash'] for b in stats["recentBlocks"]]:
-                            stats["recentBlocks"].append({
-                                "hash": block_hash[:16] + "...",
-                                "fullHash": block_hash,
-                                "blueScore": stats["blueScore"]
-                            })
-                            if len(stats["recentBlocks"]) > 10:
-                                stats["recentBlocks"] = stats["recentBlocks"][:10]
-                
-                if "Tx throughput" in line:
-                    match = re.search(r'([\d.]+)\s+u-tps', line)
-                    if match:
-                        stats["txRate"] = float(match.group(1))
-        
-        # Get peers
-        try:
-            result = subprocess.run(
-                ["lsof", "-i", ":16311"],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            stats["peers"] = len([l for l in result.stdout.split('\n') if "ESTABLISHED" in l])
-        except:
-            stats["peers"] = 0
-        
+        info.update(rothschild_node_info(run_rothschild(timeout=8, max_lines=15)))
+    except Exception:
+        pass
+    
+    info["peers"] = count_peers()
+    
+    return info
+
+def probe_wallet():
+    """Wallet UTXO count and balance for the dashboard wallet"""
+    # The collector already polls on its own interval; a stale cached value
+    # would always show the previous period's balance
+    balance = probe_cache.refresh("wallet")
+    if "error" in balance:
+        raise RuntimeError(balance["error"])
+    return balance
+
+def get_node_stats():
+    """Run every stats probe synchronously and merge the results"""
+    try:
+        node = probe_node()
+        if node.get("status") != "online":
+            return compose_stats(node, {}, {})
+        return compose_stats(node, state.probe_process(), state.probe_log())
     except Exception as e:
+        stats = compose_stats({}, {}, {})
         stats["error"] = str(e)
-    
-    return stats
+        return stats
+
+collector = StatsCollector(
+    lambda results: compose_stats(
+        results.get("node", {}), results.get("process", {}), results.get("log", {}), results.get("wallet")
+    )
+)
+collector.add_source("node", probe_node, STATS_INTERVALS["node"])
+collector.add_source("log", state.probe_log, STATS_INTERVALS["log"])
+collector.add_source("process", state.probe_process, STATS_INTERVALS["process"])
+collector.add_source("wallet", probe_wallet, STATS_INTERVALS["wallet"])
+collector.add_listener(state.publish_stats_delta)
+collector.add_listener(state.record_history)
+collector.add_listener(state.advance_deadman)
+
+def start_background():
+    """Open the stores and start the stats collector and UTXO indexer;
+    later calls are no-ops"""
+    state.start()
+    collector.start()
+
+def stats_snapshot():
+    """Start the collector on first use and return its current snapshot"""
+    start_background()
+    collector.wait_ready(["node"], timeout=10)
+    return collector.snapshot()
 
 @app.route('/')
 def index():
@@ -330,21 +184,59 @@ def index():
 
 @app.route('/api/stats')
 def api_stats():
-    resp = make_response(jsonify(get_node_stats()))
+    resp = Response(stats_snapshot().json, mimetype='application/json')
     resp.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     resp.headers['Pragma'] = 'no-cache'
     resp.headers['Expires'] = '0'
     return resp
 
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events: a full snapshot first, then only deltas"""
+    import json
+    
+    def stream():
+        sub = state.events.subscribe()
+        try:
+            snapshot = stats_snapshot()
+            yield format_sse("snapshot", snapshot.json.decode('utf-8'))
+            while True:
+                item = sub.get(timeout=STREAM_KEEPALIVE)
+                if sub.overflowed:
+                    sub.overflowed = False
+                    snapshot = collector.snapshot()
+                    yield format_sse("snapshot", snapshot.json.decode('utf-8'))
+                    continue
+                if item is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event, data = item
+                # Deltas queued before the snapshot was taken are already in it
+                if event == "stats" and data["generatedAt"] <= snapshot.generated_at:
+                    continue
+                yield format_sse(event, json.dumps(data))
+        finally:
+            state.events.unsubscribe(sub)
+    
+    resp = Response(stream(), mimetype='text/event-stream')
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
+
+@app.route('/api/history')
+def api_history():
+    """Range query over the stored metric history"""
+    return jsonify(state.history_query(request.args))
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus exposition of the cached collector snapshot"""
+    start_background()
+    return Response(metrics_text(collector, probe_cache), content_type=CONTENT_TYPE)
+
 @app.route('/api/log')
 def api_log():
-    try:
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, 'r') as f:
-                lines = f.readlines()[-50:]
-            return jsonify({"lines": lines, "success": True})
-    except Exception as e:
-        return jsonify({"error": str(e), "success": False})
+    return jsonify(log_request())
 
 @app.route('/deadman')
 def deadman():
@@ -352,76 +244,24 @@ def deadman():
 
 @app.route('/api/deadman/generate-keys', methods=['POST'])
 def deadman_generate_keys():
-    """Generate a new keypair for deadman switch"""
-    try:
-        # Use openssl to generate a keypair
-        # Generate private key
-        priv_proc = subprocess.Popen(
-            ["openssl", "ecparam", "-genkey", "-name", "secp256k1"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        priv_der, _ = priv_proc.communicate(timeout=10)
-        
-        # Get public key from private key
-        pub_proc = subprocess.Popen(
-            ["openssl", "ec", "-pubout"],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        pub_pem, _ = pub_proc.communicate(input=priv_der, timeout=10)
-        
-        # Convert PEM to hex (uncompressed format)
-        # Skip header/footer and decode base64
-        import base64
-        pub_pem_str = pub_pem.decode('utf-8')
-        pub_lines = pub_pem_str.split('\n')
-        pub_b64 = ''.join([l for l in pub_lines if not l.startswith('-----')])
-        pub_der2 = base64.b64decode(pub_b64)
-        
-        # DER to uncompressed hex (04 + X + Y)
-        # Skip ASN.1 header and get 65 bytes (33 + 32)
-        pub_hex = pub_der2.hex()
-        # Find the uncompressed pubkey (starts with 04)
-        idx = pub_hex.find('04')
-        if idx >= 0:
-            pub_key = pub_hex[idx:idx+130]  # 04 + 64 bytes = 130 chars
-        else:
-            pub_key = "04" + pub_hex[-128:]  # Fallback
-        
-        return jsonify({"success": True, "publicKey": pub_key})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+    """Generate new keypairs for deadman switches (in process, no openssl)"""
+    return jsonify(generate_keys_request(request.get_json(silent=True), request.args))
 
 @app.route('/api/deadman/create-args', methods=['POST'])
 def deadman_create_args():
     """Generate constructor arguments for deadman switch"""
+    return jsonify(create_args_request(request.get_json()))
+
+@app.route('/api/deadman/create-args/bulk', methods=['POST'])
+def deadman_create_args_bulk():
+    """Constructor arguments for every row of a CSV or JSONL body, streamed as JSONL"""
     try:
-        import json
-        data = request.get_json()
-        owner_pubkey = data.get('ownerPubkey', '')
-        beneficiary_pubkey = data.get('beneficiaryPubkey', '')
-        timeout = int(data.get('timeout', 31536000))
-        
-        # Convert hex pubkeys to byte arrays
-        def hex_to_bytes(hex_str):
-            if hex_str.startswith('0x'):
-                hex_str = hex_str[2:]
-            return [int(hex_str[i:i+2], 16) for i in range(0, len(hex_str), 2)]
-        
-        owner_bytes = hex_to_bytes(owner_pubkey)
-        beneficiary_bytes = hex_to_bytes(beneficiary_pubkey)
-        
-        args = [
-            {"kind": "bytes", "data": owner_bytes},
-            {"kind": "bytes", "data": beneficiary_bytes},
-            {"kind": "int", "data": timeout}
-        ]
-        
-        return jsonify({"success": True, "args": args})
-    except Exception as e:
+        params = bulk_args_params(request.args)
+        fmt = bulk_args_format(request.args, request.content_type)
+    except (OSError, ValueError, KeyError) as e:
         return jsonify({"success": False, "error": str(e)})
+    text = request.get_data(as_text=True)
+    return Response(bulk_args_lines(text, fmt, params), mimetype='application/x-ndjson')
 
 @app.route('/api/deadman/check-utxo', methods=['GET'])
 def deadman_check_utxo():
@@ -431,69 +271,27 @@ def deadman_check_utxo():
         if not address:
             return jsonify({"success": False, "error": "No address provided"})
         
-        # Query UTXOs via rothschild (quick check)
-        result = subprocess.run(
-            f"echo '{{\"id\":1,\"method\":\"getUTXOsByAddresses\",\"params\":{{\"addresses\":[\"{address}\"]}}}}' | nc -w 5 localhost 18210",
-            shell=True,
-            capture_output=True,
-            timeout=10,
-            text=True
-        )
+        # Query UTXOs over the shared pooled RPC client
+        import json
+        result = get_client().call("getUTXOsByAddresses", {"addresses": [address]})
         
-        return jsonify({"success": True, "utxoResponse": result.stdout})
+        return jsonify({"success": True, "utxoResponse": json.dumps({"result": result})})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
+@app.route('/api/deadman/status')
+def deadman_status():
+    """Watcher counters, next expirations and recent alerts for all contracts"""
+    start_background()
+    return jsonify(state.deadman_status())
+
 @app.route('/api/deadman/contracts', methods=['GET', 'POST'])
 def deadman_contracts():
     """Manage deadman switch contracts"""
-    import json
-    
-    # Simple file-based storage for contracts
-    CONTRACTS_FILE = os.path.expanduser("~/.kaspa_dashboard/deadman_contracts.json")
-    
-    # Ensure directory exists
-    os.makedirs(os.path.dirname(CONTRACTS_FILE), exist_ok=True)
-    
-    # Load existing contracts
-    try:
-        if os.path.exists(CONTRACTS_FILE):
-            with open(CONTRACTS_FILE, 'r') as f:
-                contracts = json.load(f)
-        else:
-            contracts = []
-    except:
-        contracts = []
-    
-    if request.method == 'POST':
-        data = request.get_json()
-        action = data.get('action', '')
-        
-        if action == 'add':
-            contracts.append({
-                'address': data.get('address', ''),
-                'ownerPubkey': data.get('ownerPubkey', ''),
-                'beneficiaryPubkey': data.get('beneficiaryPubkey', ''),
-                'timeout': data.get('timeout', 0),
-                'created': time.time()
-            })
-            
-            with open(CONTRACTS_FILE, 'w') as f:
-                json.dump(contracts, f)
-            
-            return jsonify({"success": True})
-        
-        elif action == 'remove':
-            address = data.get('address', '')
-            contracts = [c for c in contracts if c.get('address') != address]
-            
-            with open(CONTRACTS_FILE, 'w') as f:
-                json.dump(contracts, f)
-            
-            return jsonify({"success": True})
-    
-    return jsonify({"success": True, "contracts": contracts})
+    data = request.get_json() if request.method == 'POST' else None
+    return jsonify(state.contracts_request(request.method, data, request.args))
 
 if __name__ == '__main__':
     print(f"Starting Kaspa Dashboard on http://localhost:{PORT}")
+    start_background()
     app.run(host='0.0.0.0', port=PORT, debug=False)
@@ -5,11 +5,23 @@ Kaspa Testnet 12 CLI - Node Interaction Tool
 
 import argparse
 import json
+import re
 import subprocess
 import sys
 import time
 import os
 
+from kaspa_tools import procinfo
+from kaspa_tools.address import address_from_private_key
+from kaspa_tools.artifact import FORMATS as ARTIFACT_FORMATS, convert as convert_artifact, load_artifact
+from kaspa_tools.balance import SIZE_BUCKETS, address_balance, format_kas
+from kaspa_tools.compilecache import DEFAULT_DIR as COMPILE_CACHE_DIR, CompileCache, CompileError
+from kaspa_tools import disasm, scriptvm
+from kaspa_tools.ctorargs import DEADMAN_PARAMS, ArgsError, build_args, constructor_params, iter_rows
+from kaspa_tools.logtail import tail_lines
+from kaspa_tools.rpc import RpcError, entry_amount, get_client, utxos_by_addresses
+from kaspa_tools.utxoindex import DEFAULT_PATH as UTXO_INDEX_PATH, UtxoIndex
+
 CONFIG = {
     "rpc_host": "localhost",
     "rpc_port": 16210,
@@ -17,6 +29,8 @@ CONFIG = {
     "data_dir": os.path.expanduser("~/.rusty-kaspa/kaspa-testnet-12"),
     "node_binary": os.path.expanduser("~/kaspa-node/rusty-kaspa/target/release/kaspad"),
     "wallet_binary": os.path.expanduser("~/kaspa-node/kaspa-testnet-12-main/rothschild"),
+    "pidfile": "/tmp/kaspad.pid",
+    "address_prefix": "kaspatest",
 }
 
 COLORS = {
@@ -29,58 +43,46 @@ COLORS = {
 }
 
 
-def print_color(text, color="nc"):
-    print(f"{COLORS.get(color, '')}{text}{COLORS['nc']}")
+def print_color(text, color="nc", file=None):
+    print(f"{COLORS.get(color, '')}{text}{COLORS['nc']}", file=file)
 
 
 def rpc_call(method, params=None):
-    """Make RPC call to the node via gRPC using rothschild."""
-    import socket
-    
-    if params is None:
-        params = []
-    
-    # Build JSON-RPC request
-    request = json.dumps({
-        "id": 1,
-        "method": method,
-        "params": params
-    }) + "\n"
-    
-    # Try gRPC port first, then JSON-RPC
-    ports = [17210, 18210, 16210]
-    
-    for port in ports:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            sock.connect(('127.0.0.1', port))
-            sock.sendall(request.encode('utf-8'))
-            data = sock.recv(8192)
-            sock.close()
-            
-            # Parse response
-            resp = json.loads(data.decode('utf-8', errors='replace'))
-            if 'result' in resp:
-                return resp['result']
-        except Exception as e:
-            continue
-    
-    return None
+    """Make a JSON-RPC call to the node over the shared pooled client."""
+    try:
+        return get_client().call(method, params)
+    except RpcError:
+        return None
 
 
-def check_node_status():
-    """Check if node is running and get status."""
-    print_color("\n=== Kaspa Node Status ===", "blue")
-    
-    # Check if node is running
+def node_running():
+    """Check for a kaspad process via the pidfile and /proc, or lsof without /proc."""
+    if procinfo.find_pid("kaspad", CONFIG['pidfile']) is not None:
+        return True
+    if procinfo.proc_available():
+        return False
     result = subprocess.run(
         ["lsof", "-i", f":{CONFIG['rpc_port']}"],
-        capture_output=True, 
+        capture_output=True,
         text=True
     )
+    return "kaspad" in result.stdout
+
+
+def live_utxo_index():
+    """The dashboard's UTXO index, if an indexer is keeping it current."""
+    if not os.path.exists(UTXO_INDEX_PATH):
+        return None
+    index = UtxoIndex(UTXO_INDEX_PATH)
+    return index if index.is_live() else None
+
+
+def check_node_status():
+    """Check if node is running and get status."""
+    print_color("\n=== Kaspa Node Status ===", "blue")
     
-    if "kaspad" not in result.stdout:
+    # Check if node is running
+    if not node_running():
         print_color("✗ Node is NOT running", "red")
         print(f"  Start with: {CONFIG['node_binary']} --testnet --netsuffix=12 --utxoindex")
         return
@@ -89,9 +91,8 @@ def check_node_status():
     
     # Use tail to get latest log info
     try:
-        with open("/tmp/kaspad.log", "r") as f:
-            lines = f.readlines()[-50:]
-            
+        lines = tail_lines("/tmp/kaspad.log", 50)
+        
         # Find recent block info
         for line in lines:
             if "Block count:" in line or "blockCount" in line:
@@ -134,6 +135,42 @@ def check_balance(private_key):
         print_color("No private key provided. Use -k <key>", "yellow")
         return
     
+    try:
+        address = address_from_private_key(private_key, CONFIG['address_prefix'])
+    except ValueError as e:
+        print_color(f"Invalid private key: {e}", "red")
+        return
+    print(f"  Address: {address}")
+    
+    try:
+        summary = address_balance(address, index=live_utxo_index())
+    except RpcError:
+        print_color("  RPC unavailable, estimating with rothschild...", "yellow")
+        check_balance_rothschild(private_key)
+        return
+    
+    print_color(f"\n  UTXOs: {summary.count:,}", "cyan")
+    if summary.count:
+        print_color(f"  Avg UTXO: {format_kas(summary.sompi // summary.count)} KAS", "cyan")
+    if summary.virtual_daa_score is not None and summary.immature_count:
+        print_color(f"  Immature coinbase: {summary.immature_count:,} UTXOs, {format_kas(summary.immature_sompi)} KAS", "yellow")
+    
+    if summary.count:
+        print("\n  UTXO sizes (KAS):")
+        lower = 0
+        for bound, count, sompi in zip(SIZE_BUCKETS + (None,), summary.size_counts, summary.size_sompi):
+            if count:
+                label = f"> {format_kas(lower)}" if bound is None else f"<= {format_kas(bound)}"
+                print(f"    {label:>22}  {count:>8,}  {format_kas(sompi):>24}")
+            lower = bound
+    
+    print_color(f"\n  Balance: {format_kas(summary.sompi)} KAS", "green")
+    if summary.virtual_daa_score is not None and summary.immature_sompi:
+        print_color(f"  Spendable: {format_kas(summary.spendable_sompi)} KAS", "green")
+
+
+def check_balance_rothschild(private_key):
+    """Estimate the balance from rothschild's avg x count output (no RPC needed)."""
     cmd = [CONFIG['wallet_binary'], "-k", private_key]
     
     try:
@@ -164,10 +201,7 @@ def check_balance(private_key):
         output = output_bytes.decode('utf-8', errors='replace')
         
         for line in output.split("\n"):
-            if "from address:" in line.lower():
-                addr = line.split("from address:")[-1].strip()
-                print(f"  Address: {addr}")
-            elif "network:" in line.lower():
+            if "network:" in line.lower():
                 print(f"  {line.strip()}")
             elif "block count:" in line.lower():
                 print(f"  {line.strip()}")
@@ -259,7 +293,13 @@ def get_node_info():
     """Get detailed node information."""
     print_color("\n=== Detailed Node Info ===", "blue")
     
-    info = rpc_call("getBlockDagInfo")
+    # DAG info and sync status are independent, so fetch both in one batch
+    try:
+        info, sync = get_client().batch([("getBlockDagInfo", None), ("getSyncStatus", None)])
+    except RpcError:
+        info = rpc_call("getBlockDagInfo")
+        sync = rpc_call("getSyncStatus")
+    
     if info:
         print(f"\n  Network:          {info.get('networkName', 'N/A')}")
         print(f"  Block Count:      {info.get('blockCount', 0):,}")
@@ -270,8 +310,6 @@ def get_node_info():
         print(f"  Pruning Point:   {info.get('pruningPoint', 'N/A')[:16]}...")
         print(f"  Tips:            {len(info.get('tipHashes', []))}")
     
-    # Get sync status
-    sync = rpc_call("getSyncStatus")
     if sync:
         print(f"\n  Syncing:         {sync.get('syncing', False)}")
         print(f"  Progress:        {sync.get('progress', 0)*100:.1f}%")
@@ -281,20 +319,25 @@ def get_utxos(address):
     """Get UTXOs for an address."""
     print_color(f"\n=== UTXOs for {address} ===", "blue")
     
-    result = rpc_call("getUTXOsByAddresses", {"addresses": [address]})
-    
-    if not result:
-        print_color("No UTXOs found or RPC error", "yellow")
-        return
-    
-    entries = result.get("entries", [])
+    index = live_utxo_index()
+    if index is not None and index.balance(address) is not None:
+        entries = list(index.entries(address))
+    else:
+        result = rpc_call("getUTXOsByAddresses", {"addresses": [address]})
+        
+        if not result:
+            print_color("No UTXOs found or RPC error", "yellow")
+            return
+        
+        entries = result.get("entries", [])
     print(f"  Total UTXOs: {len(entries)}")
     
     total = 0
-    for i, utxo in enumerate(entries[:10], 1):
-        amount = utxo.get("amount", 0)
+    for i, utxo in enumerate(entries, 1):
+        amount = entry_amount(utxo)
         total += amount
-        print(f"  {i}. {amount/1e8:.8f} KAS (confirmations: {utxo.get('confirmations', 'N/A')})")
+        if i <= 10:
+            print(f"  {i}. {amount/1e8:.8f} KAS (confirmations: {utxo.get('confirmations', 'N/A')})")
     
     if len(entries) > 10:
         print(f"  ... and {len(entries) - 10} more")
@@ -302,18 +345,43 @@ def get_utxos(address):
     print_color(f"\n  Total: {total/1e8:.8f} KAS", "green")
 
 
+def read_addresses(path):
+    """Read addresses from a file (or stdin for '-'), one per line."""
+    f = sys.stdin if path == "-" else open(path, "r")
+    try:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def get_utxos_batch(addresses, chunk_size=500):
+    """Report UTXO totals for many addresses in a single batched pass."""
+    print_color(f"\n=== UTXOs for {len(addresses)} addresses ===", "blue")
+    
+    try:
+        by_address = utxos_by_addresses(addresses, chunk_size=chunk_size)
+    except RpcError as e:
+        print_color(f"RPC error: {e}", "red")
+        return
+    
+    grand_total = 0
+    utxo_count = 0
+    for address, entries in by_address.items():
+        total = sum(entry_amount(entry) for entry in entries)
+        grand_total += total
+        utxo_count += len(entries)
+        print(f"  {address}  {len(entries):>6} UTXOs  {total/1e8:>20.8f} KAS")
+    
+    print_color(f"\n  Total: {utxo_count:,} UTXOs, {grand_total/1e8:.8f} KAS", "green")
+
+
 def start_node():
     """Start the Kaspa node."""
     print_color("\n=== Starting Kaspa Node ===", "blue")
     
     # Check if already running
-    result = subprocess.run(
-        ["lsof", "-i", f":{CONFIG['rpc_port']}"],
-        capture_output=True,
-        text=True
-    )
-    
-    if "kaspad" in result.stdout:
+    if node_running():
         print_color("Node is already running!", "yellow")
         return
     
@@ -329,11 +397,12 @@ def start_node():
     print(f"  Command: {' '.join(cmd)}")
     print_color("\nStarting node in background...", "yellow")
     
-    subprocess.Popen(
+    proc = subprocess.Popen(
         cmd,
         stdout=open("/tmp/kaspad.log", "a"),
         stderr=subprocess.STDOUT
     )
+    procinfo.write_pidfile(CONFIG['pidfile'], proc.pid)
     
     print_color("Node started! Check logs with: tail -f /tmp/kaspad.log", "green")
 
@@ -342,13 +411,24 @@ def stop_node():
     """Stop the Kaspa node."""
     print_color("\n=== Stopping Kaspa Node ===", "blue")
     
-    result = subprocess.run(
-        ["pkill", "-f", "kaspad"],
-        capture_output=True,
-        text=True
-    )
+    pids = procinfo.find_pids("kaspad")
+    if pids is None:
+        # No /proc (macOS)
+        result = subprocess.run(
+            ["pkill", "-f", "kaspad"],
+            capture_output=True,
+            text=True
+        )
+        stopped = result.returncode == 0
+    else:
+        stopped = bool(procinfo.stop_processes(pids))
     
-    if result.returncode == 0:
+    try:
+        os.remove(CONFIG['pidfile'])
+    except OSError:
+        pass
+    
+    if stopped:
         print_color("Node stopped!", "green")
     else:
         print_color("Node was not running", "yellow")
@@ -360,18 +440,231 @@ def disk_usage():
     
     data_dir = CONFIG['data_dir']
     
-    if os.path.exists(data_dir):
-        result = subprocess.run(
-            ["du", "-sh", data_dir],
-            capture_output=True,
-            text=True
-        )
-        size = result.stdout.split()[0] if result.stdout else "Unknown"
-        print(f"  Node data: {size}")
+    size = procinfo.DirSizeCache(data_dir).size()
+    if size is not None:
+        print(f"  Node data: {procinfo.format_size(size)}")
     else:
         print_color("  Data directory not found", "yellow")
 
 
+def artifact_info(path):
+    """Summarize a compiled contract artifact in any supported format."""
+    with load_artifact(path) as artifact:
+        print_color(f"\n=== {artifact.contract_name} ({path}) ===", "blue")
+        print(f"  Script size: {len(artifact.script)} bytes")
+        print(f"  Selector:    {'no' if artifact.without_selector else 'yes'}")
+        print("  Entrypoints:")
+        for name, entry in artifact.functions.items():
+            inputs = ", ".join(f"{i['type_name']} {i['name']}" for i in entry.get("inputs", []))
+            print(f"    {name}({inputs})")
+
+
+def artifact_convert(sources, dst, fmt=None):
+    """Convert artifacts; dst is a file for one source or a directory for many."""
+    if len(sources) > 1 or os.path.isdir(dst):
+        fmt = fmt or "binary"
+        os.makedirs(dst, exist_ok=True)
+        suffix = ".sila" if fmt == "binary" else ".json"
+        targets = [os.path.join(dst, os.path.splitext(os.path.basename(src))[0] + suffix) for src in sources]
+    else:
+        targets = [dst]
+    
+    before = after = 0
+    for src, target in zip(sources, targets):
+        try:
+            src_size, dst_size = convert_artifact(src, target, fmt)
+        except (OSError, ValueError, KeyError) as e:
+            print_color(f"  {src}: {e}", "red")
+            continue
+        before += src_size
+        after += dst_size
+        print(f"  {src} -> {target}  {src_size:,} -> {dst_size:,} bytes")
+    print_color(f"\n  Total: {before:,} -> {after:,} bytes", "green")
+
+
+def compile_contracts(sources, constructor_args=None, output=None, jobs=None, cache_dir=COMPILE_CACHE_DIR):
+    """Compile .sil files or directories of them through the silverc cache."""
+    cache = CompileCache(cache_dir)
+    start = time.time()
+    results = []
+    try:
+        if len(sources) == 1 and not os.path.isdir(sources[0]):
+            path, hit = cache.compile(sources[0], constructor_args, output)
+            results.append((sources[0], path, hit, None))
+        else:
+            if output:
+                os.makedirs(output, exist_ok=True)
+            files = []
+            for source in sources:
+                if os.path.isdir(source):
+                    results += cache.compile_directory(source, output, jobs)
+                else:
+                    target = os.path.join(output, os.path.splitext(os.path.basename(source))[0] + ".json") if output else None
+                    files.append((source, None, target))
+            results += cache.compile_many(files, jobs)
+    except CompileError as e:
+        print_color(f"  {e}", "red")
+        sys.exit(1)
+    
+    failed = 0
+    for source, path, hit, error in results:
+        if error:
+            failed += 1
+            print_color(f"  ✗ {error}", "red")
+        else:
+            print(f"  {'cached  ' if hit else 'compiled'}  {source} -> {path}")
+    print_color(f"\n  {len(results) - failed} ok ({cache.hits} cached), {failed} failed in {time.time() - start:.2f}s",
+                "red" if failed else "green")
+    if failed:
+        sys.exit(1)
+
+
+def disassemble(paths, show_ops=False, as_json=False, baseline=None, max_mass=None):
+    """Per-entrypoint size, sig-op and mass report for artifacts or directories of them."""
+    files = []
+    for path in paths:
+        files += disasm.artifact_paths(path) if os.path.isdir(path) else [path]
+    reports = disasm.analyze_many(files)
+    
+    if as_json:
+        for report in reports:
+            print(json.dumps(report, separators=(",", ":")))
+    else:
+        for report in reports:
+            if "error" in report:
+                print_color(f"  {report['path']}: {report['error']}", "red")
+                continue
+            print_color(f"\n=== {report['contract']} ({report['path']}) ===", "blue")
+            print(f"  Script: {report['script_size']} bytes, {report['opcodes']} opcodes, {report['sig_ops']} sig ops")
+            for entry in report["entrypoints"]:
+                note = f"  (+ {', '.join(entry['variable_args'])})" if entry["variable_args"] else ""
+                print(f"    {entry['name']:<20} {entry['size']:>5} bytes {entry['sig_ops']:>3} sig ops  mass ~{entry['mass']:,}{note}")
+            if show_ops:
+                with load_artifact(report["path"]) as artifact:
+                    print(disasm.format_instructions(disasm.decode(artifact.script)))
+    
+    problems = [r for r in reports if "error" in r]
+    if baseline:
+        for path, name, old, new in disasm.compare(reports, disasm.load_reports(baseline)):
+            problems.append(path)
+            print_color(f"  {path} {name}: mass {old:,} -> {new:,}", "red", file=sys.stderr)
+    if max_mass is not None:
+        for report in reports:
+            for entry in report.get("entrypoints", []):
+                if entry["mass"] > max_mass:
+                    problems.append(report["path"])
+                    print_color(f"  {report['path']} {entry['name']}: mass {entry['mass']:,} over {max_mass:,}", "red", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+def simulate_spend(artifact_path, function=None, args_path=None, signer=None, recipient=None, age=0,
+                   daa_score=None, sequence=None, lock_time=0, tx_path=None, call_args=None,
+                   fuzz=0, seed=None, max_age=None, as_json=False):
+    """Run a spend path offline against a mocked transaction (or fuzz many)."""
+    if args_path is None:
+        default_args = os.path.splitext(artifact_path)[0] + "_args.json"
+        args_path = default_args if os.path.exists(default_args) else None
+    try:
+        sim = scriptvm.Simulator.load(artifact_path, args_path)
+    except (OSError, ValueError, KeyError) as e:
+        print_color(f"  {artifact_path}: {e}", "red")
+        sys.exit(1)
+    
+    if fuzz:
+        functions = [function] if function else None
+        start = time.time()
+        summary = scriptvm.summarize_fuzz(sim.fuzz(fuzz, functions, max_age=max_age, seed=seed))
+        elapsed = time.time() - start
+        if as_json:
+            for (name, who, to), counts in sorted(summary.items()):
+                print(json.dumps({"function": name, "signer": who, "recipient": to, **counts}))
+            return
+        print_color(f"\n=== {sim.artifact.contract_name}: {fuzz:,} cases in {elapsed:.2f}s ({fuzz / elapsed:,.0f}/s) ===", "blue")
+        for (name, who, to), counts in sorted(summary.items()):
+            if counts["pass"]:
+                print_color(f"  {name:<14} signer={who:<12} to={to:<12} {counts['pass']:>6} pass  age {counts['min_age']:,}..{counts['max_age']:,}", "green")
+        blocked = sum(1 for counts in summary.values() if not counts["pass"])
+        print(f"  {blocked} signer/recipient/function combinations never passed")
+        return
+    
+    function = function or sim.artifact.abi[0]["name"]
+    try:
+        if tx_path:
+            with open(tx_path) as f:
+                ctx = sim.scenario_context(json.load(f))
+        else:
+            ctx = sim.context(None if recipient in (None, "self") else recipient, age=age,
+                              daa_score=daa_score, sequence=sequence, lock_time=lock_time)
+        result = sim.spend(function, ctx, signer, dict(call_args or []))
+    except (OSError, ValueError, KeyError) as e:
+        print_color(f"  {e}", "red")
+        sys.exit(1)
+    if as_json:
+        print(json.dumps(result))
+    else:
+        status = "PASS" if result["ok"] else f"FAIL: {result['error']}"
+        print_color(f"  {sim.artifact.contract_name}.{function}: {status}", "green" if result["ok"] else "red")
+        print(f"  sigscript: {len(result['sig_script']) // 2} bytes" + (f", {result['ops']} opcodes executed" if result["ok"] else ""))
+    if not result["ok"]:
+        sys.exit(1)
+
+
+def format_args_file(args):
+    """Constructor args laid out like the checked-in *_args.json files."""
+    return "[\n" + ",\n".join("  " + json.dumps(arg) for arg in args) + "\n]\n"
+
+
+def build_constructor_args(rows_path, artifact_path=None, fmt=None, output_dir=None, jsonl_path=None):
+    """Validate and encode constructor args for every row of a CSV/JSONL file."""
+    if artifact_path:
+        try:
+            with load_artifact(artifact_path) as artifact:
+                params = constructor_params(artifact)
+        except (OSError, ValueError, ArgsError) as e:
+            print_color(f"  {artifact_path}: {e}", "red")
+            sys.exit(1)
+    else:
+        params = DEADMAN_PARAMS
+    fmt = fmt or ("jsonl" if rows_path.endswith((".jsonl", ".ndjson")) else "csv")
+    
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    out = None
+    if not output_dir:
+        out = sys.stdout if jsonl_path in (None, "-") else open(jsonl_path, "w")
+    rows = sys.stdin if rows_path == "-" else open(rows_path, "r", newline="")
+    ok = failed = 0
+    stems = {}  # output file stem (lowercased) -> row that wrote it
+    try:
+        for result in build_args(iter_rows(rows, fmt), params):
+            if out is None and "error" not in result:
+                stem = re.sub(r"[^A-Za-z0-9_.-]", "_", str(result.get("name") or f"row{result['row']}"))
+                first = stems.setdefault(stem.lower(), result["row"])
+                if first != result["row"]:
+                    result = {"row": result["row"], "error": f"{stem}_args.json already written by row {first}"}
+            if "error" in result:
+                failed += 1
+                print_color(f"  row {result['row']}: {result['error']}", "red", file=sys.stderr)
+                if out is None:
+                    continue
+            else:
+                ok += 1
+            if out is not None:
+                out.write(json.dumps(result, separators=(",", ":")) + "\n")
+            else:
+                with open(os.path.join(output_dir, f"{stem}_args.json"), "w") as f:
+                    f.write(format_args_file(result["args"]))
+    finally:
+        if rows is not sys.stdin:
+            rows.close()
+        if out not in (None, sys.stdout):
+            out.close()
+    print_color(f"  {ok} rows encoded, {failed} rejected", "red" if failed else "green", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Kaspa Testnet 12 CLI - Node Interaction Tool",
@@ -385,7 +678,13 @@ Examples:
   %(prog)s send -k <key> -a <addr> - Send KAS
   %(prog)s info                - Get detailed node info
   %(prog)s utxos <address>    - Get UTXOs for address
+  %(prog)s utxos -f addrs.txt  - UTXO totals for many addresses (- for stdin)
   %(prog)s disk                - Check disk usage
+  %(prog)s artifact p2pkh.json - Summarize a compiled contract
+  %(prog)s compile deadman_switch.sil --constructor-args deadman_args.json - Cached silverc
+  %(prog)s compile contracts/ -j 8 - Compile a directory in parallel
+  %(prog)s args switches.csv -o args/ - One constructor args file per CSV row
+  %(prog)s artifact *.json -o compact/ - Convert artifacts to binary .sila
         """
     )
     
@@ -417,8 +716,58 @@ Examples:
     send_parser.add_argument("-f", "--fee", default=1000, help="Fee in SOMPI (default: 1000)")
     
     # utxos command
-    utxos_parser = subparsers.add_parser("utxos", help="Get UTXOs for address")
-    utxos_parser.add_argument("address", help="Kaspa address")
+    utxos_parser = subparsers.add_parser("utxos", help="Get UTXOs for one or more addresses")
+    utxos_parser.add_argument("address", nargs="*", help="Kaspa address(es)")
+    utxos_parser.add_argument("-f", "--file", help="File with one address per line (- for stdin)")
+    utxos_parser.add_argument("--chunk-size", type=int, default=500, help="Addresses per getUTXOsByAddresses call (default: 500)")
+    
+    # artifact command
+    artifact_parser = subparsers.add_parser("artifact", help="Inspect or convert silverc artifacts")
+    artifact_parser.add_argument("paths", nargs="+", help="Artifact file(s): silverc JSON, hex JSON or .sila")
+    artifact_parser.add_argument("-o", "--output", help="Convert to this file (one input) or directory")
+    artifact_parser.add_argument("--format", choices=ARTIFACT_FORMATS, help="Output format (default: from the output name, binary for directories)")
+    
+    # compile command
+    compile_parser = subparsers.add_parser("compile", help="Compile SilverScript through the artifact cache")
+    compile_parser.add_argument("sources", nargs="+", help=".sil file(s) or directories (each <name>.sil uses <name>_args.json if present)")
+    compile_parser.add_argument("--constructor-args", help="Constructor args JSON (single source only)")
+    compile_parser.add_argument("-o", "--output", help="Output file (single source) or directory")
+    compile_parser.add_argument("-j", "--jobs", type=int, help="Parallel silverc processes (default: CPU count)")
+    compile_parser.add_argument("--cache-dir", default=COMPILE_CACHE_DIR, help=f"Artifact cache (default: {COMPILE_CACHE_DIR})")
+    
+    # disasm command
+    disasm_parser = subparsers.add_parser("disasm", help="Disassemble artifacts and report size, sig ops and mass per entrypoint")
+    disasm_parser.add_argument("paths", nargs="+", help="Artifact file(s) or directories of them")
+    disasm_parser.add_argument("--ops", action="store_true", help="Also print every instruction")
+    disasm_parser.add_argument("--json", action="store_true", help="One JSON report per line (usable as --baseline)")
+    disasm_parser.add_argument("--baseline", help="Earlier --json output; fail if any entrypoint got heavier")
+    disasm_parser.add_argument("--max-mass", type=int, help="Fail if any entrypoint's estimated mass is above this")
+    
+    # simulate command
+    sim_parser = subparsers.add_parser("simulate", help="Run a contract spend path offline against a mocked transaction")
+    sim_parser.add_argument("artifact", help="Compiled artifact (uses <name>_args.json next to it for key names)")
+    sim_parser.add_argument("function", nargs="?", help="ABI function to call (default: the first)")
+    sim_parser.add_argument("--args", help="Constructor args file (default: <artifact>_args.json)")
+    sim_parser.add_argument("--signer", help="Who signs sig arguments: a constructor pubkey name or x-only hex key")
+    sim_parser.add_argument("--to", help="Output 0 recipient: a pubkey name/hex, or self (default) for the contract")
+    sim_parser.add_argument("--age", type=int, default=0, help="DAA scores since the UTXO was created (default: 0)")
+    sim_parser.add_argument("--daa-score", type=int, help="Current virtual DAA score (default: --age)")
+    sim_parser.add_argument("--sequence", type=int, help="Input sequence (default: --age)")
+    sim_parser.add_argument("--lock-time", type=int, default=0, help="Transaction lock time")
+    sim_parser.add_argument("--tx", help="Debugger tx scenario JSON instead of the single-input defaults")
+    sim_parser.add_argument("--arg", action="append", type=lambda kv: kv.split("=", 1), help="Non-sig argument as name=value")
+    sim_parser.add_argument("--fuzz", type=int, default=0, help="Run this many random signer/recipient/age cases")
+    sim_parser.add_argument("--seed", type=int, help="Random seed for --fuzz")
+    sim_parser.add_argument("--max-age", type=int, help="Largest age --fuzz tries (default: twice the largest int constructor arg)")
+    sim_parser.add_argument("--json", action="store_true", help="JSON output")
+    
+    # args command
+    ctor_parser = subparsers.add_parser("args", help="Build constructor args for many contracts from CSV/JSONL rows")
+    ctor_parser.add_argument("rows", help="CSV (with header) or JSONL file of rows, - for stdin")
+    ctor_parser.add_argument("--artifact", help="Compiled artifact whose constructor params to validate against (default: DeadmanSwitch)")
+    ctor_parser.add_argument("--format", choices=("csv", "jsonl"), help="Row format (default: from the file name, else csv)")
+    ctor_parser.add_argument("-o", "--output-dir", help="Write one <name>_args.json per row here")
+    ctor_parser.add_argument("--jsonl", help="Write a single JSONL stream here (default: stdout)")
     
     args = parser.parse_args()
     
@@ -437,7 +786,32 @@ Examples:
     elif args.command == "send":
         send_transaction(args.private_key, args.address, 0, args.fee)
     elif args.command == "utxos":
-        get_utxos(args.address)
+        addresses = list(args.address)
+        if args.file:
+            addresses += read_addresses(args.file)
+        if not addresses:
+            utxos_parser.error("at least one address or --file is required")
+        elif len(addresses) == 1 and not args.file:
+            get_utxos(addresses[0])
+        else:
+            get_utxos_batch(addresses, args.chunk_size)
+    elif args.command == "artifact":
+        if args.output:
+            artifact_convert(args.paths, args.output, args.format)
+        else:
+            for path in args.paths:
+                artifact_info(path)
+    elif args.command == "compile":
+        if args.constructor_args and (len(args.sources) > 1 or os.path.isdir(args.sources[0])):
+            compile_parser.error("--constructor-args needs a single source file")
+        compile_contracts(args.sources, args.constructor_args, args.output, args.jobs, args.cache_dir)
+    elif args.command == "disasm":
+        disassemble(args.paths, args.ops, args.json, args.baseline, args.max_mass)
+    elif args.command == "simulate":
+        simulate_spend(args.artifact, args.function, args.args, args.signer, args.to, args.age, args.daa_score,
+                       args.sequence, args.lock_time, args.tx, args.arg, args.fuzz, args.seed, args.max_age, args.json)
+    elif args.command == "args":
+        build_constructor_args(args.rows, args.artifact, args.format, args.output_dir, args.jsonl)
     else:
         # Default to status if no command
         check_node_status()
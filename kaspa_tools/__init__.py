@@ -0,0 +1,3 @@
+"""
+Shared Python tooling for the Kaspa testnet-12 CLI and dashboard
+"""
@@ -0,0 +1,106 @@
+"""
+Kaspa address encoding
+
+Addresses are "<prefix>:<payload>" where the payload is a version byte
+plus public key or script hash, base32-encoded with an 8-character
+CashAddr-style checksum over the prefix and payload.
+"""
+
+from .keys import public_key, xonly_public_key
+
+CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_CHARSET_INDEX = {c: i for i, c in enumerate(CHARSET)}
+
+VERSION_PUBKEY = 0  # 32-byte Schnorr x-only public key
+VERSION_PUBKEY_ECDSA = 1  # 33-byte compressed public key
+VERSION_SCRIPT_HASH = 8  # 32-byte script hash
+
+PAYLOAD_SIZES = {VERSION_PUBKEY: 32, VERSION_PUBKEY_ECDSA: 33, VERSION_SCRIPT_HASH: 32}
+
+NETWORK_PREFIXES = {
+    "mainnet": "kaspa",
+    "testnet": "kaspatest",
+    "simnet": "kaspasim",
+    "devnet": "kaspadev",
+}
+
+
+def _polymod(values):
+    c = 1
+    for d in values:
+        c0 = c >> 35
+        c = ((c & 0x07FFFFFFFF) << 5) ^ d
+        if c0 & 0x01:
+            c ^= 0x98F2BC8E61
+        if c0 & 0x02:
+            c ^= 0x79B76D99E2
+        if c0 & 0x04:
+            c ^= 0xF33E5FB3C4
+        if c0 & 0x08:
+            c ^= 0xAE2EABE2A8
+        if c0 & 0x10:
+            c ^= 0x1E4F43E470
+    return c ^ 1
+
+
+def _checksum(prefix, data5):
+    return _polymod([ord(c) & 0x1F for c in prefix] + [0] + list(data5) + [0] * 8)
+
+
+def _convert_bits(data, from_bits, to_bits, pad):
+    acc = 0
+    bits = 0
+    out = []
+    maxv = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            out.append((acc >> bits) & maxv)
+    if pad and bits:
+        out.append((acc << (to_bits - bits)) & maxv)
+    elif not pad and (bits >= from_bits or (acc << (to_bits - bits)) & maxv):
+        raise ValueError("invalid padding in address payload")
+    return out
+
+
+def encode_address(prefix, version, payload):
+    """Encode a version byte and payload as a Kaspa address"""
+    data5 = _convert_bits(bytes([version]) + bytes(payload), 8, 5, pad=True)
+    checksum = _checksum(prefix, data5)
+    check5 = _convert_bits(checksum.to_bytes(5, "big"), 8, 5, pad=True)
+    return prefix + ":" + "".join(CHARSET[d] for d in data5 + check5)
+
+
+def decode_address(address):
+    """Return (prefix, version, payload) for a Kaspa address.
+
+    Raises ValueError for malformed addresses or bad checksums."""
+    prefix, sep, body = address.partition(":")
+    if not sep or not prefix or len(body) < 8:
+        raise ValueError(f"not a Kaspa address: {address!r}")
+    if body.lower() != body and body.upper() != body:
+        raise ValueError("mixed-case address")
+    try:
+        data = [_CHARSET_INDEX[c] for c in body.lower()]
+    except KeyError:
+        raise ValueError(f"invalid character in address: {address!r}") from None
+    data5, check5 = data[:-8], data[-8:]
+    expected = _convert_bits(_checksum(prefix.lower(), data5).to_bytes(5, "big"), 8, 5, pad=True)
+    if check5 != expected:
+        raise ValueError(f"bad address checksum: {address!r}")
+    raw = bytes(_convert_bits(data5, 5, 8, pad=False))
+    if not raw:
+        raise ValueError(f"empty address payload: {address!r}")
+    version, payload = raw[0], raw[1:]
+    if version in PAYLOAD_SIZES and len(payload) != PAYLOAD_SIZES[version]:
+        raise ValueError(f"address payload is {len(payload)} bytes, expected {PAYLOAD_SIZES[version]}")
+    return prefix.lower(), version, payload
+
+
+def address_from_private_key(private_key, prefix="kaspatest", ecdsa=False):
+    """Address that rothschild and kaspawallet derive for private_key"""
+    if ecdsa:
+        return encode_address(prefix, VERSION_PUBKEY_ECDSA, public_key(private_key, compressed=True))
+    return encode_address(prefix, VERSION_PUBKEY, xonly_public_key(private_key))
@@ -0,0 +1,132 @@
+"""
+asyncio flavour of the pooled JSON-RPC client
+
+Same framing, id matching, batching and endpoint discovery as
+kaspa_tools.rpc.RpcClient, but over non-blocking streams so one event
+loop can keep many node calls in flight.
+"""
+
+import asyncio
+import socket
+
+from .rpc import RECV_SIZE, RpcClient, RpcError, _BatchRejected, _Connection, _group_utxos, _utxo_calls
+
+
+class _AsyncConnection(_Connection):
+    """A stream pair sharing _Connection's message framing"""
+
+    def __init__(self, reader, writer, endpoint):
+        super().__init__(None, endpoint)
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, payload):
+        self.writer.write(payload)
+        await self.writer.drain()
+
+    async def read_message(self):
+        while True:
+            message = self._take_message()
+            if message is None:
+                message = self._feed(await self.reader.read(RECV_SIZE))
+            if message is not None:
+                return message
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncRpcClient(RpcClient):
+    """RpcClient whose call, pipeline and batch are coroutines.
+
+    Use one instance per event loop; pooled streams belong to the loop
+    that opened them."""
+
+    async def call(self, method, params=None):
+        """Send one request and return its result"""
+        return (await self.pipeline([(method, params)]))[0]
+
+    async def pipeline(self, calls):
+        """Send several (method, params) requests back to back on one stream
+        and return their results in the same order"""
+        requests = self._requests(calls)
+        responses = await self._exchange(requests)
+        return [self._result(responses[req["id"]], req["method"]) for req in requests]
+
+    async def batch(self, calls):
+        """Send several requests as one JSON-RPC batch, falling back to
+        pipelining on endpoints that reject batch arrays"""
+        if self._batch_supported is False or len(calls) < 2:
+            return await self.pipeline(calls)
+
+        requests = self._requests(calls)
+        try:
+            responses = await self._exchange(requests, as_batch=True)
+        except _BatchRejected:
+            self._batch_supported = False
+            return await self.pipeline(calls)
+        self._batch_supported = True
+        return [self._result(responses[req["id"]], req["method"]) for req in requests]
+
+    async def _exchange(self, requests, as_batch=False):
+        payload = self._payload(requests, as_batch)
+        pending = {req["id"] for req in requests}
+
+        for attempt in range(2):
+            conn = await self._acquire(fresh=attempt > 0)
+            try:
+                await conn.send(payload)
+                responses = {}
+                while pending - responses.keys():
+                    message = await asyncio.wait_for(conn.read_message(), self.timeout)
+                    self._match(message, pending, responses, as_batch)
+            except _BatchRejected:
+                self._release(conn)
+                raise
+            except (OSError, ValueError, RpcError, asyncio.TimeoutError) as e:
+                conn.close()
+                error = e
+                continue
+            self._release(conn)
+            return responses
+
+        with self._lock:
+            self.endpoint = None
+        raise RpcError(f"RPC request failed: {error!r}")
+
+    async def _acquire(self, fresh=False):
+        with self._lock:
+            if not fresh and self._idle:
+                return self._idle.pop()
+            endpoint = self.endpoint
+
+        if endpoint is not None:
+            try:
+                return await self._connect(endpoint)
+            except (OSError, asyncio.TimeoutError):
+                pass
+
+        for port in self.ports:
+            endpoint = (self.host, port)
+            try:
+                conn = await self._connect(endpoint)
+            except (OSError, asyncio.TimeoutError):
+                continue
+            with self._lock:
+                self.endpoint = endpoint
+            return conn
+        raise RpcError(f"no RPC endpoint reachable on {self.host} ports {list(self.ports)}")
+
+    async def _connect(self, endpoint):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(*endpoint), self.timeout)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return _AsyncConnection(reader, writer, endpoint)
+
+
+async def utxos_by_addresses(addresses, client, chunk_size=500):
+    """Coroutine version of kaspa_tools.rpc.utxos_by_addresses"""
+    addresses = list(dict.fromkeys(addresses))
+    results = await client.batch(_utxo_calls(addresses, chunk_size))
+    return _group_utxos(addresses, results)
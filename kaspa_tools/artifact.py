@@ -0,0 +1,186 @@
+"""
+silverc artifact reader/writer
+
+Besides silverc's own JSON (script as one integer per line, full AST
+inline) two compact forms are understood:
+
+  hex     JSON with "script" as a hex string, written without indentation
+  binary  MAGIC, a length-prefixed JSON header (name, ABI, section offsets),
+          the raw script bytes, then the AST as compact JSON
+
+Binary artifacts are mmapped: the script is a zero-copy memoryview into
+the file and the AST is only decoded when asked for. Every form converts
+to every other, and the legacy JSON written back matches silverc's.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"SILA\x01"
+BINARY_SUFFIX = ".sila"
+FORMATS = ("json", "hex", "binary")
+
+_HEADER_LEN = struct.Struct("<I")
+
+
+class Artifact:
+    """A compiled contract: script bytes, ABI indexed by function name and
+    a lazily loaded AST"""
+
+    def __init__(self, contract_name, script, abi, without_selector=False, ast=None, ast_bytes=None, buffer=None):
+        self.contract_name = contract_name
+        self.script = script  # bytes or memoryview
+        self.abi = abi
+        self.without_selector = without_selector
+        self.functions = {entry["name"]: entry for entry in abi}
+        self._ast = ast
+        self._ast_bytes = ast_bytes  # undecoded AST JSON (a view while mmapped)
+        self._buffer = buffer  # mmap backing a binary artifact
+
+    @property
+    def ast(self):
+        if self._ast is None and self._ast_bytes is not None:
+            self._ast = json.loads(bytes(self._ast_bytes))
+            self._release_ast_bytes()
+        return self._ast
+
+    def _release_ast_bytes(self):
+        if isinstance(self._ast_bytes, memoryview):
+            self._ast_bytes.release()
+        self._ast_bytes = None
+
+    def function(self, name):
+        """ABI entry for function name; KeyError if the contract has none"""
+        try:
+            return self.functions[name]
+        except KeyError:
+            raise KeyError(f"{self.contract_name} has no function {name!r}") from None
+
+    @property
+    def script_hex(self):
+        return self.script.hex()
+
+    def as_dict(self, script_format="json"):
+        """silverc's JSON layout; script_format "hex" writes the script as hex"""
+        script = self.script_hex if script_format == "hex" else list(self.script)
+        return {
+            "contract_name": self.contract_name,
+            "script": script,
+            "ast": self.ast,
+            "abi": self.abi,
+            "without_selector": self.without_selector,
+        }
+
+    def close(self):
+        """Release the mmap behind a binary artifact (script becomes unusable)"""
+        if self._buffer is not None:
+            if self._ast_bytes is not None:
+                # Keep the AST loadable after the mapping goes away
+                raw = bytes(self._ast_bytes)
+                self._release_ast_bytes()
+                self._ast_bytes = raw
+            self.script.release()
+            self._buffer.close()
+            self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def from_dict(data):
+    """Artifact from parsed JSON in either the silverc or the hex form"""
+    if not isinstance(data, dict) or "script" not in data:
+        raise ValueError("not a silverc artifact (no script)")
+    script = data["script"]
+    script = bytes.fromhex(script) if isinstance(script, str) else bytes(script)
+    return Artifact(
+        data.get("contract_name", ""), script, data.get("abi", []),
+        bool(data.get("without_selector", False)), ast=data.get("ast"),
+    )
+
+
+def _load_binary(f):
+    size = os.fstat(f.fileno()).st_size
+    buffer = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    try:
+        if view[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a binary silverc artifact")
+        (header_len,) = _HEADER_LEN.unpack_from(buffer, len(MAGIC))
+        start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(bytes(view[start:start + header_len]))
+        script_at, script_len = header["script"]
+        ast_at, ast_len = header["ast"]
+        if max(script_at + script_len, ast_at + ast_len) > size:
+            raise ValueError("truncated binary silverc artifact")
+    except Exception:
+        view.release()
+        buffer.close()
+        raise
+    script = view[script_at:script_at + script_len]
+    ast_bytes = view[ast_at:ast_at + ast_len] if ast_len else None
+    view.release()
+    return Artifact(
+        header["contract_name"], script, header["abi"], header["without_selector"],
+        ast_bytes=ast_bytes, buffer=buffer,
+    )
+
+
+def load_artifact(path):
+    """Load an artifact in any of FORMATS, sniffing the file contents"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return _load_binary(f)
+        f.seek(0)
+        return from_dict(json.load(f))
+
+
+def _binary_bytes(artifact):
+    ast = b"" if artifact.ast is None else json.dumps(artifact.ast, separators=(",", ":")).encode()
+    header = {
+        "contract_name": artifact.contract_name,
+        "abi": artifact.abi,
+        "without_selector": artifact.without_selector,
+    }
+    # Section offsets depend on the header's own length; iterate until the
+    # length stops changing (offsets only ever grow, so this terminates)
+    encoded = b""
+    while True:
+        script_at = len(MAGIC) + _HEADER_LEN.size + len(encoded)
+        header["script"] = [script_at, len(artifact.script)]
+        header["ast"] = [script_at + len(artifact.script), len(ast)]
+        previous, encoded = encoded, json.dumps(header, separators=(",", ":")).encode()
+        if len(encoded) == len(previous):
+            break
+    return MAGIC + _HEADER_LEN.pack(len(encoded)) + encoded + bytes(artifact.script) + ast
+
+
+def save_artifact(artifact, path, fmt=None):
+    """Write artifact to path atomically. fmt defaults to binary for
+    *.sila paths and silverc JSON otherwise."""
+    fmt = fmt or ("binary" if path.endswith(BINARY_SUFFIX) else "json")
+    if fmt == "binary":
+        data = _binary_bytes(artifact)
+    elif fmt == "hex":
+        data = json.dumps(artifact.as_dict("hex"), separators=(",", ":")).encode()
+    elif fmt == "json":
+        data = json.dumps(artifact.as_dict(), indent=2).encode()
+    else:
+        raise ValueError(f"unknown artifact format {fmt!r} (expected one of {', '.join(FORMATS)})")
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+def convert(src, dst, fmt=None):
+    """Re-encode the artifact at src into dst; returns (src bytes, dst bytes)"""
+    with load_artifact(src) as artifact:
+        written = save_artifact(artifact, dst, fmt)
+    return os.path.getsize(src), written
@@ -0,0 +1,141 @@
+"""
+Exact wallet balances from UTXO entries
+
+Amounts are summed as integer sompi and folded into fixed size and
+maturity histograms as entries stream past, so memory stays constant
+however many UTXOs an address holds.
+"""
+
+from .rpc import RpcError, entry_amount, get_client, iter_utxos
+
+SOMPI_PER_KAS = 100_000_000
+
+# Coinbase outputs become spendable after this many DAA scores; 100 s of
+# blocks at testnet-12's 10 blocks per second
+COINBASE_MATURITY = 1000
+
+# Upper bounds in sompi: 0.001 KAS ... 10,000 KAS, then everything larger
+SIZE_BUCKETS = tuple(10 ** exp for exp in range(5, 13))
+
+# Upper bounds in DAA score confirmations
+CONFIRMATION_BUCKETS = (10, 100, 1000, 10_000, 100_000)
+
+
+def _bucket(bounds, value):
+    for index, bound in enumerate(bounds):
+        if value <= bound:
+            return index
+    return len(bounds)
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+class BalanceSummary:
+    """Running exact totals and histograms over UTXO entries"""
+
+    def __init__(self, virtual_daa_score=None, coinbase_maturity=COINBASE_MATURITY):
+        self.virtual_daa_score = virtual_daa_score
+        self.coinbase_maturity = coinbase_maturity
+        self.count = 0
+        self.sompi = 0
+        self.largest = 0
+        self.smallest = None
+        self.immature_count = 0
+        self.immature_sompi = 0
+        self.size_counts = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_sompi = [0] * (len(SIZE_BUCKETS) + 1)
+        self.confirmation_counts = [0] * (len(CONFIRMATION_BUCKETS) + 1)
+
+    def add(self, entry):
+        utxo = entry.get("utxoEntry", entry)
+        amount = entry_amount(entry)
+        self.count += 1
+        self.sompi += amount
+        self.largest = max(self.largest, amount)
+        self.smallest = amount if self.smallest is None else min(self.smallest, amount)
+        index = _bucket(SIZE_BUCKETS, amount)
+        self.size_counts[index] += 1
+        self.size_sompi[index] += amount
+
+        if self.virtual_daa_score is None:
+            return
+        confirmations = max(0, self.virtual_daa_score - _int(utxo.get("blockDaaScore")))
+        self.confirmation_counts[_bucket(CONFIRMATION_BUCKETS, confirmations)] += 1
+        if utxo.get("isCoinbase") and confirmations < self.coinbase_maturity:
+            self.immature_count += 1
+            self.immature_sompi += amount
+
+    def update(self, entries):
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    @property
+    def spendable_sompi(self):
+        return self.sompi - self.immature_sompi
+
+    def as_dict(self):
+        """JSON-ready summary; KAS figures are for display, sompi are exact"""
+        result = {
+            "utxos": self.count,
+            "sompi": self.sompi,
+            "balance": self.sompi / SOMPI_PER_KAS,
+            "avgUtxo": self.sompi // self.count if self.count else 0,
+            "largestUtxo": self.largest,
+            "smallestUtxo": self.smallest or 0,
+            "sizeHistogram": [
+                {"le": bound, "count": count, "sompi": sompi}
+                for bound, count, sompi in zip(SIZE_BUCKETS + (None,), self.size_counts, self.size_sompi)
+            ],
+        }
+        if self.virtual_daa_score is not None:
+            result.update({
+                "virtualDaaScore": self.virtual_daa_score,
+                "spendableSompi": self.spendable_sompi,
+                "immatureUtxos": self.immature_count,
+                "immatureSompi": self.immature_sompi,
+                "confirmationHistogram": [
+                    {"le": bound, "count": count}
+                    for bound, count in zip(CONFIRMATION_BUCKETS + (None,), self.confirmation_counts)
+                ],
+            })
+        return result
+
+
+def address_balance(addresses, client=None, chunk_size=500, index=None):
+    """BalanceSummary over every UTXO of addresses, streamed chunk by chunk.
+
+    With a live kaspa_tools.utxoindex.UtxoIndex that has every address
+    synced, entries come from the index and the node is only asked for
+    its DAA score (maturity is skipped if that fails too).
+
+    Raises RpcError when the node cannot be reached."""
+    client = client or get_client()
+    if isinstance(addresses, str):
+        addresses = [addresses]
+    indexed = index is not None and index.is_live() and all(index.balance(a) is not None for a in addresses)
+    try:
+        dag = client.call("getBlockDagInfo") or {}
+    except RpcError:
+        if not indexed:
+            raise
+        dag = {}
+    daa_score = dag.get("virtualDaaScore", dag.get("daaScore"))
+    summary = BalanceSummary(_int(daa_score) if daa_score is not None else None)
+    if indexed:
+        for address in addresses:
+            summary.update(index.entries(address))
+        return summary
+    return summary.update(iter_utxos(addresses, chunk_size, client))
+
+
+def format_kas(sompi):
+    """Exact KAS string for an integer sompi amount"""
+    sign = "-" if sompi < 0 else ""
+    whole, frac = divmod(abs(sompi), SOMPI_PER_KAS)
+    return f"{sign}{whole:,}.{frac:08d}"
@@ -0,0 +1,128 @@
+"""
+Single-flight cache for slow probes
+
+Each registered source has its own TTL. A fresh value is served as is.
+Past the TTL but inside the stale window, the old value is still served
+while one background refresh runs. A missing or expired value is loaded
+by exactly one caller while every other caller for that key waits for
+the same result, so an expiry under load never starts more than one
+rothschild process per source.
+"""
+
+import threading
+import time
+
+COUNTERS = ("hits", "stale", "misses", "coalesced", "refreshes", "errors")
+
+
+class _Flight:
+    """One in-progress load that any number of callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _Entry:
+    def __init__(self, loader, ttl, stale_ttl):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.value = None
+        self.loaded_at = None
+        self.flight = None
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+
+class SingleFlightCache:
+    """Per-key cache with coalesced loads and stale-while-revalidate"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def add_source(self, key, loader, ttl, stale_ttl=0):
+        """Cache loader() under key for ttl seconds, then keep serving the
+        old value for up to stale_ttl more seconds while it refreshes"""
+        with self._lock:
+            self._entries[key] = _Entry(loader, ttl, stale_ttl)
+
+    def get(self, key):
+        """Return the cached value, loading it if needed.
+
+        Raises whatever the loader raised when there is no value to serve."""
+        entry = self._entries[key]
+        with self._lock:
+            age = None if entry.loaded_at is None else time.monotonic() - entry.loaded_at
+            if age is not None and age < entry.ttl:
+                entry.counts["hits"] += 1
+                return entry.value
+            if age is not None and age < entry.ttl + entry.stale_ttl:
+                entry.counts["stale"] += 1
+                if entry.flight is None:
+                    entry.flight = _Flight()
+                    threading.Thread(
+                        target=self._load, args=(entry, entry.flight), name=f"cache-{key}", daemon=True
+                    ).start()
+                return entry.value
+
+            # Every lookup lands in exactly one of hits, stale, misses or
+            # coalesced (waited on a load another caller started)
+            flight = entry.flight
+            leader = flight is None
+            if leader:
+                entry.counts["misses"] += 1
+                flight = entry.flight = _Flight()
+            else:
+                entry.counts["coalesced"] += 1
+
+        if leader:
+            self._load(entry, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def refresh(self, key):
+        """Load key now, skipping the TTL and stale path (joins a load
+        already running), for callers that poll on their own schedule"""
+        entry = self._entries[key]
+        with self._lock:
+            flight = entry.flight
+            leader = flight is None
+            if leader:
+                flight = entry.flight = _Flight()
+        if leader:
+            self._load(entry, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _load(self, entry, flight):
+        try:
+            flight.value = entry.loader()
+        except Exception as e:
+            flight.error = e
+        with self._lock:
+            entry.counts["refreshes"] += 1
+            if flight.error is None:
+                entry.value = flight.value
+                entry.loaded_at = time.monotonic()
+            else:
+                entry.counts["errors"] += 1
+            entry.flight = None
+        flight.done.set()
+
+    def invalidate(self, key):
+        """Drop the cached value so the next get() loads it again"""
+        with self._lock:
+            self._entries[key].loaded_at = None
+
+    def stats(self):
+        """Counter values per key"""
+        with self._lock:
+            return {key: dict(entry.counts) for key, entry in self._entries.items()}
@@ -0,0 +1,200 @@
+"""
+Background stats collector
+
+Each registered source (a probe function returning a dict) is refreshed
+on its own interval by a worker thread, or by an asyncio task when the
+collector is started with start_async(). After every refresh the latest
+results are composed into one immutable Snapshot, so readers get the
+current view, already JSON-encoded, without doing any probing themselves.
+"""
+
+import asyncio
+import inspect
+import json
+import threading
+import time
+from types import MappingProxyType
+
+from .metrics import Histogram
+
+
+class Snapshot:
+    """Immutable published view of the composed stats"""
+
+    __slots__ = ("data", "json", "generated_at")
+
+    def __init__(self, data, generated_at):
+        data = dict(data)
+        data["generatedAt"] = generated_at
+        object.__setattr__(self, "data", MappingProxyType(data))
+        object.__setattr__(self, "json", json.dumps(data).encode("utf-8"))
+        object.__setattr__(self, "generated_at", generated_at)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is immutable")
+
+
+class _Source:
+    def __init__(self, name, probe, interval):
+        self.name = name
+        self.probe = probe
+        self.interval = interval
+        self.result = None
+        self.runs = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_duration = 0.0
+        self.last_run = 0.0
+        self.latency = Histogram()
+
+
+class StatsCollector:
+    """Refreshes probes on their own intervals and publishes snapshots.
+
+    compose(results) receives a dict of source name -> latest probe result
+    (sources that have not completed yet are absent) and returns the dict
+    to publish."""
+
+    def __init__(self, compose):
+        self._compose = compose
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._ran = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._workers = []
+        self._snapshot = Snapshot({}, 0.0)
+        self._listeners = []
+
+    def add_source(self, name, probe, interval):
+        """Register probe() to be refreshed every interval seconds"""
+        if self._workers:
+            raise RuntimeError("sources must be added before start()")
+        self._sources[name] = _Source(name, probe, interval)
+
+    def add_listener(self, callback):
+        """Call callback(previous, snapshot) after every publish.
+
+        Listeners run on the publishing thread while the publish lock is
+        held, so they see snapshots strictly in order and must be quick."""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start one worker thread per source; later calls are no-ops"""
+        with self._lock:
+            if self._workers:
+                return
+            for source in self._sources.values():
+                thread = threading.Thread(target=self._run, args=(source,), name=f"collector-{source.name}", daemon=True)
+                thread.start()
+                self._workers.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        for worker in self._workers:
+            if isinstance(worker, asyncio.Task):
+                worker.cancel()
+            else:
+                worker.join(timeout=1)
+
+    def snapshot(self):
+        """Return the latest published snapshot (never blocks on probes)"""
+        return self._snapshot
+
+    def wait_ready(self, names=None, timeout=None):
+        """Block until the named sources (default: all) have run at least once"""
+        names = list(names or self._sources)
+        with self._ran:
+            return self._ran.wait_for(lambda: all(self._sources[n].runs for n in names), timeout)
+
+    def source_stats(self):
+        """Run count, error count and last probe latency per source"""
+        with self._lock:
+            return {
+                name: {
+                    "interval": source.interval,
+                    "runs": source.runs,
+                    "errors": source.errors,
+                    "lastError": source.last_error,
+                    "lastDuration": source.last_duration,
+                    "lastRun": source.last_run,
+                }
+                for name, source in self._sources.items()
+            }
+
+    def latency_histograms(self):
+        """Probe latency Histogram per source"""
+        return {name: source.latency for name, source in self._sources.items()}
+
+    def refresh(self, name):
+        """Run one source now on the calling thread and publish"""
+        source = self._sources[name]
+        started = time.perf_counter()
+        try:
+            result = source.probe()
+            error = None
+        except Exception as e:
+            result = None
+            error = str(e)
+        self._record(source, result, error, time.perf_counter() - started)
+
+    async def refresh_async(self, name):
+        """Await one source (run on a worker thread unless it is a
+        coroutine function) and publish"""
+        source = self._sources[name]
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(source.probe):
+                result = await source.probe()
+            else:
+                result = await asyncio.to_thread(source.probe)
+            error = None
+        except Exception as e:
+            result = None
+            error = str(e)
+        self._record(source, result, error, time.perf_counter() - started)
+
+    def _record(self, source, result, error, duration):
+        source.latency.observe(duration)
+
+        with self._lock:
+            source.runs += 1
+            source.last_duration = duration
+            source.last_run = time.time()
+            if error is None:
+                source.result = result
+                source.last_error = None
+            else:
+                # Keep serving the previous result for a failing probe
+                source.errors += 1
+                source.last_error = error
+            results = {n: s.result for n, s in self._sources.items() if s.result is not None}
+            # Composing under the lock keeps publishes ordered, so a slow
+            # probe finishing late can never overwrite a newer snapshot.
+            previous, self._snapshot = self._snapshot, Snapshot(self._compose(results), time.time())
+            for callback in self._listeners:
+                try:
+                    callback(previous, self._snapshot)
+                except Exception:
+                    pass
+            self._ran.notify_all()
+
+    def _run(self, source):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.refresh(source.name)
+            self._stop.wait(max(0.0, source.interval - (time.monotonic() - started)))
+
+    def start_async(self):
+        """Drive every source from tasks on the running event loop instead
+        of worker threads; call from inside the loop. Later calls are no-ops."""
+        with self._lock:
+            if self._workers:
+                return
+            for source in self._sources.values():
+                self._workers.append(asyncio.get_running_loop().create_task(self._run_async(source)))
+
+    async def _run_async(self, source):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            await self.refresh_async(source.name)
+            await asyncio.sleep(max(0.0, source.interval - (time.monotonic() - started)))
@@ -0,0 +1,215 @@
+"""
+Content-addressed compile cache in front of silverc
+
+Artifacts are stored under the SHA-256 of the compiler binary, the
+contract source and the constructor args (canonicalized, so whitespace
+changes in the args file do not miss). A hit is a file copy; a miss runs
+silverc once and keeps the output. The cache is bounded by size and
+evicts least recently used entries (hits refresh an entry's mtime).
+
+compile_many() and compile_directory() fan independent contracts out
+over a thread pool; each compile is its own silverc process, so they
+use every core.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DIR = os.path.expanduser("~/.kaspa_dashboard/silverc_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+SILVERC_TIMEOUT = 300
+
+# Where the deploy scripts and docs expect silverc to be built
+SILVERC_CANDIDATES = (
+    os.path.join(REPO_ROOT, "target", "release", "silverc"),
+    os.path.expanduser("~/silverscript/target/release/silverc"),
+)
+
+_KEY_VERSION = b"silverc-cache-1"
+
+
+class CompileError(Exception):
+    """silverc could not compile a contract"""
+
+
+def find_silverc():
+    """Path of the silverc binary: $SILVERC, PATH, then the usual build dirs"""
+    if os.environ.get("SILVERC"):
+        return os.environ["SILVERC"]
+    found = shutil.which("silverc")
+    if found:
+        return found
+    for path in SILVERC_CANDIDATES:
+        if os.access(path, os.X_OK):
+            return path
+    raise CompileError("silverc not found (build it with cargo build --release or set SILVERC)")
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _canonical_args(data):
+    try:
+        return json.dumps(json.loads(data), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        return data  # silverc will reject it; still a stable key
+
+
+class CompileCache:
+    """silverc front end caching artifacts by source, args and compiler"""
+
+    def __init__(self, cache_dir=DEFAULT_DIR, silverc=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.silverc = silverc
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._compiler_ids = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def compiler_id(self):
+        """Hash of the silverc binary, recomputed only when it changes on disk"""
+        path = self.silverc = self.silverc or find_silverc()
+        st = os.stat(path)
+        stamp = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._compiler_ids.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        compiler_id = _file_hash(path)
+        with self._lock:
+            self._compiler_ids[path] = (stamp, compiler_id)
+        return compiler_id
+
+    def key(self, source, constructor_args=None):
+        digest = hashlib.sha256(_KEY_VERSION)
+        digest.update(self.compiler_id().encode())
+        with open(source, "rb") as f:
+            data = f.read()
+        digest.update(len(data).to_bytes(8, "big") + data)
+        if constructor_args:
+            with open(constructor_args, "rb") as f:
+                digest.update(b"\0args\0" + _canonical_args(f.read()))
+        return digest.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def compile(self, source, constructor_args=None, output=None):
+        """Compile source (with optional constructor args file) to output,
+        default <source>.json like silverc. Returns (output path, cache hit)."""
+        output = output or os.path.splitext(source)[0] + ".json"
+        entry = self._entry(self.key(source, constructor_args))
+        hit = os.path.exists(entry)
+        if hit:
+            try:
+                os.utime(entry)  # LRU: hits count as use
+            except OSError:
+                hit = False  # evicted between the check and now
+        if not hit:
+            self._run_silverc(source, constructor_args, entry)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        tmp = f"{output}.tmp{os.getpid()}.{threading.get_ident()}"
+        shutil.copyfile(entry, tmp)
+        os.replace(tmp, output)
+        if not hit:
+            self.evict()
+        return output, hit
+
+    def _run_silverc(self, source, constructor_args, entry):
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        tmp = f"{entry}.tmp{os.getpid()}.{threading.get_ident()}"
+        cmd = [self.silverc or find_silverc(), source, "-o", tmp]
+        if constructor_args:
+            cmd += ["--constructor-args", constructor_args]
+        try:
+            try:
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=SILVERC_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                raise CompileError(f"{source}: silverc timed out after {SILVERC_TIMEOUT}s") from None
+            if result.returncode != 0 or not os.path.exists(tmp):
+                raise CompileError(f"{source}: {(result.stderr or result.stdout).strip() or 'silverc failed'}")
+            os.replace(tmp, entry)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def entries(self):
+        """(mtime, size, path) of every cached artifact"""
+        found = []
+        for sub in os.scandir(self.cache_dir):
+            if not sub.is_dir():
+                continue
+            for item in os.scandir(sub.path):
+                if item.name.endswith(".json"):
+                    try:
+                        st = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    found.append((st.st_mtime, st.st_size, item.path))
+        return found
+
+    def evict(self, max_bytes=None):
+        """Drop least recently used artifacts until the cache fits max_bytes;
+        returns how many were removed"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        found = self.entries()
+        total = sum(size for _, size, _ in found)
+        removed = 0
+        for _, size, path in sorted(found):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def compile_many(self, jobs, workers=None):
+        """Compile [(source, constructor_args, output)] in parallel.
+
+        Returns [(source, output path or None, hit, error or None)] in job order."""
+        def run(job):
+            source, constructor_args, output = job
+            try:
+                path, hit = self.compile(source, constructor_args, output)
+                return source, path, hit, None
+            except (CompileError, OSError) as e:
+                return source, None, False, str(e)
+
+        workers = workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, jobs))
+
+    def compile_directory(self, directory, output_dir=None, workers=None):
+        """Compile every *.sil in directory, each with <name>_args.json as
+        constructor args when that file exists"""
+        jobs = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".sil"):
+                continue
+            stem = name[:-4]
+            args = os.path.join(directory, stem + "_args.json")
+            output = os.path.join(output_dir or directory, stem + ".json")
+            jobs.append((os.path.join(directory, name), args if os.path.exists(args) else None, output))
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        return self.compile_many(jobs, workers)
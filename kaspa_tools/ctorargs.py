@@ -0,0 +1,136 @@
+"""
+Constructor arguments for silverc, one contract or thousands
+
+Rows of values (CSV with a header line, or JSON Lines of objects or
+arrays) are checked against the contract's constructor parameter types
+and encoded as silverc --constructor-args lists. Values are matched to
+parameters by name, falling back to column order, so an
+owner,beneficiary,timeout CSV fits DeadmanSwitch(pubkey owner, pubkey
+heir, int inactivityPeriod). Rows are processed one at a time; a bad row
+yields an error for that row and the rest carry on.
+"""
+
+import csv
+import io
+import json
+import re
+
+# DeadmanSwitch's constructor, for callers without a compiled artifact
+DEADMAN_PARAMS = (("owner", "pubkey"), ("beneficiary", "pubkey"), ("timeout", "int"))
+
+# Byte lengths silverc requires (TypeBase::Pubkey/Sig/Datasig)
+BYTE_LENGTHS = {"pubkey": 32, "sig": 65, "datasig": 64}
+
+# byte[N] / byte[] and the older bytesN spelling
+_BYTE_ARRAY = re.compile(r"^(?:byte\[(\d*)\]|bytes(\d+))$")
+
+
+class ArgsError(ValueError):
+    """A value that does not fit its constructor parameter"""
+
+
+def constructor_params(artifact):
+    """[(name, type_name)] of an Artifact's constructor, from its AST"""
+    ast = artifact.ast or {}
+    if "params" not in ast:
+        raise ArgsError(f"{artifact.contract_name}: artifact has no AST constructor params")
+    return [(param["name"], param["type_name"]) for param in ast["params"]]
+
+
+def _hex_bytes(value, name):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    text = str(value).strip()
+    if text[:2] in ("0x", "0X"):
+        text = text[2:]
+    try:
+        return bytes.fromhex(text)
+    except ValueError:
+        raise ArgsError(f"{name}: not valid hex") from None
+
+
+def encode_arg(value, type_name, name="value"):
+    """silverc constructor-arg expression for value as type_name"""
+    if type_name == "int":
+        try:
+            return {"kind": "int", "data": int(value)}
+        except (TypeError, ValueError):
+            raise ArgsError(f"{name}: expected an integer, got {value!r}") from None
+    if type_name == "bool":
+        if isinstance(value, bool):
+            return {"kind": "bool", "data": value}
+        text = str(value).strip().lower()
+        if text not in ("true", "false", "1", "0"):
+            raise ArgsError(f"{name}: expected true or false, got {value!r}")
+        return {"kind": "bool", "data": text in ("true", "1")}
+    if type_name == "string":
+        return {"kind": "string", "data": str(value)}
+
+    match = _BYTE_ARRAY.match(type_name)
+    if type_name in BYTE_LENGTHS or type_name == "bytes" or match:
+        data = _hex_bytes(value, name)
+        size = match and (match.group(1) or match.group(2))
+        expected = BYTE_LENGTHS.get(type_name) or (int(size) if size else None)
+        if expected is not None and len(data) != expected:
+            raise ArgsError(f"{name}: {type_name} must be {expected} bytes, got {len(data)}")
+        return {"kind": "bytes", "data": list(data)}
+    raise ArgsError(f"{name}: unsupported constructor parameter type {type_name}")
+
+
+def encode_row(row, params):
+    """Constructor args for one row (a dict or a list of values)"""
+    # A "name" column labels the row and is not a positional value
+    values = [v for k, v in row.items() if k != "name"] if isinstance(row, dict) else list(row)
+    args = []
+    for position, (name, type_name) in enumerate(params):
+        if isinstance(row, dict) and row.get(name) not in (None, ""):
+            value = row[name]
+        elif position < len(values) and values[position] not in (None, ""):
+            value = values[position]
+        else:
+            raise ArgsError(f"{name}: missing")
+        args.append(encode_arg(value, type_name, name))
+    return args
+
+
+def iter_rows(stream, fmt="csv"):
+    """Yield (row number, row) from a text stream of CSV (header line
+    first) or JSON Lines; blank lines and #-comments are skipped"""
+    if fmt == "csv":
+        lines = (line for line in stream if line.strip() and not line.startswith("#"))
+        for number, row in enumerate(csv.DictReader(lines), 1):
+            yield number, {(k or "").strip(): (v or "").strip() for k, v in row.items()}
+    elif fmt == "jsonl":
+        number = 0
+        for line in stream:
+            if not line.strip() or line.startswith("#"):
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, ArgsError(f"invalid JSON: {e}")
+    else:
+        raise ValueError(f"unknown row format {fmt!r} (expected csv or jsonl)")
+
+
+def build_args(rows, params=DEADMAN_PARAMS):
+    """Yield {"row", "args"} or {"row", "error"} for each (number, row)"""
+    for number, row in rows:
+        result = {"row": number}
+        if isinstance(row, dict) and row.get("name"):
+            result["name"] = row["name"]
+        try:
+            if isinstance(row, Exception):
+                raise row
+            if not isinstance(row, (dict, list)):
+                raise ArgsError("row must be an object or an array")
+            result["args"] = encode_row(row, params)
+        except ArgsError as e:
+            result["error"] = str(e)
+        yield result
+
+
+def build_args_text(text, fmt="csv", params=DEADMAN_PARAMS):
+    """build_args over an in-memory CSV/JSONL document"""
+    return build_args(iter_rows(io.StringIO(text), fmt), params)
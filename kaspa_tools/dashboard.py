@@ -0,0 +1,604 @@
+"""
+State and request helpers shared by the dashboard servers
+
+dashboard/server.py (Flask, threads) and dashboard/async_server.py
+(Quart, one event loop) serve the same routes; everything that does not
+depend on the web framework lives here. Importing this module has no
+side effects: DashboardState only opens the contract registry, UTXO
+index and metric history when a server calls start() (or a request
+first needs them), so a test or the other server can import it freely.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+
+from . import procinfo
+from .address import VERSION_PUBKEY, address_from_private_key, encode_address
+from .artifact import load_artifact
+from .balance import BalanceSummary
+from .ctorargs import DEADMAN_PARAMS, build_args_text, constructor_params, encode_arg
+from .deadman import ContractWatcher
+from .events import EventHub, changed_fields
+from .keys import generate_keypairs
+from .logparse import LogMetrics
+from .logtail import LogTailer, tail_lines
+from .metrics import Exposition
+from .procinfo import format_size
+from .registry import DEFAULT_PATH as REGISTRY_PATH, LEGACY_PATH as LEGACY_CONTRACTS_PATH, ContractRegistry
+from .tsdb import RESOLUTIONS, TimeSeriesStore
+from .utxoindex import DEFAULT_PATH as UTXO_INDEX_PATH, UtxoIndex, UtxoIndexer
+
+LOG_FILE = "/tmp/kaspad_tn12.log"
+PORT = 8080
+
+RPC_PORT = 16210
+P2P_PORT = 16311
+NODE_DATA_DIR = os.path.expanduser("~/.rusty-kaspa/kaspa-testnet-12")
+
+WALLET_KEY = "39186751d974432cb50431befe5575e3d138f66c218a1018f8fa2959dc8de6aa"
+ROTHSCHILD_BIN = "/Users/4dsto/kaspa-node/kaspa-testnet-12-main/rothschild"
+
+STATS_TEMPLATE = {
+    "status": "offline",
+    "blockCount": 0,
+    "headerCount": 0,
+    "difficulty": 0,
+    "daaScore": 0,
+    "blueScore": 0,
+    "peers": 0,
+    "mempool": 0,
+    "pruningPoint": "",
+    "lastBlock": "",
+    "lastBlueScore": 0,
+    "txRate": 0,
+    "blockRate": 0,
+    "synced": False,
+    "recentBlocks": [],
+    "uptime": "",
+    "memory": "",
+    "rssBytes": 0,
+    "dataDirBytes": 0,
+    "walletUtxos": 0,
+    "walletBalance": 0
+}
+
+# Each probe refreshes on its own interval in the background; /api/stats
+# only hands out the latest published snapshot.
+STATS_INTERVALS = {"node": 2, "log": 1, "process": 30, "wallet": 30}
+
+# New log lines and changed stats fields are pushed to /api/stream clients
+STREAM_KEEPALIVE = 15
+
+# Throughput history survives page reloads in ~/.kaspa_dashboard/history
+HISTORY_DIR = os.path.expanduser("~/.kaspa_dashboard/history")
+HISTORY_METRICS = ("blockRate", "txRate", "daaScore", "blockCount", "peers", "mempool")
+HISTORY_INTERVAL = 5
+HISTORY_MAX_POINTS = 5000
+
+# Prometheus metric name -> (snapshot field, help text)
+PROMETHEUS_GAUGES = {
+    "kaspa_block_count": ("blockCount", "Blocks in the node's DAG"),
+    "kaspa_header_count": ("headerCount", "Headers known to the node"),
+    "kaspa_daa_score": ("daaScore", "Virtual DAA score"),
+    "kaspa_difficulty": ("difficulty", "Current network difficulty"),
+    "kaspa_peers": ("peers", "Connected P2P peers"),
+    "kaspa_mempool_size": ("mempool", "Transactions in the mempool"),
+    "kaspa_node_synced": ("synced", "1 if the node reports itself synced"),
+    "kaspa_block_rate": ("blockRate", "Blocks accepted in the last logged batch"),
+    "kaspa_tx_rate": ("txRate", "Logged unique transactions per second"),
+    "kaspa_node_rss_bytes": ("rssBytes", "Resident memory of the kaspad process"),
+    "kaspa_data_dir_bytes": ("dataDirBytes", "Disk used by the node data directory"),
+    "kaspa_wallet_utxos": ("walletUtxos", "UTXOs held by the dashboard wallet"),
+    "kaspa_wallet_balance_kas": ("walletBalance", "Balance of the dashboard wallet in KAS"),
+}
+
+MAX_GENERATED_KEYS = 1000
+
+# Compiled artifacts the bulk builder may validate against (?artifact=deadman.json)
+ARTIFACT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_rothschild_output(text):
+    """Pull node and wallet figures out of rothschild's text output"""
+    info = {}
+    fields = [
+        ("from address:", "address", str),
+        ("avg utxo amount:", "avgUtxo", int),
+        ("estimated available utxos:", "utxos", int),
+        ("block count:", "blockCount", int),
+        ("difficulty:", "difficulty", float),
+        ("daa score:", "daaScore", int),
+        ("pruning point:", "pruningPoint", str),
+    ]
+    for line in text.split("\n"):
+        line_lower = line.lower()
+        for marker, key, cast in fields:
+            idx = line_lower.find(marker)
+            if idx < 0:
+                continue
+            value = line[idx + len(marker):].strip()
+            try:
+                info[key] = value if cast is str else cast(value.replace(",", ""))
+            except ValueError:
+                pass
+            break
+    return info
+
+
+def rothschild_node_info(text):
+    """Node figures for probe_node from rothschild's startup output"""
+    parsed = parse_rothschild_output(text)
+    info = {"blockCount": parsed.get("blockCount", 0), "difficulty": parsed.get("difficulty", 0)}
+    if parsed.get("daaScore"):
+        info["daaScore"] = info["blueScore"] = parsed["daaScore"]
+    if parsed.get("pruningPoint"):
+        info["pruningPoint"] = parsed["pruningPoint"].replace(",", "")
+    return info
+
+
+def count_peers():
+    """Established P2P connections, from /proc or lsof where /proc is missing"""
+    peers = procinfo.established_connections(P2P_PORT)
+    if peers is None:
+        try:
+            result = subprocess.run(
+                ["lsof", "-i", f":{P2P_PORT}"],
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace'
+            )
+            peers = len([l for l in result.stdout.split('\n') if "ESTABLISHED" in l])
+        except:
+            peers = 0
+    return peers
+
+
+def kaspad_running():
+    """Whether a kaspad process exists, from /proc or lsof where /proc is missing"""
+    pid = procinfo.find_pid("kaspad")
+    if pid is not None:
+        return True
+    if procinfo.proc_available():
+        return False
+    # No /proc (macOS): ask lsof who owns the RPC port
+    result = subprocess.run(
+        ["lsof", "-i", f":{RPC_PORT}"],
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+    return "kaspad" in result.stdout
+
+
+def kaspad_rss():
+    """RSS of kaspad in bytes from /proc, or ps where /proc is missing"""
+    if procinfo.proc_available():
+        pid = procinfo.find_pid("kaspad")
+        return procinfo.rss_bytes(pid) if pid else None
+    result = subprocess.run(
+        ["ps", "-axo", "pid=,rss=,comm="],
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+    for line in result.stdout.splitlines():
+        parts = line.split(None, 2)
+        if len(parts) == 3 and os.path.basename(parts[2].strip()) == "kaspad":
+            return int(parts[1]) * 1024
+    return None
+
+
+def compose_stats(node, process, log, wallet=None):
+    """Merge probe results into the /api/stats shape"""
+    stats = dict(STATS_TEMPLATE)
+    stats["recentBlocks"] = []
+    if node.get("status") != "online":
+        return stats
+
+    stats["status"] = "online"
+    for key in ("peers", "mempool", "synced"):
+        if key in node:
+            stats[key] = node[key]
+
+    # Node figures win; the log only fills in what the node did not report
+    for key in ("blockCount", "headerCount", "difficulty", "daaScore", "pruningPoint"):
+        stats[key] = node.get(key) or log.get(key) or stats[key]
+    stats["blueScore"] = stats["daaScore"]
+    if stats["pruningPoint"]:
+        stats["pruningPoint"] = stats["pruningPoint"][:16] + "..."
+
+    for key in ("blockRate", "txRate"):
+        stats[key] = log.get(key, stats[key])
+    stats["recentBlocks"] = [
+        dict(block, blueScore=block["blueScore"] or stats["blueScore"])
+        for block in log.get("recentBlocks", [])
+    ]
+    stats["memory"] = process.get("memory", "")
+    stats["rssBytes"] = process.get("rssBytes", 0)
+    stats["dataDirBytes"] = process.get("dataDirBytes", 0)
+    if wallet:
+        stats["walletUtxos"] = wallet.get("utxos", 0)
+        stats["walletBalance"] = wallet.get("balance", 0)
+    return stats
+
+
+def metrics_text(collector, cache=None):
+    """Prometheus exposition of collector's latest snapshot and probe stats,
+    plus the lookup counters of cache (a SingleFlightCache) when given"""
+    snapshot = collector.snapshot()
+    data = snapshot.data
+    out = Exposition()
+    out.gauge("kaspa_node_up", "1 if the node answered the last probe", data.get("status") == "online")
+    for name, (field, help_text) in PROMETHEUS_GAUGES.items():
+        out.gauge(name, help_text, data.get(field) or 0)
+    out.gauge("kaspa_stats_generated_timestamp_seconds", "When the served snapshot was composed", snapshot.generated_at)
+
+    # Samples of one family must be contiguous in the exposition
+    source_stats = collector.source_stats()
+    for source, info in source_stats.items():
+        out.counter("kaspa_collector_runs_total", "Probe runs per collector source", info["runs"], {"source": source})
+    for source, info in source_stats.items():
+        out.counter("kaspa_collector_errors_total", "Failed probe runs per collector source", info["errors"], {"source": source})
+    for source, histogram in collector.latency_histograms().items():
+        out.histogram("kaspa_collector_probe_duration_seconds", "Probe latency per collector source", histogram, {"source": source})
+
+    if cache is None:
+        return out.text()
+    cache_stats = cache.stats()
+    for name, counts in cache_stats.items():
+        for result in ("hits", "stale", "misses", "coalesced"):
+            out.counter("kaspa_probe_cache_requests_total", "Probe cache lookups by outcome", counts[result], {"cache": name, "result": result})
+    for name, counts in cache_stats.items():
+        out.counter("kaspa_probe_cache_refreshes_total", "Probe cache loads run", counts["refreshes"], {"cache": name})
+    for name, counts in cache_stats.items():
+        out.counter("kaspa_probe_cache_errors_total", "Probe cache loads that failed", counts["errors"], {"cache": name})
+    return out.text()
+
+
+def log_request(log_file=LOG_FILE):
+    """Response body for /api/log: the last 50 lines of the kaspad log"""
+    try:
+        lines = tail_lines(log_file, 50) if os.path.exists(log_file) else []
+        return {"lines": lines, "success": True}
+    except Exception as e:
+        return {"error": str(e), "success": False}
+
+
+def generate_keys(count=1, prefix="kaspatest"):
+    """count fresh keypairs with x-only (Schnorr) and compressed (ECDSA) pubkeys"""
+    count = int(count)
+    if not 1 <= count <= MAX_GENERATED_KEYS:
+        raise ValueError(f"count must be between 1 and {MAX_GENERATED_KEYS}")
+    result = []
+    for private_key, compressed in generate_keypairs(count):
+        result.append({
+            "privateKey": private_key.hex(),
+            "publicKey": compressed[1:].hex(),
+            "compressedPublicKey": compressed.hex(),
+            "address": encode_address(prefix, VERSION_PUBKEY, compressed[1:]),
+        })
+    return result
+
+
+def generate_keys_request(data, args=None):
+    """Response body for /api/deadman/generate-keys; count=N (in the JSON
+    body or query string) generates keys in bulk"""
+    try:
+        count = (data or {}).get('count') or (args or {}).get('count') or 1
+        keys = generate_keys(count)
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+    body = {"success": True, "keys": keys}
+    if len(keys) == 1:
+        body.update(keys[0])
+    return body
+
+
+def constructor_args(data):
+    """Deadman switch constructor arguments from a create-args request body"""
+    (owner, owner_type), (beneficiary, beneficiary_type), (timeout, timeout_type) = DEADMAN_PARAMS
+    return [
+        encode_arg(data.get('ownerPubkey', ''), owner_type, owner),
+        encode_arg(data.get('beneficiaryPubkey', ''), beneficiary_type, beneficiary),
+        encode_arg(data.get('timeout', 31536000), timeout_type, timeout),
+    ]
+
+
+def create_args_request(data):
+    """Response body for /api/deadman/create-args"""
+    try:
+        return {"success": True, "args": constructor_args(data)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def bulk_args_params(args):
+    """Constructor params for a bulk request: the named artifact's, or DeadmanSwitch's"""
+    name = args.get('artifact')
+    if not name:
+        return DEADMAN_PARAMS
+    if os.path.basename(name) != name or not name.endswith(('.json', '.sila')):
+        raise ValueError(f"artifact must be a .json or .sila file name, got {name!r}")
+    with load_artifact(os.path.join(ARTIFACT_DIR, name)) as artifact:
+        return constructor_params(artifact)
+
+
+def bulk_args_format(args, content_type):
+    fmt = args.get('format') or ('jsonl' if 'json' in (content_type or '') else 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        raise ValueError(f"format must be csv or jsonl, got {fmt!r}")
+    return fmt
+
+
+def bulk_args_lines(text, fmt, params):
+    """One JSON line of args (or error) per input row"""
+    for result in build_args_text(text, fmt, params):
+        yield json.dumps(result, separators=(',', ':')) + "\n"
+
+
+class DashboardState:
+    """Everything a dashboard server keeps besides its collector: the log
+    tailer, event hub, data-dir size cache, and (once opened) the contract
+    registry, UTXO index and indexer, deadman watcher and metric history."""
+
+    def __init__(self, log_file=LOG_FILE, data_dir=NODE_DATA_DIR, history_dir=HISTORY_DIR,
+                 utxo_index_path=UTXO_INDEX_PATH, registry_path=REGISTRY_PATH,
+                 legacy_contracts_path=LEGACY_CONTRACTS_PATH):
+        self.log_file = log_file
+        self.history_dir = history_dir
+        self.utxo_index_path = utxo_index_path
+        self.registry_path = registry_path
+        self.legacy_contracts_path = legacy_contracts_path
+
+        # Derived from the key, so the balance is read over RPC without ever
+        # spawning the wallet while the node answers.
+        self.wallet_address = os.environ.get("KASPA_WALLET_ADDRESS") or address_from_private_key(WALLET_KEY, "kaspatest")
+
+        self.events = EventHub()
+        self.log_tailer = LogTailer(log_file, initial_lines=500)
+        self.log_metrics = LogMetrics(recent_blocks=10)
+        self._log_lock = threading.Lock()
+        self.data_dir_size = procinfo.DirSizeCache(data_dir, ttl=25)
+
+        self.history = None
+        self.utxo_index = None
+        self.utxo_indexer = None
+        self.deadman_watcher = None
+        self.contract_registry = None
+        self._history_last = 0.0
+        self._open_lock = threading.Lock()
+        self._started = False
+
+    def open(self):
+        """Open the on-disk stores and wire them together; later calls are no-ops"""
+        if self.contract_registry is not None:
+            return
+        with self._open_lock:
+            if self.contract_registry is not None:
+                return
+            self.history = TimeSeriesStore(self.history_dir)
+
+            # UTXOs of the wallet and every deadman contract, kept current from
+            # node notifications instead of re-downloading them on each request
+            self.utxo_index = UtxoIndex(self.utxo_index_path)
+            self.utxo_indexer = UtxoIndexer(self.utxo_index)
+
+            # Claimable-at DAA scores of every stored contract, advanced by the
+            # node's DAA score; alerts go out on /api/stream as "deadman" events
+            self.deadman_watcher = ContractWatcher(self.utxo_index.oldest_daa_score)
+            self.deadman_watcher.add_listener(lambda alert: self.events.publish("deadman", alert))
+            self.utxo_indexer.add_listener(self.deadman_watcher.refresh)
+
+            # Contracts live in an indexed SQLite registry; start() imports
+            # the old ~/.kaspa_dashboard/deadman_contracts.json
+            self.contract_registry = ContractRegistry(self.registry_path)
+
+    def start(self):
+        """Open the stores, import a legacy deadman_contracts.json, then
+        track the wallet and contract addresses and start the UTXO indexer;
+        later calls are no-ops"""
+        self.open()
+        with self._open_lock:
+            if self._started:
+                return
+            self._started = True
+        if self.legacy_contracts_path:
+            self.contract_registry.migrate(self.legacy_contracts_path)
+        timeouts = self.contract_registry.timeouts()
+        self.utxo_indexer.track([self.wallet_address] + list(timeouts))
+        for address, timeout in timeouts.items():
+            self.deadman_watcher.watch(address, timeout)
+        self.utxo_indexer.start()
+
+    def stop(self):
+        if self.utxo_indexer is not None:
+            self.utxo_indexer.stop()
+        if self.history is not None:
+            self.history.flush()
+
+    # -- probes ------------------------------------------------------------
+
+    def probe_log(self):
+        """Realtime figures from the kaspad log, parsing only newly appended lines"""
+        with self._log_lock:
+            lines = self.log_tailer.read_new()
+            if lines:
+                self.events.publish("log", lines)
+
+            # Lines arrive oldest first, so later matches overwrite earlier ones
+            # and each accepted block is tagged with the DAA score logged before it.
+            self.log_metrics.feed(lines)
+            return self.log_metrics.snapshot()
+
+    def probe_process(self):
+        """Memory and data-dir usage of the kaspad process"""
+        info = {}
+
+        rss = kaspad_rss()
+        if rss is not None:
+            info["rssBytes"] = rss
+            info["memory"] = f"{rss / 1024 ** 3:.1f} GB"
+
+        # Disk space used by the node, re-scanning only what changed
+        size = self.data_dir_size.size()
+        if size is not None:
+            info["dataDirBytes"] = size
+            info["memory"] = format_size(size)
+
+        return info
+
+    def indexed_wallet_entries(self):
+        """The wallet's UTXO entries from the local index while an indexer
+        keeps it current, else None (read them over RPC instead)"""
+        self.open()
+        if self.utxo_index.is_live() and self.utxo_index.balance(self.wallet_address) is not None:
+            return list(self.utxo_index.entries(self.wallet_address))
+        return None
+
+    def wallet_balance_from_utxos(self, entries, node):
+        """Exact wallet figures from the wallet's UTXO entries and a node_snapshot()"""
+        balance_info = BalanceSummary(node["daaScore"]).update(entries).as_dict()
+        balance_info.update({
+            "address": self.wallet_address,
+            "blockCount": node["blockCount"],
+            "difficulty": node["difficulty"],
+            "daaScore": node["daaScore"],
+        })
+        return balance_info
+
+    def wallet_balance_from_rothschild(self, text):
+        """Wallet figures scraped from rothschild output; remembers the address"""
+        balance_info = {"utxos": 0, "avgUtxo": 0, "balance": 0, "address": self.wallet_address, "blockCount": 0, "difficulty": 0, "daaScore": 0}
+        parsed = parse_rothschild_output(text)
+        for key in balance_info:
+            if key in parsed:
+                balance_info[key] = parsed[key]
+        if balance_info["address"]:
+            self.wallet_address = balance_info["address"]
+        if balance_info["avgUtxo"] > 0 and balance_info["utxos"] > 0:
+            balance_info["balance"] = (balance_info["avgUtxo"] * balance_info["utxos"]) / 1e8
+        return balance_info
+
+    # -- collector listeners ----------------------------------------------
+
+    def publish_stats_delta(self, previous, snapshot):
+        """Push only the stats fields that changed since the last snapshot"""
+        delta = changed_fields(previous.data, snapshot.data, ignore=("generatedAt",))
+        if delta:
+            delta["generatedAt"] = snapshot.generated_at
+            self.events.publish("stats", delta)
+
+    def record_history(self, previous, snapshot):
+        """Append the tracked metrics to the time-series store every HISTORY_INTERVAL s"""
+        data = snapshot.data
+        if data.get("status") != "online" or snapshot.generated_at - self._history_last < HISTORY_INTERVAL:
+            return
+        self.open()
+        self._history_last = snapshot.generated_at
+        for metric in HISTORY_METRICS:
+            self.history.append(metric, snapshot.generated_at, data.get(metric) or 0)
+
+    def advance_deadman(self, previous, snapshot):
+        """Move the deadman watcher to the snapshot's DAA score"""
+        daa_score = snapshot.data.get("daaScore")
+        if daa_score:
+            self.open()
+            self.deadman_watcher.advance(daa_score)
+
+    # -- requests ----------------------------------------------------------
+
+    def history_query(self, args):
+        """Run a /api/history range query for the given query-string args"""
+        metric = args.get('metric', '')
+        if metric not in HISTORY_METRICS:
+            return {"success": False, "error": f"metric must be one of {', '.join(HISTORY_METRICS)}"}
+        try:
+            end = float(args.get('to', time.time()))
+            start = float(args.get('from', end - 3600))
+            limit = min(int(args.get('limit', HISTORY_MAX_POINTS)), HISTORY_MAX_POINTS)
+        except ValueError:
+            return {"success": False, "error": "from, to and limit must be numbers"}
+        resolution = args.get('resolution') or None
+        if resolution is not None and resolution not in RESOLUTIONS:
+            return {"success": False, "error": f"resolution must be one of {', '.join(RESOLUTIONS)}"}
+
+        self.open()
+        resolution, points = self.history.query(metric, start, end, resolution=resolution, limit=limit)
+        return {
+            "success": True,
+            "metric": metric,
+            "resolution": resolution,
+            "from": start,
+            "to": end,
+            "points": [list(point) for point in points],
+        }
+
+    def deadman_status(self):
+        """Watcher counters, next expirations and recent alerts for all contracts"""
+        self.open()
+        return dict(self.deadman_watcher.status(), success=True)
+
+    def contracts_request(self, method, data, args=None):
+        """Handle a /api/deadman/contracts request and return the response body.
+
+        GET takes optional owner, beneficiary, limit and offset query args."""
+        self.open()
+        try:
+            return self._contracts_request(method, data, args or {})
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
+
+    def _contracts_request(self, method, data, args):
+        registry = self.contract_registry
+        if method == 'POST':
+            data = data or {}
+            action = data.get('action', '')
+            address = data.get('address', '')
+
+            if action == 'add':
+                if not address:
+                    return {"success": False, "error": "No address provided"}
+                contract = registry.add({
+                    'address': address,
+                    'ownerPubkey': data.get('ownerPubkey', ''),
+                    'beneficiaryPubkey': data.get('beneficiaryPubkey', ''),
+                    'timeout': data.get('timeout', 0),
+                    'created': time.time()
+                })
+                self.utxo_indexer.track([address])
+                self.deadman_watcher.watch(address, contract['timeout'])
+                return {"success": True}
+
+            elif action == 'remove':
+                removed = registry.remove(address)
+                self.deadman_watcher.unwatch(address)
+                return {"success": True, "removed": removed}
+
+            return {"success": False, "error": f"Unknown action: {action!r}"}
+
+        owner, beneficiary = args.get('owner'), args.get('beneficiary')
+        offset = int(args.get('offset', 0) or 0)
+        contracts = registry.page(owner, beneficiary, args.get('limit'), offset)
+
+        # Balances come from the local UTXO index while it is being kept current
+        live = self.utxo_index.is_live()
+        for contract in contracts:
+            indexed = self.utxo_index.balance(contract['address']) if live else None
+            if indexed is not None:
+                contract['utxos'], contract['sompi'] = indexed
+
+        total = registry.count(owner, beneficiary)
+        next_offset = offset + len(contracts)
+        return {
+            "success": True,
+            "contracts": contracts,
+            "total": total,
+            "offset": offset,
+            "nextOffset": next_offset if next_offset < total else None,
+        }
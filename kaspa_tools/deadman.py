@@ -0,0 +1,203 @@
+"""
+Deadman switch contract watcher
+
+A contract becomes claimable by its beneficiary once its oldest UTXO is
+`timeout` DAA scores old (this.age >= timeout compiles to
+OpCheckSequenceVerify, which compares raw DAA score). The watcher keeps every contract's claimable-at DAA score in a heap, fed by
+UTXO index change callbacks, and advances through it as the virtual DAA
+score moves. Each contract raises an "expiring" alert when it gets within
+warn_seconds of its deadline and an "expired" alert once claimable.
+status() costs the same whether a dozen or thousands of contracts are
+watched.
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+
+# testnet-12 produces 10 blocks (DAA scores) per second; only used to turn
+# DAA scores into wall-clock estimates (warning window, secondsRemaining)
+DAA_PER_SECOND = 10
+
+WARN_SECONDS = 24 * 3600
+
+EXPIRING = "expiring"
+EXPIRED = "expired"
+
+
+class _Watched:
+    __slots__ = ("address", "timeout", "deadline", "version", "state")
+
+    def __init__(self, address, timeout):
+        self.address = address
+        self.timeout = timeout
+        self.deadline = None  # DAA score at which it becomes claimable
+        self.version = 0
+        self.state = None  # None, EXPIRING or EXPIRED
+
+
+class ContractWatcher:
+    """Tracks claimable-at DAA scores of deadman contracts.
+
+    oldest_daa_score(address) returns the DAA score of the address's oldest
+    UTXO, or None when it is unfunded (UtxoIndex.oldest_daa_score fits)."""
+
+    def __init__(self, oldest_daa_score, warn_seconds=WARN_SECONDS, daa_per_second=DAA_PER_SECOND,
+                 alert_history=100):
+        self._oldest = oldest_daa_score
+        self.warn_daa = warn_seconds * daa_per_second
+        self.daa_per_second = daa_per_second
+        self.virtual_daa_score = None
+        self.alerts = deque(maxlen=alert_history)
+        self._contracts = {}
+        self._heap = []  # (due daa score, version, address, state to enter)
+        self._by_deadline = []  # (deadline, version, address) for upcoming()
+        self._counts = {"funded": 0, EXPIRING: 0, EXPIRED: 0}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """Call callback(alert dict) for every expiring/expired transition"""
+        self._listeners.append(callback)
+
+    def watch(self, address, timeout):
+        """Start (or update) watching a contract whose this.age bound is timeout DAA scores"""
+        with self._lock:
+            watched = self._contracts.get(address)
+            if watched is None:
+                watched = self._contracts[address] = _Watched(address, int(timeout))
+            else:
+                watched.timeout = int(timeout)
+        self.refresh([address])
+
+    def unwatch(self, address):
+        with self._lock:
+            watched = self._contracts.pop(address, None)
+            if watched is not None:
+                self._set_deadline(watched, None)
+
+    def refresh(self, addresses):
+        """Recompute deadlines of addresses after their UTXOs changed"""
+        updates = []
+        for address in addresses:
+            if address in self._contracts:
+                updates.append((address, self._oldest(address)))
+        alerts = []
+        with self._lock:
+            for address, oldest in updates:
+                watched = self._contracts.get(address)
+                if watched is None:
+                    continue
+                deadline = None if oldest is None else oldest + watched.timeout
+                if deadline != watched.deadline:
+                    self._set_deadline(watched, deadline)
+            alerts = self._advance_locked()
+        self._notify(alerts)
+
+    def advance(self, virtual_daa_score):
+        """Move the clock to virtual_daa_score and fire due alerts"""
+        with self._lock:
+            if self.virtual_daa_score is not None and virtual_daa_score <= self.virtual_daa_score:
+                return
+            self.virtual_daa_score = virtual_daa_score
+            alerts = self._advance_locked()
+        self._notify(alerts)
+
+    def _set_deadline(self, watched, deadline):
+        # Old heap entries are invalidated by the version bump
+        if watched.deadline is not None:
+            self._counts["funded"] -= 1
+        if watched.state is not None:
+            self._counts[watched.state] -= 1
+        watched.version += 1
+        watched.deadline = deadline
+        watched.state = None
+        if deadline is not None:
+            self._counts["funded"] += 1
+            heapq.heappush(self._heap, (deadline - self.warn_daa, watched.version, watched.address, EXPIRING))
+            heapq.heappush(self._by_deadline, (deadline, watched.version, watched.address))
+
+    def _advance_locked(self):
+        alerts = []
+        now = self.virtual_daa_score
+        if now is None:
+            return alerts
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due, version, address, state = heapq.heappop(heap)
+            watched = self._contracts.get(address)
+            if watched is None or watched.version != version:
+                continue
+            if state == EXPIRING:
+                if watched.deadline > now:
+                    self._enter(watched, EXPIRING, alerts)
+                heapq.heappush(heap, (watched.deadline, version, address, EXPIRED))
+            else:
+                self._enter(watched, EXPIRED, alerts)
+        return alerts
+
+    def _enter(self, watched, state, alerts):
+        if watched.state is not None:
+            self._counts[watched.state] -= 1
+        watched.state = state
+        self._counts[state] += 1
+        alert = {
+            "type": state,
+            "address": watched.address,
+            "deadline": watched.deadline,
+            "virtualDaaScore": self.virtual_daa_score,
+            "time": time.time(),
+        }
+        self.alerts.appendleft(alert)
+        alerts.append(alert)
+
+    def _notify(self, alerts):
+        for alert in alerts:
+            for callback in self._listeners:
+                try:
+                    callback(alert)
+                except Exception:
+                    pass
+
+    def upcoming(self, limit=10):
+        """The next limit contracts to become claimable, soonest first"""
+        with self._lock:
+            # Pop live entries and push them back: O(limit log n), not O(n)
+            heap = self._by_deadline
+            popped = []
+            result = []
+            while heap and len(result) < limit:
+                item = heapq.heappop(heap)
+                _, version, address = item
+                watched = self._contracts.get(address)
+                if watched is None or watched.version != version or watched.state == EXPIRED:
+                    # Stale or already claimable: a new deadline pushes a new entry
+                    continue
+                popped.append(item)
+                result.append(self._describe(watched))
+            for item in popped:
+                heapq.heappush(heap, item)
+            return result
+
+    def _describe(self, watched):
+        info = {"address": watched.address, "deadline": watched.deadline, "state": watched.state}
+        if self.virtual_daa_score is not None:
+            remaining = max(0, watched.deadline - self.virtual_daa_score)
+            info["daaRemaining"] = remaining
+            info["secondsRemaining"] = remaining / self.daa_per_second
+        return info
+
+    def status(self, upcoming=10, alerts=20):
+        """Counters, the next expirations and the most recent alerts"""
+        next_up = self.upcoming(upcoming)
+        with self._lock:
+            return {
+                "contracts": len(self._contracts),
+                "funded": self._counts["funded"],
+                "expiring": self._counts[EXPIRING],
+                "expired": self._counts[EXPIRED],
+                "virtualDaaScore": self.virtual_daa_score,
+                "upcoming": next_up,
+                "alerts": list(self.alerts)[:alerts],
+            }
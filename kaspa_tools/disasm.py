@@ -0,0 +1,352 @@
+"""
+Disassembler and static cost report for silverc scripts
+
+Scripts are decoded with 256-entry lookup tables (name, immediate length,
+sig-op weight), so each instruction costs a couple of indexings and one
+slice. A script is split the way silverc lays it out. Contract fields
+come first as a prolog. With more than one entrypoint, a selector
+dispatch follows, one branch per ABI entry:
+
+    OpDup <index> OpNumEqual OpIf OpDrop <body> OpElse ... OpEndIf
+
+For every entrypoint the report gives its branch size, static sig-op
+count and an estimated spend mass. The mass uses kaspad's
+per-transaction-byte and per-sig-op rates. Its input size assumes a P2SH
+spend: the sigscript holds the ABI arguments, the selector and the
+redeem script. Opcodes after OpTxOutputSpk (0xc3) that only exist on
+testnet-12 are shown as OpUnknown<n>. They carry no immediate data, so
+the decoding stays aligned.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .artifact import load_artifact
+
+# kaspad mass parameters (consensus params mass_per_tx_byte / mass_per_sig_op)
+MASS_PER_TX_BYTE = 1
+MASS_PER_SIG_OP = 1000
+# Outpoint (32 + 4), sigscript length (8) and sequence (8) around the sigscript
+INPUT_OVERHEAD = 52
+# Without a preceding OP_n, a multisig counts as the maximum number of keys
+MAX_PUBKEYS_PER_MULTISIG = 20
+
+# Pushed sizes of ABI argument types (sig carries the sighash type byte)
+ARG_SIZES = {"sig": 65, "datasig": 64, "pubkey": 32, "int": 8, "bool": 1}
+
+OP_FALSE = 0x00
+OP_PUSHDATA1 = 0x4C
+OP_PUSHDATA2 = 0x4D
+OP_PUSHDATA4 = 0x4E
+OP_1NEGATE = 0x4F
+OP_TRUE = 0x51
+OP_16 = 0x60
+OP_IF = 0x63
+OP_NOTIF = 0x64
+OP_ELSE = 0x67
+OP_ENDIF = 0x68
+OP_VERIFY = 0x69
+OP_DROP = 0x75
+OP_DUP = 0x76
+OP_NUMEQUAL = 0x9C
+
+_NAMED = {
+    0x00: "OpFalse", 0x4C: "OpPushData1", 0x4D: "OpPushData2", 0x4E: "OpPushData4",
+    0x4F: "Op1Negate", 0x50: "OpReserved", 0x51: "OpTrue",
+    0x61: "OpNop", 0x62: "OpVer", 0x63: "OpIf", 0x64: "OpNotIf", 0x65: "OpVerIf",
+    0x66: "OpVerNotIf", 0x67: "OpElse", 0x68: "OpEndIf", 0x69: "OpVerify", 0x6A: "OpReturn",
+    0x6B: "OpToAltStack", 0x6C: "OpFromAltStack", 0x6D: "Op2Drop", 0x6E: "Op2Dup",
+    0x6F: "Op3Dup", 0x70: "Op2Over", 0x71: "Op2Rot", 0x72: "Op2Swap", 0x73: "OpIfDup",
+    0x74: "OpDepth", 0x75: "OpDrop", 0x76: "OpDup", 0x77: "OpNip", 0x78: "OpOver",
+    0x79: "OpPick", 0x7A: "OpRoll", 0x7B: "OpRot", 0x7C: "OpSwap", 0x7D: "OpTuck",
+    0x7E: "OpCat", 0x7F: "OpSubstr", 0x80: "OpLeft", 0x81: "OpRight", 0x82: "OpSize",
+    0x83: "OpInvert", 0x84: "OpAnd", 0x85: "OpOr", 0x86: "OpXor", 0x87: "OpEqual",
+    0x88: "OpEqualVerify", 0x89: "OpReserved1", 0x8A: "OpReserved2", 0x8B: "Op1Add",
+    0x8C: "Op1Sub", 0x8D: "Op2Mul", 0x8E: "Op2Div", 0x8F: "OpNegate", 0x90: "OpAbs",
+    0x91: "OpNot", 0x92: "Op0NotEqual", 0x93: "OpAdd", 0x94: "OpSub", 0x95: "OpMul",
+    0x96: "OpDiv", 0x97: "OpMod", 0x98: "OpLShift", 0x99: "OpRShift", 0x9A: "OpBoolAnd",
+    0x9B: "OpBoolOr", 0x9C: "OpNumEqual", 0x9D: "OpNumEqualVerify", 0x9E: "OpNumNotEqual",
+    0x9F: "OpLessThan", 0xA0: "OpGreaterThan", 0xA1: "OpLessThanOrEqual",
+    0xA2: "OpGreaterThanOrEqual", 0xA3: "OpMin", 0xA4: "OpMax", 0xA5: "OpWithin",
+    0xA8: "OpSHA256", 0xA9: "OpCheckMultiSigECDSA", 0xAA: "OpBlake2b",
+    0xAB: "OpCheckSigECDSA", 0xAC: "OpCheckSig", 0xAD: "OpCheckSigVerify",
+    0xAE: "OpCheckMultiSig", 0xAF: "OpCheckMultiSigVerify",
+    0xB0: "OpCheckLockTimeVerify", 0xB1: "OpCheckSequenceVerify",
+    0xB2: "OpTxVersion", 0xB3: "OpTxInputCount", 0xB4: "OpTxOutputCount",
+    0xB5: "OpTxLockTime", 0xB6: "OpTxSubnetId", 0xB7: "OpTxGas", 0xB8: "OpTxPayload",
+    0xB9: "OpTxInputIndex", 0xBA: "OpOutpointTxId", 0xBB: "OpOutpointIndex",
+    0xBC: "OpTxInputScriptSig", 0xBD: "OpTxInputSeq", 0xBE: "OpTxInputAmount",
+    0xBF: "OpTxInputSpk", 0xC0: "OpTxInputBlockDaaScore", 0xC1: "OpTxInputIsCoinbase",
+    0xC2: "OpTxOutputAmount", 0xC3: "OpTxOutputSpk",
+}
+
+# opcode -> name, immediate data length, length-prefix size, sig-op weight
+NAMES = [_NAMED.get(op, f"OpUnknown{op}") for op in range(256)]
+for _op in range(0x01, 0x4C):
+    NAMES[_op] = f"OpData{_op}"
+for _op in range(0x52, OP_16 + 1):
+    NAMES[_op] = f"Op{_op - 0x50}"
+DATA_LENGTHS = [op if 0x01 <= op <= 0x4B else 0 for op in range(256)]
+PREFIX_LENGTHS = [{OP_PUSHDATA1: 1, OP_PUSHDATA2: 2, OP_PUSHDATA4: 4}.get(op, 0) for op in range(256)]
+SIG_OPS = [1 if op in (0xAB, 0xAC, 0xAD) else 0 for op in range(256)]
+MULTISIG = frozenset((0xA9, 0xAE, 0xAF))
+
+
+class DisasmError(ValueError):
+    """A script that does not decode or does not have silverc's layout"""
+
+
+def decode(script):
+    """[(offset, opcode, data)] for a script; data is b"" for non-pushes"""
+    script = bytes(script)
+    end = len(script)
+    out = []
+    append = out.append
+    pos = 0
+    while pos < end:
+        op = script[pos]
+        start = pos + 1
+        prefix = PREFIX_LENGTHS[op]
+        if prefix:
+            if start + prefix > end:
+                raise DisasmError(f"truncated {NAMES[op]} length at offset {pos}")
+            size = int.from_bytes(script[start:start + prefix], "little")
+            start += prefix
+        else:
+            size = DATA_LENGTHS[op]
+        if start + size > end:
+            raise DisasmError(f"{NAMES[op]} at offset {pos} runs past the end of the script")
+        append((pos, op, script[start:start + size]))
+        pos = start + size
+    return out
+
+
+def push_int(instruction):
+    """Integer value of a push instruction, None if it is not one"""
+    _, op, data = instruction
+    if op == OP_FALSE:
+        return 0
+    if op == OP_1NEGATE:
+        return -1
+    if OP_TRUE <= op <= OP_16:
+        return op - 0x50
+    if not data or op > OP_PUSHDATA4:
+        return None
+    value = int.from_bytes(data, "little")
+    sign_bit = 0x80 << (8 * (len(data) - 1))
+    return -(value & ~sign_bit) if value & sign_bit else value
+
+
+def format_instructions(instructions):
+    """One "offset  name [hex]" line per instruction"""
+    lines = []
+    for offset, op, data in instructions:
+        lines.append(f"{offset:04x}  {NAMES[op]} {data.hex()}".rstrip())
+    return "\n".join(lines)
+
+
+def sig_ops(instructions):
+    """Static sig-op count, the way kaspad counts a redeem script"""
+    count = 0
+    previous = None
+    for instruction in instructions:
+        op = instruction[1]
+        if op in MULTISIG:
+            keys = previous is not None and OP_TRUE <= previous[1] <= OP_16
+            count += previous[1] - 0x50 if keys else MAX_PUBKEYS_PER_MULTISIG
+        else:
+            count += SIG_OPS[op]
+        previous = instruction
+    return count
+
+
+def push_size(length):
+    """Bytes a minimal push of length bytes takes"""
+    if length <= 0x4B:
+        return 1 + length
+    if length <= 0xFF:
+        return 2 + length
+    if length <= 0xFFFF:
+        return 3 + length
+    return 5 + length
+
+
+def span(instructions):
+    """Bytes covered by a run of decoded instructions"""
+    if not instructions:
+        return 0
+    offset, op, data = instructions[-1]
+    return offset + 1 + PREFIX_LENGTHS[op] + len(data) - instructions[0][0]
+
+
+def _is_dispatch(instructions, index, selector):
+    window = instructions[index:index + 5]
+    return (
+        len(window) == 5
+        and window[0][1] == OP_DUP
+        and push_int(window[1]) == selector
+        and window[2][1] == OP_NUMEQUAL
+        and window[3][1] == OP_IF
+        and window[4][1] == OP_DROP
+    )
+
+
+def _branch_end(instructions, start):
+    # Index of the OpElse closing the branch that starts at start
+    depth = 0
+    for index in range(start, len(instructions)):
+        op = instructions[index][1]
+        if op in (OP_IF, OP_NOTIF):
+            depth += 1
+        elif op == OP_ENDIF:
+            depth -= 1
+        elif op == OP_ELSE and depth == 0:
+            return index
+    raise DisasmError("selector branch has no closing OpElse")
+
+
+def split_entrypoints(instructions, names, without_selector=False):
+    """(prolog, {name: branch instructions}) following silverc's layout"""
+    if without_selector or len(names) <= 1:
+        # A single entrypoint follows the field prolog directly; the two
+        # cannot be told apart from the bytes alone, so it gets everything
+        return [], {names[0] if names else "": list(instructions)}
+
+    start = None
+    depth = 0
+    for index, instruction in enumerate(instructions):
+        if depth == 0 and _is_dispatch(instructions, index, 0):
+            start = index
+            break
+        if instruction[1] in (OP_IF, OP_NOTIF):
+            depth += 1
+        elif instruction[1] == OP_ENDIF:
+            depth -= 1
+    if start is None:
+        raise DisasmError("no selector dispatch found")
+
+    prolog = instructions[:start]
+    branches = {}
+    position = start
+    for selector, name in enumerate(names):
+        if not _is_dispatch(instructions, position, selector):
+            raise DisasmError(f"expected the dispatch for {name} (selector {selector}) at offset {instructions[position][0]}")
+        end = _branch_end(instructions, position + 5)
+        # Dispatch and body; the trailing OpElse/OpEndIf are shared plumbing
+        branches[name] = instructions[position:end]
+        position = end + 1
+    return prolog, branches
+
+
+def _arg_size(type_name):
+    if type_name in ARG_SIZES:
+        return ARG_SIZES[type_name], False
+    if type_name.startswith("byte[") and type_name[5:-1].isdigit():
+        return int(type_name[5:-1]), False
+    if type_name.startswith("bytes") and type_name[5:].isdigit():
+        return int(type_name[5:]), False
+    return 0, True  # bytes, string, byte[]: size only known at spend time
+
+
+def analyze_artifact(artifact, name=None):
+    """Cost report (a dict) for an Artifact"""
+    instructions = decode(artifact.script)
+    names = [entry["name"] for entry in artifact.abi]
+    prolog, branches = split_entrypoints(instructions, names, artifact.without_selector)
+    script_size = len(artifact.script)
+    script_sig_ops = sig_ops(instructions)
+    prolog_sig_ops = sig_ops(prolog)
+    redeem_push = push_size(script_size)
+
+    entrypoints = []
+    for index, entry in enumerate(artifact.abi):
+        branch = branches.get(entry["name"], [])
+        variable = []
+        sigscript = redeem_push
+        for arg in entry.get("inputs", []):
+            arg_size, unknown = _arg_size(arg["type_name"])
+            if unknown:
+                variable.append(arg["name"])
+            sigscript += push_size(arg_size) if arg_size else 1
+        if len(names) > 1 and not artifact.without_selector:
+            sigscript += 1 if index <= 16 else push_size(1)
+        entry_sig_ops = prolog_sig_ops + sig_ops(branch)
+        entrypoints.append({
+            "name": entry["name"],
+            "offset": branch[0][0] if branch else None,
+            "size": span(branch),
+            "opcodes": len(branch),
+            "sig_ops": entry_sig_ops,
+            "sigscript_bytes": sigscript,
+            "mass": (INPUT_OVERHEAD + sigscript) * MASS_PER_TX_BYTE + entry_sig_ops * MASS_PER_SIG_OP,
+            "variable_args": variable,
+        })
+    return {
+        "path": name,
+        "contract": artifact.contract_name,
+        "script_size": script_size,
+        "opcodes": len(instructions),
+        "sig_ops": script_sig_ops,
+        "prolog_size": span(prolog),
+        "selector": not artifact.without_selector and len(names) > 1,
+        "entrypoints": entrypoints,
+    }
+
+
+def analyze(path):
+    """analyze_artifact for an artifact file (any format artifact.py reads)"""
+    with load_artifact(path) as artifact:
+        return analyze_artifact(artifact, path)
+
+
+def analyze_many(paths, workers=None):
+    """Reports for many artifacts, in order; failures become
+    {"path", "error"} entries instead of stopping the batch"""
+    def run(path):
+        try:
+            return analyze(path)
+        except (OSError, ValueError, KeyError) as e:
+            return {"path": path, "error": str(e)}
+
+    paths = list(paths)
+    if len(paths) < 8:
+        return [run(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return list(pool.map(run, paths))
+
+
+def artifact_paths(directory):
+    """Artifact files in a directory: *.sila and *.json that are not args files"""
+    found = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".sila") or (name.endswith(".json") and not name.endswith("_args.json")):
+            found.append(os.path.join(directory, name))
+    return found
+
+
+def compare(reports, baseline):
+    """[(path, entrypoint, old mass, new mass)] for entrypoints that got
+    heavier than in baseline (an earlier list of reports)"""
+    previous = {}
+    for report in baseline:
+        for entry in report.get("entrypoints", []):
+            previous[(report.get("contract"), entry["name"])] = entry["mass"]
+    grown = []
+    for report in reports:
+        for entry in report.get("entrypoints", []):
+            old = previous.get((report.get("contract"), entry["name"]))
+            if old is not None and entry["mass"] > old:
+                grown.append((report["path"], entry["name"], old, entry["mass"]))
+    return grown
+
+
+def load_reports(path):
+    """Reports saved as JSON (a list) or JSON Lines"""
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+        return data if isinstance(data, list) else [data]
+    except ValueError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
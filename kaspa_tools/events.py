@@ -0,0 +1,115 @@
+"""
+Fan-out of dashboard events to streaming subscribers
+
+Publishers push (event, data) pairs; every subscriber gets its own
+bounded queue. A subscriber that falls behind is flagged instead of
+blocking the publisher, and resynchronises from a full snapshot.
+"""
+
+import asyncio
+import queue
+import threading
+
+
+class Subscription:
+    """One subscriber's queue of pending (event, data) pairs"""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.overflowed = False
+
+    def get(self, timeout=None):
+        """Next (event, data) pair, or None after timeout seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Drop the backlog; the reader will resync from a snapshot
+            self.overflowed = True
+            with self.queue.mutex:
+                self.queue.queue.clear()
+
+
+class AsyncSubscription:
+    """Subscription read from an event loop; publishers may be any thread"""
+
+    def __init__(self, maxsize, loop):
+        self.queue = asyncio.Queue(maxsize)
+        self.loop = loop
+        self.overflowed = False
+
+    async def get(self, timeout=None):
+        """Next (event, data) pair, or None after timeout seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def put(self, item):
+        try:
+            self.loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _put(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+
+class EventHub:
+    """Broadcasts events to every current subscription"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        sub = Subscription(self.maxsize)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def subscribe_async(self):
+        """Subscribe from a coroutine; events are delivered on its loop"""
+        sub = AsyncSubscription(self.maxsize, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event, data):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.put((event, data))
+
+
+def changed_fields(old, new, ignore=()):
+    """Keys of new whose values differ from old (or are missing in old)"""
+    return {
+        key: value
+        for key, value in new.items()
+        if key not in ignore and (key not in old or old[key] != value)
+    }
+
+
+def format_sse(event, payload):
+    """Encode one Server-Sent Events frame; payload is a JSON string"""
+    return f"event: {event}\ndata: {payload}\n\n"
@@ -0,0 +1,174 @@
+"""
+secp256k1 public keys for Kaspa private keys
+
+Uses coincurve (libsecp256k1) when it is installed and falls back to a
+small pure-Python implementation otherwise. Kaspa's default (Schnorr)
+addresses commit to the 32-byte x-only public key; ECDSA addresses use
+the 33-byte compressed key.
+"""
+
+import secrets
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+# Curve parameters
+P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+)
+
+
+def parse_private_key(private_key):
+    """32-byte secret from hex (optionally 0x-prefixed) or bytes"""
+    if isinstance(private_key, str):
+        text = private_key.strip()
+        if text.startswith(("0x", "0X")):
+            text = text[2:]
+        try:
+            private_key = bytes.fromhex(text)
+        except ValueError:
+            raise ValueError("private key is not valid hex") from None
+    if len(private_key) != 32:
+        raise ValueError(f"private key must be 32 bytes, got {len(private_key)}")
+    if not 0 < int.from_bytes(private_key, "big") < N:
+        raise ValueError("private key is out of range for secp256k1")
+    return bytes(private_key)
+
+
+# Jacobian coordinates (X, Y, Z) keep inversions out of the inner loop;
+# None is the point at infinity.
+
+def _double(p):
+    if p is None:
+        return None
+    x, y, z = p
+    if y == 0:
+        return None
+    ysq = y * y % P
+    s = 4 * x * ysq % P
+    m = 3 * x * x % P
+    nx = (m * m - 2 * s) % P
+    ny = (m * (s - nx) - 8 * ysq * ysq) % P
+    nz = 2 * y * z % P
+    return nx, ny, nz
+
+
+def _add(p, q):
+    if p is None:
+        return q
+    if q is None:
+        return p
+    x1, y1, z1 = p
+    x2, y2, z2 = q
+    z1z1 = z1 * z1 % P
+    z2z2 = z2 * z2 % P
+    u1 = x1 * z2z2 % P
+    u2 = x2 * z1z1 % P
+    s1 = y1 * z2 * z2z2 % P
+    s2 = y2 * z1 * z1z1 % P
+    if u1 == u2:
+        return _double(p) if s1 == s2 else None
+    h = u2 - u1
+    r = s2 - s1
+    hh = h * h % P
+    hhh = h * hh % P
+    v = u1 * hh % P
+    nx = (r * r - hhh - 2 * v) % P
+    ny = (r * (v - nx) - s1 * hhh) % P
+    nz = h * z1 * z2 % P
+    return nx, ny, nz
+
+
+def _to_affine(p, zinv=None):
+    x, y, z = p
+    if zinv is None:
+        zinv = pow(z, -1, P)
+    zinv2 = zinv * zinv % P
+    return x * zinv2 % P, y * zinv2 * zinv % P
+
+
+def _batch_to_affine(points):
+    # Montgomery's trick: one modular inversion for the whole batch
+    prefix = []
+    acc = 1
+    for _, _, z in points:
+        prefix.append(acc)
+        acc = acc * z % P
+    inv = pow(acc, -1, P)
+    result = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        z = points[i][2]
+        result[i] = _to_affine(points[i], inv * prefix[i] % P)
+        inv = inv * z % P
+    return result
+
+
+def _build_table():
+    # G * 2^i for every bit, so multiplication is additions only
+    table = []
+    point = (G[0], G[1], 1)
+    for _ in range(256):
+        table.append(point)
+        point = _double(point)
+    return table
+
+
+_G_TABLE = None
+
+
+def _multiply_g_jacobian(scalar):
+    global _G_TABLE
+    if _G_TABLE is None:
+        _G_TABLE = _build_table()
+    result = None
+    for i in range(scalar.bit_length()):
+        if scalar >> i & 1:
+            result = _add(result, _G_TABLE[i])
+    return result
+
+
+def _multiply_g(scalar):
+    return _to_affine(_multiply_g_jacobian(scalar))
+
+
+def _sec1(x, y, compressed):
+    if compressed:
+        return bytes([2 + (y & 1)]) + x.to_bytes(32, "big")
+    return b"\x04" + x.to_bytes(32, "big") + y.to_bytes(32, "big")
+
+
+def public_key(private_key, compressed=True):
+    """SEC1 public key bytes (33 compressed or 65 uncompressed)"""
+    secret = parse_private_key(private_key)
+    if coincurve is not None:
+        return coincurve.PrivateKey(secret).public_key.format(compressed=compressed)
+    return _sec1(*_multiply_g(int.from_bytes(secret, "big")), compressed)
+
+
+def xonly_public_key(private_key):
+    """32-byte x-only public key used by Kaspa Schnorr addresses"""
+    return public_key(private_key, compressed=True)[1:]
+
+
+def generate_private_key():
+    """Random 32-byte secret from the OS CSPRNG, in range for secp256k1"""
+    while True:
+        secret = secrets.token_bytes(32)
+        if 0 < int.from_bytes(secret, "big") < N:
+            return secret
+
+
+def generate_keypairs(count=1):
+    """count fresh (private key, 33-byte compressed public key) pairs.
+
+    Without coincurve the batch shares a single field inversion."""
+    keys = [generate_private_key() for _ in range(count)]
+    if coincurve is not None:
+        return [(k, coincurve.PrivateKey(k).public_key.format(compressed=True)) for k in keys]
+    points = _batch_to_affine([_multiply_g_jacobian(int.from_bytes(k, "big")) for k in keys]) if keys else []
+    return [(k, _sec1(x, y, True)) for k, (x, y) in zip(keys, points)]
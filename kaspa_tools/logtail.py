@@ -0,0 +1,85 @@
+"""
+Incremental log tailing
+
+tail_lines() reads the last N lines by seeking backwards from the end of
+the file, and LogTailer follows a growing log by byte offset so each
+poll only reads what was appended since the previous one. Rotation
+(new inode) and truncation (file shorter than the saved offset) restart
+reading from the beginning of the current file.
+"""
+
+import os
+
+BLOCK_SIZE = 65536
+
+
+def tail_lines(path, n, encoding="utf-8"):
+    """Return the last n lines of path without reading the whole file"""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        # n lines need n newlines plus the start of the first line
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode(encoding, errors="replace").splitlines(keepends=True)
+    return lines[-n:]
+
+
+class LogTailer:
+    """Follows one log file, returning only lines appended since the last read"""
+
+    def __init__(self, path, initial_lines=500, encoding="utf-8"):
+        self.path = path
+        self.initial_lines = initial_lines
+        self.encoding = encoding
+        self.offset = None
+        self.inode = None
+        self._partial = b""
+
+    def read_new(self):
+        """Return complete lines appended since the previous call.
+
+        The first call returns up to initial_lines of existing backlog.
+        A trailing line without a newline is held back until it completes."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        inode = (st.st_dev, st.st_ino)
+        if self.offset is None:
+            # First read: start from the backlog rather than the whole file
+            self.inode = inode
+            self.offset = st.st_size
+            self._partial = b""
+            lines = tail_lines(self.path, self.initial_lines, self.encoding) if self.initial_lines else []
+            if lines and not lines[-1].endswith("\n"):
+                self._partial = lines.pop().encode(self.encoding)
+            return lines
+
+        if inode != self.inode or st.st_size < self.offset:
+            # Rotated or truncated: everything in the current file is new
+            self.inode = inode
+            self.offset = 0
+            self._partial = b""
+
+        if st.st_size == self.offset:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        self.offset += len(data)
+
+        data = self._partial + data
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        if not end:
+            return []
+        return data[:end].decode(self.encoding, errors="replace").splitlines(keepends=True)
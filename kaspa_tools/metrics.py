@@ -0,0 +1,98 @@
+"""
+Prometheus text exposition helpers
+
+Just enough of the text format (version 0.0.4) to export gauges,
+counters and histograms without pulling in prometheus_client.
+"""
+
+import bisect
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def collect(self):
+        """Return ([(upper bound, cumulative count), ...], sum, count)"""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            running += count
+            cumulative.append((bound, running))
+        return cumulative, total, running
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value):
+    if value is True or value is False:
+        return "1" if value else "0"
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+    return repr(value) if isinstance(value, float) else str(int(value))
+
+
+class Exposition:
+    """Accumulates metric families and renders the exposition text"""
+
+    def __init__(self):
+        self._lines = []
+        self._declared = set()
+
+    def _declare(self, name, kind, help_text):
+        if name in self._declared:
+            return
+        self._declared.add(name)
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name, help_text, value, labels=None):
+        self._declare(name, "gauge", help_text)
+        self._lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def counter(self, name, help_text, value, labels=None):
+        """name should carry the conventional _total suffix"""
+        self._declare(name, "counter", help_text)
+        self._lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name, help_text, histogram, labels=None):
+        self._declare(name, "histogram", help_text)
+        labels = dict(labels or {})
+        buckets, total, count = histogram.collect()
+        for bound, cumulative in buckets:
+            self._lines.append(f"{name}_bucket{_labels(dict(labels, le=_number(float(bound))))} {cumulative}")
+        self._lines.append(f"{name}_sum{_labels(labels)} {_number(float(total))}")
+        self._lines.append(f"{name}_count{_labels(labels)} {count}")
+
+    def text(self):
+        return "\n".join(self._lines) + "\n"
@@ -0,0 +1,65 @@
+"""
+Node status read straight from kaspad's JSON-RPC
+
+One batched round-trip replaces scraping the rothschild wallet's
+startup banner for block count, difficulty and DAA score.
+"""
+
+from .rpc import get_client
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+NODE_CALLS = [
+    ("getBlockDagInfo", None),
+    ("getInfo", None),
+    ("getConnectedPeerInfo", None),
+]
+
+
+def node_snapshot(client=None):
+    """Return DAG, sync, peer and mempool figures from one RPC batch.
+
+    Raises RpcError when the node cannot be reached."""
+    client = client or get_client()
+    return node_figures(*client.batch(NODE_CALLS))
+
+
+async def node_snapshot_async(client):
+    """node_snapshot() over a kaspa_tools.aiorpc.AsyncRpcClient"""
+    return node_figures(*(await client.batch(NODE_CALLS)))
+
+
+def node_figures(dag, info, peers):
+    """Flatten getBlockDagInfo, getInfo and getConnectedPeerInfo results"""
+    dag = dag or {}
+    info = info or {}
+    peers = peers or {}
+
+    daa_score = _int(dag.get("virtualDaaScore", dag.get("daaScore")))
+    return {
+        "network": dag.get("network", dag.get("networkName", "")),
+        "blockCount": _int(dag.get("blockCount")),
+        "headerCount": _int(dag.get("headerCount")),
+        "difficulty": _float(dag.get("difficulty")),
+        "daaScore": daa_score,
+        "blueScore": daa_score,
+        "pruningPoint": dag.get("pruningPointHash", dag.get("pruningPoint", "")) or "",
+        "tips": len(dag.get("tipHashes", [])),
+        "mempool": _int(info.get("mempoolSize")),
+        "synced": bool(info.get("isSynced", False)),
+        "serverVersion": info.get("serverVersion", ""),
+        "peers": len(peers.get("peerInfo", peers.get("infos", []))),
+    }
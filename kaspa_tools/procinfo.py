@@ -0,0 +1,224 @@
+"""
+Process and disk introspection without forking
+
+Finds kaspad through a pidfile or /proc/*/cmdline, reads its RSS from
+/proc/<pid>/status, counts TCP connections from /proc/net/tcp{,6} and
+keeps a cached size of the node data directory.
+Functions that need /proc return None where it is not available (macOS),
+so callers can fall back to the external tools.
+"""
+
+import os
+import signal
+import threading
+import time
+
+PROC = "/proc"
+
+TCP_ESTABLISHED = "01"
+TCP_LISTEN = "0A"
+
+
+def proc_available():
+    return os.path.isdir(os.path.join(PROC, "self"))
+
+
+def _cmdline(pid):
+    try:
+        with open(os.path.join(PROC, str(pid), "cmdline"), "rb") as f:
+            return f.read().split(b"\0")
+    except OSError:
+        return None
+
+
+def _matches(argv, name):
+    return bool(argv) and os.path.basename(argv[0].decode("utf-8", errors="replace")) == name
+
+
+def _read_pidfile(pidfile):
+    try:
+        with open(pidfile, "r") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def find_pids(name="kaspad"):
+    """PIDs of every process whose argv[0] is name, or None without /proc"""
+    if not proc_available():
+        return None
+    pids = []
+    for entry in os.listdir(PROC):
+        if entry.isdigit() and _matches(_cmdline(entry), name):
+            pids.append(int(entry))
+    return pids
+
+
+def find_pid(name="kaspad", pidfile=None):
+    """PID of the named process, trying the pidfile before scanning /proc.
+
+    Returns None when it is not running or /proc is unavailable."""
+    if pidfile:
+        pid = _read_pidfile(pidfile)
+        if pid and _matches(_cmdline(pid), name):
+            return pid
+    pids = find_pids(name)
+    return min(pids) if pids else None
+
+
+def write_pidfile(pidfile, pid):
+    tmp = f"{pidfile}.tmp"
+    with open(tmp, "w") as f:
+        f.write(f"{pid}\n")
+    os.replace(tmp, pidfile)
+
+
+def stop_processes(pids, timeout=10):
+    """SIGTERM each pid and wait up to timeout seconds for them to exit.
+
+    Returns the pids that were signalled."""
+    signalled = []
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            signalled.append(pid)
+        except ProcessLookupError:
+            pass
+    deadline = time.monotonic() + timeout
+    remaining = list(signalled)
+    while remaining and time.monotonic() < deadline:
+        remaining = [pid for pid in remaining if os.path.exists(os.path.join(PROC, str(pid)))]
+        if remaining:
+            time.sleep(0.1)
+    return signalled
+
+
+def rss_bytes(pid):
+    """Resident set size of pid from /proc/<pid>/status, or None"""
+    try:
+        with open(os.path.join(PROC, str(pid), "status"), "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _tcp_entries():
+    """Yield (local port, remote port, state) for every IPv4/IPv6 TCP socket"""
+    for table in ("tcp", "tcp6"):
+        try:
+            with open(os.path.join(PROC, "net", table), "r") as f:
+                next(f, None)  # column header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 4:
+                        continue
+                    local_port = int(fields[1].rsplit(":", 1)[1], 16)
+                    remote_port = int(fields[2].rsplit(":", 1)[1], 16)
+                    yield local_port, remote_port, fields[3]
+        except OSError:
+            continue
+
+
+def established_connections(port):
+    """Count ESTABLISHED TCP connections with port on either end, or None"""
+    if not proc_available():
+        return None
+    return sum(
+        1 for local, remote, state in _tcp_entries()
+        if state == TCP_ESTABLISHED and port in (local, remote)
+    )
+
+
+def is_listening(port):
+    """True if something listens on port, or None without /proc"""
+    if not proc_available():
+        return None
+    return any(local == port and state == TCP_LISTEN for local, _, state in _tcp_entries())
+
+
+def _disk_usage(st):
+    # Allocated blocks, like du; st_blocks is always in 512-byte units
+    blocks = getattr(st, "st_blocks", None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+
+class DirSizeCache:
+    """Cached total size of a directory tree, recomputed at most once per ttl.
+
+    A refresh still costs one stat() per file and per directory in the
+    tree: files that grow in place (RocksDB's WAL, MANIFEST and LOG) do
+    not change their directory's mtime, so every known file is re-stat'ed.
+    What it saves is the listing: a directory is only scanned again when
+    its mtime changes, so thousands of unchanged SST files are stat'ed
+    but not re-enumerated."""
+
+    def __init__(self, path, ttl=30):
+        self.path = path
+        self.ttl = ttl
+        self._dirs = {}  # dir path -> (mtime_ns, {file: size}, [subdirs])
+        self._total = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+
+    def size(self):
+        """Total bytes under path (None if it does not exist); a call after
+        the ttl has passed re-stats the whole tree"""
+        with self._lock:
+            if self._total is None or time.monotonic() - self._refreshed >= self.ttl:
+                self._total = self._refresh()
+                self._refreshed = time.monotonic()
+            return self._total
+
+    def _refresh(self):
+        if not os.path.isdir(self.path):
+            self._dirs = {}
+            return None
+        seen = {}
+        total = 0
+        stack = [self.path]
+        while stack:
+            directory = stack.pop()
+            try:
+                dir_st = os.stat(directory)
+            except OSError:
+                continue
+            mtime_ns = dir_st.st_mtime_ns
+            cached = self._dirs.get(directory)
+            if cached is not None and cached[0] == mtime_ns:
+                files, subdirs = cached[1], cached[2]
+                for name in list(files):
+                    try:
+                        files[name] = _disk_usage(os.stat(os.path.join(directory, name)))
+                    except OSError:
+                        del files[name]
+            else:
+                files, subdirs = {}, []
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    subdirs.append(entry.path)
+                                elif entry.is_file(follow_symlinks=False):
+                                    files[entry.name] = _disk_usage(entry.stat(follow_symlinks=False))
+                            except OSError:
+                                continue
+                except OSError:
+                    continue
+            seen[directory] = (mtime_ns, files, subdirs)
+            total += _disk_usage(dir_st) + sum(files.values())
+            stack.extend(subdirs)
+        self._dirs = seen
+        return total
+
+
+def format_size(num_bytes):
+    """Human-readable size in the style of du -h"""
+    size = float(num_bytes)
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit == "B" or size >= 10 else f"{size:.1f}{unit}"
+        size /= 1024
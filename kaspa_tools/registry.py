@@ -0,0 +1,151 @@
+"""
+Deadman contract registry
+
+Contracts live in a SQLite (WAL) table keyed by address, with secondary
+indexes on the owner and beneficiary public keys, so adds, removes and
+filtered pages touch only the rows involved. Every write is a single
+transaction, and readers in other processes never see a half-written
+registry. The flat deadman_contracts.json the dashboard used to keep is
+imported by an explicit migrate() call (the dashboard makes it when it
+starts serving) and renamed aside; opening a registry never touches it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.path.expanduser("~/.kaspa_dashboard/contracts.sqlite3")
+LEGACY_PATH = os.path.expanduser("~/.kaspa_dashboard/deadman_contracts.json")
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    address TEXT PRIMARY KEY,
+    owner_pubkey TEXT NOT NULL DEFAULT '',
+    beneficiary_pubkey TEXT NOT NULL DEFAULT '',
+    timeout INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS contracts_by_owner ON contracts (owner_pubkey, created);
+CREATE INDEX IF NOT EXISTS contracts_by_beneficiary ON contracts (beneficiary_pubkey, created);
+CREATE INDEX IF NOT EXISTS contracts_by_created ON contracts (created, address);
+"""
+
+COLUMNS = "address, owner_pubkey, beneficiary_pubkey, timeout, created"
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _contract(row):
+    address, owner, beneficiary, timeout, created = row
+    return {
+        'address': address,
+        'ownerPubkey': owner,
+        'beneficiaryPubkey': beneficiary,
+        'timeout': timeout,
+        'created': created,
+    }
+
+
+class ContractRegistry:
+    """Deadman contracts by address, queryable by owner or beneficiary"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def migrate(self, legacy_path=LEGACY_PATH):
+        """Import a deadman_contracts.json list once, then rename it to
+        <name>.migrated. Returns the number of contracts imported."""
+        if not os.path.exists(legacy_path):
+            return 0
+        try:
+            with open(legacy_path) as f:
+                contracts = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        rows = [self._row(c) for c in contracts if isinstance(c, dict) and c.get('address')]
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            # Later duplicates win, as they did when the file was appended to
+            self._db.executemany(f"INSERT OR REPLACE INTO contracts ({COLUMNS}) VALUES (?, ?, ?, ?, ?)", rows)
+        os.replace(legacy_path, legacy_path + ".migrated")
+        return len(rows)
+
+    def _row(self, contract):
+        return (
+            contract['address'],
+            contract.get('ownerPubkey') or '',
+            contract.get('beneficiaryPubkey') or '',
+            _int(contract.get('timeout')),
+            float(contract.get('created') or time.time()),
+        )
+
+    def add(self, contract):
+        """Insert or replace the contract at contract['address']"""
+        if not contract.get('address'):
+            raise ValueError("No address provided")
+        row = self._row(contract)
+        with self._lock:
+            self._db.execute(f"INSERT OR REPLACE INTO contracts ({COLUMNS}) VALUES (?, ?, ?, ?, ?)", row)
+        return _contract(row)
+
+    def remove(self, address):
+        """Delete a contract; returns False if there was none"""
+        with self._lock:
+            return self._db.execute("DELETE FROM contracts WHERE address = ?", (address,)).rowcount > 0
+
+    def get(self, address):
+        with self._lock:
+            row = self._db.execute(f"SELECT {COLUMNS} FROM contracts WHERE address = ?", (address,)).fetchone()
+        return _contract(row) if row else None
+
+    def _where(self, owner, beneficiary):
+        clauses, params = [], []
+        if owner:
+            clauses.append("owner_pubkey = ?")
+            params.append(owner)
+        if beneficiary:
+            clauses.append("beneficiary_pubkey = ?")
+            params.append(beneficiary)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, owner=None, beneficiary=None):
+        where, params = self._where(owner, beneficiary)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM contracts{where}", params).fetchone()[0]
+
+    def page(self, owner=None, beneficiary=None, limit=PAGE_SIZE, offset=0):
+        """Contracts in creation order, optionally filtered by owner and/or
+        beneficiary pubkey"""
+        limit = max(1, min(_int(limit) or PAGE_SIZE, MAX_PAGE_SIZE))
+        where, params = self._where(owner, beneficiary)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {COLUMNS} FROM contracts{where} ORDER BY created, address LIMIT ? OFFSET ?",
+                params + [limit, max(0, _int(offset))],
+            ).fetchall()
+        return [_contract(row) for row in rows]
+
+    def timeouts(self):
+        """{address: timeout} for every contract"""
+        with self._lock:
+            return dict(self._db.execute("SELECT address, timeout FROM contracts"))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,337 @@
+"""
+Pooled JSON-RPC client for the local kaspad node
+
+Keeps a few open sockets to whichever endpoint answered last, frames
+replies by newline or Content-Length so large results arrive whole, and
+tags every request with an incrementing id so calls can be pipelined.
+"""
+
+import itertools
+import json
+import re
+import socket
+import threading
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORTS = (17210, 18210, 16210)
+DEFAULT_TIMEOUT = 5
+DEFAULT_POOL_SIZE = 4
+
+RECV_SIZE = 65536
+
+# Bytes that matter when finding the end of an unframed JSON document
+_JSON_STRUCTURE = re.compile(rb'[][{}"\\]')
+
+
+class RpcError(Exception):
+    """Raised when the node cannot be reached or answers with an error"""
+
+
+class _BatchRejected(RpcError):
+    """The endpoint answered a batch array with a single id-less error"""
+
+
+class _Connection:
+    """One socket plus the bytes read past the last complete message"""
+
+    def __init__(self, sock, endpoint):
+        self.sock = sock
+        self.endpoint = endpoint
+        self.buffer = bytearray()
+        self._reset_scan()
+
+    def _reset_scan(self):
+        # Where _document_end() resumes, and the nesting state it reached
+        self._scan_pos = 0
+        self._scan_depth = 0
+        self._scan_in_string = False
+
+    def send(self, payload):
+        self.sock.sendall(payload)
+
+    def read_message(self):
+        """Return the next complete JSON message from the socket"""
+        while True:
+            message = self._take_message()
+            if message is None:
+                message = self._feed(self.sock.recv(RECV_SIZE))
+            if message is not None:
+                return message
+
+    def _feed(self, chunk):
+        """Buffer one received chunk; return a message it completes, if any"""
+        if not chunk:
+            # Peer closed: whatever is buffered is the last message
+            if self.buffer.strip():
+                data = bytes(self.buffer)
+                self.buffer.clear()
+                return json.loads(data)
+            raise RpcError(f"connection to {self.endpoint[0]}:{self.endpoint[1]} closed")
+        self.buffer += chunk
+
+        # Some endpoints reply without a trailing newline; only look for
+        # the end of a document when the chunk could be one.
+        if b"\n" not in chunk and chunk.rstrip()[-1:] in (b"}", b"]"):
+            end = self._document_end()
+            if end is None:
+                return None
+            data = bytes(self.buffer[:end])
+            del self.buffer[:end]
+            return json.loads(data)
+        return None
+
+    def _document_end(self):
+        """Offset just past the first complete top-level object or array in
+        the buffer, or None. Each call scans only bytes not seen before, so
+        a reply arriving in many chunks costs one pass overall."""
+        buf = self.buffer
+        pos, depth, in_string = self._scan_pos, self._scan_depth, self._scan_in_string
+        for match in _JSON_STRUCTURE.finditer(buf, pos):
+            i = match.start()
+            if i < pos:
+                continue  # the byte after a backslash
+            c = buf[i]
+            pos = i + 1
+            if in_string:
+                if c == 0x5C:
+                    pos = i + 2
+                elif c == 0x22:
+                    in_string = False
+            elif c == 0x22:
+                in_string = True
+            elif c in b"{[":
+                depth += 1
+            elif c in b"}]":
+                depth -= 1
+                if depth <= 0:
+                    self._reset_scan()
+                    return pos
+        self._scan_pos, self._scan_depth, self._scan_in_string = pos, depth, in_string
+        return None
+
+    def _take_message(self):
+        buf = self.buffer
+        if buf.startswith(b"Content-Length:"):
+            header_end = buf.find(b"\r\n\r\n")
+            if header_end < 0:
+                return None
+            length = int(buf[len(b"Content-Length:"):header_end].split(b"\r\n")[0].strip())
+            body_start = header_end + 4
+            if len(buf) < body_start + length:
+                return None
+            data = bytes(buf[body_start:body_start + length])
+            del buf[:body_start + length]
+            self._reset_scan()
+            return json.loads(data)
+
+        newline = buf.find(b"\n")
+        if newline < 0:
+            return None
+        data = bytes(buf[:newline])
+        del buf[:newline + 1]
+        self._reset_scan()
+        if not data.strip():
+            return self._take_message()
+        return json.loads(data)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RpcClient:
+    """Thread-safe JSON-RPC client with a small connection pool"""
+
+    def __init__(self, host=DEFAULT_HOST, ports=DEFAULT_PORTS, timeout=DEFAULT_TIMEOUT,
+                 pool_size=DEFAULT_POOL_SIZE):
+        self.host = host
+        self.ports = tuple(ports)
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.endpoint = None
+        self._ids = itertools.count(1)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._batch_supported = None
+
+    def call(self, method, params=None):
+        """Send one request and return its result"""
+        return self.pipeline([(method, params)])[0]
+
+    def pipeline(self, calls):
+        """Send several (method, params) requests back to back on one socket
+        and return their results in the same order"""
+        requests = self._requests(calls)
+        responses = self._exchange(requests)
+        return [self._result(responses[req["id"]], req["method"]) for req in requests]
+
+    def batch(self, calls):
+        """Send several (method, params) requests as one JSON-RPC batch and
+        return their results in the same order. Endpoints that reject batch
+        arrays are remembered and served by pipelining instead."""
+        if self._batch_supported is False or len(calls) < 2:
+            return self.pipeline(calls)
+
+        requests = self._requests(calls)
+        try:
+            responses = self._exchange(requests, as_batch=True)
+        except _BatchRejected:
+            self._batch_supported = False
+            return self.pipeline(calls)
+        self._batch_supported = True
+        return [self._result(responses[req["id"]], req["method"]) for req in requests]
+
+    def _requests(self, calls):
+        return [
+            {"id": next(self._ids), "method": method, "params": params if params is not None else []}
+            for method, params in calls
+        ]
+
+    def _result(self, resp, method):
+        if resp.get("error"):
+            raise RpcError(f"{method}: {resp['error']}")
+        if "result" not in resp:
+            raise RpcError(f"{method}: malformed response")
+        return resp["result"]
+
+    def _payload(self, requests, as_batch):
+        if as_batch:
+            return json.dumps(requests).encode("utf-8") + b"\n"
+        return b"".join(json.dumps(req).encode("utf-8") + b"\n" for req in requests)
+
+    def _match(self, message, pending, responses, as_batch):
+        """File the replies in message under their request ids"""
+        for resp in (message if isinstance(message, list) else [message]):
+            if not isinstance(resp, dict):
+                continue
+            if resp.get("id") in pending:
+                responses[resp["id"]] = resp
+            elif as_batch and resp.get("id") is None and resp.get("error"):
+                raise _BatchRejected(str(resp["error"]))
+
+    def _exchange(self, requests, as_batch=False):
+        payload = self._payload(requests, as_batch)
+        pending = {req["id"] for req in requests}
+
+        # A pooled socket may have been closed by the node while idle, so a
+        # failure on a reused connection gets one retry on a fresh one.
+        for attempt in range(2):
+            conn = self._acquire(fresh=attempt > 0)
+            try:
+                conn.send(payload)
+                responses = {}
+                while pending - responses.keys():
+                    self._match(conn.read_message(), pending, responses, as_batch)
+            except _BatchRejected:
+                self._release(conn)
+                raise
+            except (OSError, ValueError, RpcError) as e:
+                conn.close()
+                error = e
+                continue
+            self._release(conn)
+            return responses
+
+        with self._lock:
+            self.endpoint = None
+        raise RpcError(f"RPC request failed: {error}")
+
+    def _acquire(self, fresh=False):
+        with self._lock:
+            if not fresh and self._idle:
+                return self._idle.pop()
+            endpoint = self.endpoint
+
+        if endpoint is not None:
+            try:
+                return self._connect(endpoint)
+            except OSError:
+                pass
+
+        # Remembered endpoint is gone (or unknown yet): scan the ports again
+        for port in self.ports:
+            endpoint = (self.host, port)
+            try:
+                conn = self._connect(endpoint)
+            except OSError:
+                continue
+            with self._lock:
+                self.endpoint = endpoint
+            return conn
+        raise RpcError(f"no RPC endpoint reachable on {self.host} ports {list(self.ports)}")
+
+    def _connect(self, endpoint):
+        sock = socket.create_connection(endpoint, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return _Connection(sock, endpoint)
+
+    def _release(self, conn):
+        with self._lock:
+            if conn.endpoint == self.endpoint and len(self._idle) < self.pool_size and not conn.buffer:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide shared client"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = RpcClient()
+        return _default_client
+
+
+def utxos_by_addresses(addresses, chunk_size=500, client=None):
+    """Fetch UTXO entries for many addresses in a few chunked
+    getUTXOsByAddresses calls sent as one batch.
+
+    Returns a dict of address -> list of entries, with every requested
+    address present (empty list when it holds nothing)."""
+    client = client or get_client()
+    addresses = list(dict.fromkeys(addresses))
+    results = client.batch(_utxo_calls(addresses, chunk_size))
+    return _group_utxos(addresses, results)
+
+
+def iter_utxos(addresses, chunk_size=500, client=None):
+    """Yield getUTXOsByAddresses entries one chunk of addresses at a time,
+    so callers that fold them into totals never hold the whole set"""
+    client = client or get_client()
+    addresses = list(dict.fromkeys(addresses))
+    for method, params in _utxo_calls(addresses, chunk_size):
+        result = client.call(method, params)
+        yield from (result or {}).get("entries", [])
+
+
+def _utxo_calls(addresses, chunk_size):
+    return [
+        ("getUTXOsByAddresses", {"addresses": addresses[i:i + chunk_size]})
+        for i in range(0, len(addresses), chunk_size)
+    ]
+
+
+def _group_utxos(addresses, results):
+    by_address = {address: [] for address in addresses}
+    for result in results:
+        for entry in (result or {}).get("entries", []):
+            by_address.setdefault(entry.get("address", ""), []).append(entry)
+    return by_address
+
+
+def entry_amount(entry):
+    """Amount in sompi of a getUTXOsByAddresses entry (flat or nested form)"""
+    return int(entry.get("utxoEntry", entry).get("amount", 0))
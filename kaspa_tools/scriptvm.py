@@ -0,0 +1,781 @@
+"""
+Offline spend simulation for silverc artifacts
+
+A small Python port of kaspad's script engine, enough for what silverc
+emits: pushes, stack and flow control, arithmetic, byte ops, hashing,
+the time locks and transaction introspection. It runs a spending
+sigscript against a mocked transaction, so a spend path can be checked
+in microseconds instead of a deploy_live.sh round trip.
+
+The transaction is described the way the debugger's tx scenarios
+describe it (version, lock_time, active_input_index, inputs, outputs),
+plus the DAA scores the time locks need: the virtual daa_score and each
+input's utxo_daa_score. The sequence lock and lock-time finality checks
+kaspad makes outside the script are applied as well.
+
+Signatures are mocks. A sig is bound to the x-only key it was made for
+and to a digest of the mocked transaction, not to kaspad's real sighash.
+"Signed by the wrong key" and "signed for another transaction" fail as
+they would on chain, but the cryptography is not exercised. Use the
+deploy scripts for that. Opcodes above 0xc3 (testnet-12 additions) are
+not implemented and raise ScriptError.
+"""
+
+import hashlib
+import json
+import random
+from functools import lru_cache
+
+from . import disasm
+from .artifact import load_artifact
+from .ctorargs import constructor_params
+from .keys import xonly_public_key
+
+MAX_SCRIPT_ELEMENT_SIZE = 520
+MAX_OPS_PER_SCRIPT = 201
+MAX_STACK_SIZE = 244
+MAX_NUM_LEN = 8
+LOCK_TIME_THRESHOLD = 500_000_000_000
+SEQUENCE_LOCK_TIME_DISABLED = 1 << 63
+SEQUENCE_LOCK_TIME_MASK = 0x00000000FFFFFFFF
+MAX_TX_IN_SEQUENCE_NUM = (1 << 64) - 1
+SIGHASH_TYPES = frozenset((0x01, 0x02, 0x04, 0x81, 0x82, 0x84))
+DEFAULT_AMOUNT = 100_000_000
+DEFAULT_FEE = 1000
+# A key no contract mentions, for "someone else signs" cases
+STRANGER = hashlib.blake2b(b"scriptvm stranger", digest_size=32).digest()
+
+
+class ScriptError(Exception):
+    """The script failed; the message says where and why"""
+
+
+# ---------------------------------------------------------------------------
+# Numbers and pushes
+
+def encode_num(value):
+    """Minimal script-number encoding"""
+    if value == 0:
+        return b""
+    magnitude = abs(value)
+    out = bytearray(magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "little"))
+    if out[-1] & 0x80:
+        out.append(0x80 if value < 0 else 0)
+    elif value < 0:
+        out[-1] |= 0x80
+    return bytes(out)
+
+
+def decode_num(data, max_len=MAX_NUM_LEN):
+    if len(data) > max_len:
+        raise ScriptError(f"number is {len(data)} bytes, more than {max_len}")
+    if not data:
+        return 0
+    if not data[-1] & 0x7F and (len(data) == 1 or not data[-2] & 0x80):
+        raise ScriptError(f"number {data.hex()} is not minimally encoded")
+    value = int.from_bytes(data, "little")
+    sign_bit = 0x80 << (8 * (len(data) - 1))
+    return -(value & ~sign_bit) if value & sign_bit else value
+
+
+def as_bool(data):
+    for index, byte in enumerate(data):
+        if byte:
+            # Negative zero is false
+            return not (index == len(data) - 1 and byte == 0x80)
+    return False
+
+
+def push_data(data):
+    """Script bytes pushing data the way kaspad's ScriptBuilder does"""
+    size = len(data)
+    if size == 0:
+        return b"\x00"
+    if size == 1 and 1 <= data[0] <= 16:
+        return bytes([0x50 + data[0]])
+    if size == 1 and data[0] == 0x81:
+        return bytes([disasm.OP_1NEGATE])
+    if size <= 0x4B:
+        return bytes([size]) + data
+    if size <= 0xFF:
+        return bytes([disasm.OP_PUSHDATA1, size]) + data
+    if size <= 0xFFFF:
+        return bytes([disasm.OP_PUSHDATA2]) + size.to_bytes(2, "little") + data
+    return bytes([disasm.OP_PUSHDATA4]) + size.to_bytes(4, "little") + data
+
+
+def push_int(value):
+    if value == 0:
+        return b"\x00"
+    if value == -1:
+        return bytes([disasm.OP_1NEGATE])
+    if 1 <= value <= 16:
+        return bytes([0x50 + value])
+    return push_data(encode_num(value))
+
+
+def _push_value(instruction):
+    offset, op, data = instruction
+    if op == disasm.OP_1NEGATE:
+        return b"\x81"
+    if disasm.OP_TRUE <= op <= disasm.OP_16:
+        return bytes([op - 0x50])
+    if op <= disasm.OP_PUSHDATA4:
+        return data
+    raise ScriptError(f"sigscript is not push-only ({disasm.NAMES[op]} at offset {offset})")
+
+
+def blake2b_256(data):
+    return hashlib.blake2b(data, digest_size=32).digest()
+
+
+def p2pk_script(pubkey):
+    """Schnorr P2PK script for a 32-byte x-only key"""
+    return push_data(pubkey) + b"\xac"
+
+
+def p2sh_script(redeem_script):
+    return b"\xaa" + push_data(blake2b_256(bytes(redeem_script))) + b"\x87"
+
+
+def _spk_bytes(version, script):
+    # What the Spk introspection opcodes push
+    return version.to_bytes(2, "big") + script
+
+
+# ---------------------------------------------------------------------------
+# Mocked transaction
+
+class TxContext:
+    """The transaction a script runs against.
+
+    inputs/outputs are dicts; missing fields fall back to defaults:
+      input:  amount, spk (bytes), spk_version, sequence, utxo_daa_score,
+              prev_txid (32 bytes), prev_index, sig_script, is_coinbase
+      output: amount, spk, spk_version"""
+
+    def __init__(self, inputs=None, outputs=None, active_input_index=0, lock_time=0, daa_score=0,
+                 timestamp=0, version=0, gas=0, subnetwork_id=bytes(20), payload=b""):
+        self.inputs = inputs if inputs is not None else [{}]
+        self.outputs = outputs if outputs is not None else []
+        self.active_input_index = active_input_index
+        self.lock_time = lock_time
+        self.daa_score = daa_score
+        self.timestamp = timestamp
+        self.version = version
+        self.gas = gas
+        self.subnetwork_id = subnetwork_id
+        self.payload = payload
+
+    @classmethod
+    def from_scenario(cls, scenario):
+        """From a debugger tx scenario dict (hex strings, utxo_value/value)"""
+        inputs = []
+        for index, item in enumerate(scenario.get("inputs", [{}])):
+            entry = {
+                "amount": item.get("utxo_value", DEFAULT_AMOUNT),
+                "sequence": item.get("sequence", 0),
+                "utxo_daa_score": item.get("utxo_daa_score", 0),
+                "prev_index": item.get("prev_index", 0),
+                "prev_txid": bytes.fromhex(item["prev_txid"]) if item.get("prev_txid") else bytes([index]) * 32,
+            }
+            if item.get("utxo_script_hex"):
+                entry["spk"] = bytes.fromhex(item["utxo_script_hex"])
+            if item.get("signature_script_hex"):
+                entry["sig_script"] = bytes.fromhex(item["signature_script_hex"])
+            inputs.append(entry)
+        outputs = []
+        for item in scenario.get("outputs", []):
+            if item.get("script_hex"):
+                spk = bytes.fromhex(item["script_hex"])
+            elif item.get("p2pk_pubkey"):
+                spk = p2pk_script(bytes.fromhex(item["p2pk_pubkey"]))
+            else:
+                spk = None  # the contract's own P2SH (Simulator.scenario_context)
+            outputs.append({"amount": item.get("value", 0), "spk": spk})
+        return cls(inputs, outputs, scenario.get("active_input_index", 0), scenario.get("lock_time", 0),
+                   scenario.get("daa_score", 0), scenario.get("timestamp", 0), scenario.get("version", 0))
+
+    def input(self, index):
+        if not 0 <= index < len(self.inputs):
+            raise ScriptError(f"input index {index} out of range ({len(self.inputs)} inputs)")
+        return self.inputs[index]
+
+    def output(self, index):
+        if not 0 <= index < len(self.outputs):
+            raise ScriptError(f"output index {index} out of range ({len(self.outputs)} outputs)")
+        return self.outputs[index]
+
+    def digest(self):
+        """Stand-in sighash: a hash of everything a signature commits to"""
+        h = hashlib.blake2b(digest_size=32)
+        h.update(f"{self.version}|{self.lock_time}|{self.gas}|{self.active_input_index}|".encode())
+        h.update(self.subnetwork_id + bytes(self.payload))
+        for item in self.inputs:
+            h.update(item.get("prev_txid", bytes(32)))
+            h.update(f"|{item.get('prev_index', 0)}|{item.get('sequence', 0)}|{item.get('amount', 0)}|".encode())
+            h.update(item.get("spk") or b"")
+        for item in self.outputs:
+            h.update(f"|{item.get('amount', 0)}|{item.get('spk_version', 0)}|".encode())
+            h.update(item.get("spk") or b"")
+        return h.digest()
+
+
+def mock_signature(pubkey, digest, hash_type=0x01):
+    """65-byte mock Schnorr signature by pubkey over digest"""
+    return hashlib.blake2b(b"mock-schnorr" + bytes(pubkey) + digest, digest_size=64).digest() + bytes([hash_type])
+
+
+@lru_cache(maxsize=1024)
+def _xonly(secret):
+    return xonly_public_key(secret)
+
+
+def sign(secret, ctx):
+    """Mock signature with a private key for a TxContext"""
+    return mock_signature(_xonly(bytes(secret)), ctx.digest())
+
+
+# ---------------------------------------------------------------------------
+# Engine
+
+def _pop(stack, count=1):
+    if len(stack) < count:
+        raise ScriptError(f"stack has {len(stack)} items, needs {count}")
+    if count == 1:
+        return stack.pop()
+    items = stack[-count:]
+    del stack[-count:]
+    return items
+
+
+def _num(stack):
+    return decode_num(_pop(stack))
+
+
+def _check_sig(sig, pubkey, digest, pubkey_size=32):
+    if len(pubkey) != pubkey_size:
+        raise ScriptError(f"public key is {len(pubkey)} bytes, expected {pubkey_size}")
+    if not sig:
+        return False
+    if len(sig) != 65:
+        raise ScriptError(f"signature is {len(sig)} bytes, expected 65")
+    if sig[64] not in SIGHASH_TYPES:
+        raise ScriptError(f"invalid sighash type {sig[64]:#x}")
+    return sig == mock_signature(pubkey, digest, sig[64])
+
+
+_BINARY_NUM = {
+    0x93: lambda a, b: a + b,
+    0x94: lambda a, b: a - b,
+    0x95: lambda a, b: a * b,
+    0x9A: lambda a, b: int(a != 0 and b != 0),
+    0x9B: lambda a, b: int(a != 0 or b != 0),
+    0x9C: lambda a, b: int(a == b),
+    0x9E: lambda a, b: int(a != b),
+    0x9F: lambda a, b: int(a < b),
+    0xA0: lambda a, b: int(a > b),
+    0xA1: lambda a, b: int(a <= b),
+    0xA2: lambda a, b: int(a >= b),
+    0xA3: min,
+    0xA4: max,
+}
+_UNARY_NUM = {
+    0x8B: lambda a: a + 1,
+    0x8C: lambda a: a - 1,
+    0x8F: lambda a: -a,
+    0x90: abs,
+    0x91: lambda a: int(a == 0),
+    0x92: lambda a: int(a != 0),
+}
+_BITWISE = {0x84: lambda a, b: a & b, 0x85: lambda a, b: a | b, 0x86: lambda a, b: a ^ b}
+
+
+def execute(instructions, stack, ctx, digest=None):
+    """Run decoded instructions (disasm.decode) on stack against ctx.
+
+    Returns the number of non-push opcodes executed; raises ScriptError."""
+    digest = digest if digest is not None else ctx.digest()
+    active = ctx.input(ctx.active_input_index)
+    cond = []  # one bool per open OpIf
+    alt = []
+    ops = 0
+    for offset, op, data in instructions:
+        executing = all(cond)
+        if op > disasm.OP_16:
+            ops += 1
+            if ops > MAX_OPS_PER_SCRIPT:
+                raise ScriptError(f"more than {MAX_OPS_PER_SCRIPT} opcodes")
+        try:
+            if op in (disasm.OP_IF, disasm.OP_NOTIF):
+                if executing:
+                    flag = _pop(stack)
+                    if len(flag) > 1 or (flag and flag != b"\x01"):
+                        raise ScriptError("OpIf condition must be empty or 0x01")
+                    cond.append(bool(flag) == (op == disasm.OP_IF))
+                else:
+                    cond.append(False)
+                continue
+            if op == disasm.OP_ELSE:
+                if not cond:
+                    raise ScriptError("OpElse without OpIf")
+                cond[-1] = not cond[-1]
+                continue
+            if op == disasm.OP_ENDIF:
+                if not cond:
+                    raise ScriptError("OpEndIf without OpIf")
+                cond.pop()
+                continue
+            if not executing:
+                continue
+
+            if op <= disasm.OP_16 and op != 0x50:
+                stack.append(_push_value((offset, op, data)))
+            elif op == disasm.OP_VERIFY:
+                if not as_bool(_pop(stack)):
+                    raise ScriptError("verify failed")
+            elif op == 0x6A:
+                raise ScriptError("OpReturn")
+            elif op == 0x6B:
+                alt.append(_pop(stack))
+            elif op == 0x6C:
+                if not alt:
+                    raise ScriptError("alt stack is empty")
+                stack.append(alt.pop())
+            elif op == 0x6D:
+                _pop(stack, 2)
+            elif op in (0x6E, 0x6F):
+                count = op - 0x6C
+                if len(stack) < count:
+                    _pop(stack, count)
+                stack.extend(stack[-count:])
+            elif op == 0x73:
+                top = stack[-1] if stack else _pop(stack)
+                if as_bool(top):
+                    stack.append(top)
+            elif op == 0x74:
+                stack.append(encode_num(len(stack)))
+            elif op == disasm.OP_DROP:
+                _pop(stack)
+            elif op == disasm.OP_DUP:
+                stack.append(stack[-1] if stack else _pop(stack))
+            elif op == 0x77:
+                top = _pop(stack)
+                _pop(stack)
+                stack.append(top)
+            elif op == 0x78:
+                if len(stack) < 2:
+                    _pop(stack, 2)
+                stack.append(stack[-2])
+            elif op in (0x79, 0x7A):
+                depth = _num(stack)
+                if not 0 <= depth < len(stack):
+                    raise ScriptError(f"{disasm.NAMES[op]} depth {depth} with {len(stack)} items")
+                item = stack[-1 - depth]
+                if op == 0x7A:
+                    del stack[-1 - depth]
+                stack.append(item)
+            elif op == 0x7B:
+                a, b, c = _pop(stack, 3)
+                stack += [b, c, a]
+            elif op == 0x7C:
+                a, b = _pop(stack, 2)
+                stack += [b, a]
+            elif op == 0x7D:
+                a, b = _pop(stack, 2)
+                stack += [b, a, b]
+            elif op == 0x7E:
+                a, b = _pop(stack, 2)
+                if len(a) + len(b) > MAX_SCRIPT_ELEMENT_SIZE:
+                    raise ScriptError("OpCat result exceeds the element size limit")
+                stack.append(a + b)
+            elif op == 0x7F:
+                end = _num(stack)
+                start = _num(stack)
+                data = _pop(stack)
+                if not 0 <= start <= end <= len(data):
+                    raise ScriptError(f"OpSubstr range {start}..{end} of {len(data)} bytes")
+                stack.append(data[start:end])
+            elif op in (0x80, 0x81):
+                size = _num(stack)
+                data = _pop(stack)
+                if not 0 <= size <= len(data):
+                    raise ScriptError(f"{disasm.NAMES[op]} size {size} of {len(data)} bytes")
+                stack.append(data[:size] if op == 0x80 else data[len(data) - size:])
+            elif op == 0x82:
+                if not stack:
+                    _pop(stack)
+                stack.append(encode_num(len(stack[-1])))
+            elif op in _BITWISE:
+                a, b = _pop(stack, 2)
+                if len(a) != len(b):
+                    raise ScriptError(f"{disasm.NAMES[op]} operands differ in length")
+                fn = _BITWISE[op]
+                stack.append(bytes(fn(x, y) for x, y in zip(a, b)))
+            elif op == 0x83:
+                stack.append(bytes(~x & 0xFF for x in _pop(stack)))
+            elif op in (0x87, 0x88):
+                a, b = _pop(stack, 2)
+                if op == 0x88:
+                    if a != b:
+                        raise ScriptError("OpEqualVerify failed")
+                else:
+                    stack.append(b"\x01" if a == b else b"")
+            elif op in _UNARY_NUM:
+                stack.append(encode_num(_UNARY_NUM[op](_num(stack))))
+            elif op in _BINARY_NUM:
+                b = _num(stack)
+                a = _num(stack)
+                stack.append(encode_num(_BINARY_NUM[op](a, b)))
+            elif op in (0x96, 0x97):
+                b = _num(stack)
+                a = _num(stack)
+                if b == 0:
+                    raise ScriptError("division by zero")
+                # Rust semantics: truncate toward zero
+                quotient = abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+                stack.append(encode_num(quotient if op == 0x96 else a - quotient * b))
+            elif op == 0x9D:
+                b = _num(stack)
+                if _num(stack) != b:
+                    raise ScriptError("OpNumEqualVerify failed")
+            elif op == 0xA5:
+                high = _num(stack)
+                low = _num(stack)
+                value = _num(stack)
+                stack.append(b"\x01" if low <= value < high else b"")
+            elif op == 0xA8:
+                stack.append(hashlib.sha256(_pop(stack)).digest())
+            elif op == 0xAA:
+                stack.append(blake2b_256(_pop(stack)))
+            elif op in (0xAB, 0xAC, 0xAD):
+                pubkey = _pop(stack)
+                sig = _pop(stack)
+                ok = _check_sig(sig, pubkey, digest, 33 if op == 0xAB else 32)
+                if op == 0xAD:
+                    if not ok:
+                        raise ScriptError("OpCheckSigVerify failed")
+                else:
+                    stack.append(b"\x01" if ok else b"")
+            elif op in disasm.MULTISIG:
+                keys = _num(stack)
+                if not 0 <= keys <= disasm.MAX_PUBKEYS_PER_MULTISIG:
+                    raise ScriptError(f"multisig with {keys} keys")
+                pubkeys = _pop(stack, keys) if keys else []
+                required = _num(stack)
+                if not 0 <= required <= keys:
+                    raise ScriptError(f"multisig needs {required} of {keys}")
+                sigs = _pop(stack, required) if required else []
+                size = 33 if op == 0xA9 else 32
+                remaining = list(pubkeys)
+                ok = True
+                for sig in sigs:
+                    while remaining and not _check_sig(sig, remaining[0], digest, size):
+                        remaining.pop(0)
+                    if not remaining:
+                        ok = False
+                        break
+                    remaining.pop(0)
+                if op == 0xAF:
+                    if not ok:
+                        raise ScriptError("OpCheckMultiSigVerify failed")
+                else:
+                    stack.append(b"\x01" if ok else b"")
+            elif op == 0xB0:
+                lock = _num(stack)
+                if lock < 0:
+                    raise ScriptError("negative lock time")
+                if (lock < LOCK_TIME_THRESHOLD) != (ctx.lock_time < LOCK_TIME_THRESHOLD):
+                    raise ScriptError("lock time type mismatch (DAA score vs timestamp)")
+                if lock > ctx.lock_time:
+                    raise ScriptError(f"lock time {lock} not reached (tx lock_time {ctx.lock_time})")
+                if active.get("sequence", 0) == MAX_TX_IN_SEQUENCE_NUM:
+                    raise ScriptError("input is finalized (sequence is max)")
+            elif op == 0xB1:
+                lock = _num(stack)
+                if lock < 0:
+                    raise ScriptError("negative sequence")
+                sequence = active.get("sequence", 0)
+                if sequence & SEQUENCE_LOCK_TIME_DISABLED:
+                    raise ScriptError("input sequence has relative lock time disabled")
+                if lock & SEQUENCE_LOCK_TIME_MASK > sequence & SEQUENCE_LOCK_TIME_MASK:
+                    raise ScriptError(f"relative lock {lock} not reached (input sequence {sequence})")
+            else:
+                stack.append(_introspect(op, stack, ctx))
+        except ScriptError as e:
+            raise ScriptError(f"{disasm.NAMES[op]} at {offset:#06x}: {e}") from None
+        if len(stack) + len(alt) > MAX_STACK_SIZE:
+            raise ScriptError(f"stack exceeds {MAX_STACK_SIZE} items")
+        if stack and len(stack[-1]) > MAX_SCRIPT_ELEMENT_SIZE:
+            raise ScriptError(f"element larger than {MAX_SCRIPT_ELEMENT_SIZE} bytes")
+    if cond:
+        raise ScriptError("unbalanced OpIf")
+    return ops
+
+
+def _introspect(op, stack, ctx):
+    if op == 0xB2:
+        return encode_num(ctx.version)
+    if op == 0xB3:
+        return encode_num(len(ctx.inputs))
+    if op == 0xB4:
+        return encode_num(len(ctx.outputs))
+    if op == 0xB5:
+        return encode_num(ctx.lock_time)
+    if op == 0xB6:
+        return bytes(ctx.subnetwork_id)
+    if op == 0xB7:
+        return encode_num(ctx.gas)
+    if op == 0xB8:
+        return bytes(ctx.payload)
+    if op == 0xB9:
+        return encode_num(ctx.active_input_index)
+    if 0xBA <= op <= 0xC1:
+        item = ctx.input(_num(stack))
+        if op == 0xBA:
+            return item.get("prev_txid", bytes(32))
+        if op == 0xBB:
+            return encode_num(item.get("prev_index", 0))
+        if op == 0xBC:
+            return item.get("sig_script", b"")
+        if op == 0xBD:
+            return encode_num(item.get("sequence", 0))
+        if op == 0xBE:
+            return encode_num(item.get("amount", 0))
+        if op == 0xBF:
+            return _spk_bytes(item.get("spk_version", 0), item.get("spk") or b"")
+        if op == 0xC0:
+            return encode_num(item.get("utxo_daa_score", 0))
+        return b"\x01" if item.get("is_coinbase") else b""
+    if op in (0xC2, 0xC3):
+        item = ctx.output(_num(stack))
+        if op == 0xC2:
+            return encode_num(item.get("amount", 0))
+        return _spk_bytes(item.get("spk_version", 0), item.get("spk") or b"")
+    raise ScriptError("opcode not supported by the simulator")
+
+
+def check_locks(ctx):
+    """kaspad's checks outside the script: lock-time finality and the
+    active input's sequence lock"""
+    active = ctx.input(ctx.active_input_index)
+    if ctx.lock_time:
+        now = ctx.daa_score if ctx.lock_time < LOCK_TIME_THRESHOLD else ctx.timestamp
+        if ctx.lock_time >= now and any(i.get("sequence", 0) != MAX_TX_IN_SEQUENCE_NUM for i in ctx.inputs):
+            raise ScriptError(f"transaction not final: lock_time {ctx.lock_time} >= {now}")
+    sequence = active.get("sequence", 0)
+    if not sequence & SEQUENCE_LOCK_TIME_DISABLED:
+        relative = sequence & SEQUENCE_LOCK_TIME_MASK
+        if active.get("utxo_daa_score", 0) + relative > ctx.daa_score:
+            raise ScriptError(f"sequence lock: utxo DAA {active.get('utxo_daa_score', 0)} + {relative} > {ctx.daa_score}")
+
+
+def verify_spend(sig_script, redeem_instructions, ctx, digest=None):
+    """Run a P2SH-style spend: sigscript pushes, then the redeem script.
+
+    Returns (ok, error, opcodes executed)."""
+    try:
+        check_locks(ctx)
+        stack = [_push_value(i) for i in disasm.decode(sig_script)]
+        if not stack:
+            raise ScriptError("empty sigscript")
+        stack.pop()  # the redeem script itself
+        ops = execute(redeem_instructions, stack, ctx, digest)
+        if len(stack) != 1:
+            raise ScriptError(f"clean stack: {len(stack)} items left")
+        if not as_bool(stack[0]):
+            raise ScriptError("script finished with false")
+        return True, None, ops
+    except (ScriptError, disasm.DisasmError) as e:
+        return False, str(e), 0
+
+
+# ---------------------------------------------------------------------------
+# Artifacts
+
+def encode_call_arg(value, type_name):
+    """sigscript push for one ABI argument (bytes, hex, int or bool)"""
+    if type_name == "int":
+        return push_int(int(value))
+    if type_name == "bool":
+        return push_int(1 if value in (True, "true", 1) else 0)
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+    return push_data(bytes(value))
+
+
+def build_sigscript(artifact, function, args, redeem=True):
+    """Sigscript calling function with args, selector and redeem script"""
+    entry = artifact.function(function)
+    inputs = entry.get("inputs", [])
+    if len(args) != len(inputs):
+        raise ValueError(f"{function} takes {len(inputs)} arguments, got {len(args)}")
+    out = b"".join(encode_call_arg(value, arg["type_name"]) for value, arg in zip(args, inputs))
+    if not artifact.without_selector:
+        names = [e["name"] for e in artifact.abi]
+        out += push_int(names.index(function))
+    if redeem:
+        out += push_data(bytes(artifact.script))
+    return out
+
+
+def load_constructor_args(path, artifact=None):
+    """{param name: value} from a *_args.json file (bytes or int values).
+
+    Names come from the artifact's AST; without it they are arg0, arg1..."""
+    with open(path) as f:
+        values = [bytes(a["data"]) if a["kind"] == "bytes" else a["data"] for a in json.load(f)]
+    try:
+        names = [name for name, _ in constructor_params(artifact)] if artifact is not None else []
+    except ValueError:
+        names = []
+    if len(names) != len(values):
+        names = [f"arg{i}" for i in range(len(values))]
+    return dict(zip(names, values))
+
+
+class Simulator:
+    """Spend an artifact offline.
+
+    ctor maps constructor parameter names to values, so a pubkey param
+    such as "owner" can be used as a signer or an output recipient."""
+
+    def __init__(self, artifact, ctor=None, args_path=None):
+        self.artifact = artifact
+        self.ctor = ctor or {}
+        self.args_path = args_path
+        self.script = bytes(artifact.script)
+        self.instructions = disasm.decode(self.script)
+        self.spk = p2sh_script(self.script)
+        try:
+            types = dict(constructor_params(artifact))
+        except ValueError:
+            types = {}
+        # Keys that can sign or receive; bytes32 params are usually hashes
+        self.pubkeys = {name: v for name, v in self.ctor.items()
+                        if isinstance(v, bytes) and len(v) == 32 and types.get(name, "pubkey") == "pubkey"}
+        for name, value in self.ctor.items():
+            if isinstance(value, bytes) and value not in self.script:
+                raise ValueError(f"constructor arg {name} does not appear in the {artifact.contract_name} script "
+                                 "(was it compiled with these args?)")
+
+    @classmethod
+    def load(cls, artifact_path, args_path=None):
+        artifact = load_artifact(artifact_path)
+        ctor = load_constructor_args(args_path, artifact) if args_path else {}
+        return cls(artifact, ctor, args_path)
+
+    def key(self, name_or_hex):
+        """A constructor pubkey by name, or a 32-byte x-only key in hex"""
+        if isinstance(name_or_hex, bytes):
+            return name_or_hex
+        if name_or_hex in self.pubkeys:
+            return self.pubkeys[name_or_hex]
+        try:
+            data = bytes.fromhex(name_or_hex)
+        except ValueError:
+            if self.args_path is None and not self.ctor:
+                raise ValueError(f"unknown signer {name_or_hex!r} "
+                                 f"(no args file for {self.artifact.contract_name})") from None
+            known = ", ".join(self.pubkeys) or "none"
+            raise ValueError(f"unknown signer {name_or_hex!r} "
+                             f"(constructor pubkeys in {self.args_path or 'ctor'}: {known})") from None
+        if len(data) != 32:
+            raise ValueError(f"{name_or_hex!r} is not a constructor pubkey or a 32-byte x-only key")
+        return data
+
+    def context(self, recipient=None, age=0, daa_score=None, sequence=None, lock_time=0, amount=DEFAULT_AMOUNT,
+                fee=DEFAULT_FEE, utxo_daa_score=None):
+        """One input spending this contract, one output paying recipient.
+
+        age is how many DAA scores the UTXO has existed; sequence defaults
+        to age, the most a wallet could declare."""
+        daa_score = age if daa_score is None else daa_score
+        utxo_daa_score = daa_score - age if utxo_daa_score is None else utxo_daa_score
+        recipient_spk = p2pk_script(self.key(recipient)) if recipient is not None else self.spk
+        inputs = [{
+            "amount": amount,
+            "spk": self.spk,
+            "sequence": age if sequence is None else sequence,
+            "utxo_daa_score": utxo_daa_score,
+            "prev_txid": bytes(32),
+        }]
+        return TxContext(inputs, [{"amount": amount - fee, "spk": recipient_spk}], lock_time=lock_time, daa_score=daa_score)
+
+    def scenario_context(self, scenario):
+        """TxContext from a debugger tx scenario; inputs and outputs
+        without a script are this contract's P2SH"""
+        ctx = TxContext.from_scenario(scenario)
+        for item in ctx.inputs + ctx.outputs:
+            if item.get("spk") is None:
+                item["spk"] = self.spk
+        return ctx
+
+    def spend(self, function, ctx, signer=None, args=None):
+        """Spend through function. Arguments not in args ({name: value})
+        default by ABI type: a sig is a mock signature by signer (a key
+        name or hex) and a pubkey is the signer's key. Returns a result dict."""
+        digest = ctx.digest()
+        entry = self.artifact.function(function)
+        values = []
+        args = args or {}
+        for arg in entry.get("inputs", []):
+            if arg["name"] in args:
+                values.append(args[arg["name"]])
+            elif arg["type_name"] == "sig":
+                values.append(mock_signature(self.key(signer), digest) if signer is not None else b"")
+            elif arg["type_name"] == "pubkey" and signer is not None:
+                values.append(self.key(signer))
+            else:
+                raise ValueError(f"{function}: no value for argument {arg['name']} ({arg['type_name']})")
+        sig_script = build_sigscript(self.artifact, function, values)
+        ctx.input(ctx.active_input_index)["sig_script"] = sig_script
+        ok, error, ops = verify_spend(sig_script, self.instructions, ctx, digest)
+        return {"function": function, "ok": ok, "error": error, "ops": ops, "sig_script": sig_script.hex()}
+
+    def fuzz(self, count, functions=None, signers=None, max_age=None, seed=None):
+        """Spend count random (function, signer, recipient, age) combinations.
+
+        signers default to every constructor pubkey plus an unrelated key;
+        recipients to the same set. int and bool arguments get random
+        values (ints up to max_age). Yields one result per case."""
+        rng = random.Random(seed)
+        functions = functions or [e["name"] for e in self.artifact.abi]
+        names = list(signers or self.pubkeys) + ["stranger"]
+        keys = {name: self.key(name) for name in names if name != "stranger"}
+        keys["stranger"] = STRANGER
+        if max_age is None:
+            numbers = [v for v in self.ctor.values() if isinstance(v, int) and not isinstance(v, bool)]
+            max_age = 2 * max(numbers) if numbers else 1_000_000
+        for _ in range(count):
+            function = rng.choice(functions)
+            signer = rng.choice(names)
+            recipient = rng.choice(names)
+            age = rng.randint(0, max_age)
+            ctx = self.context(keys[recipient], age=age)
+            args = {}
+            for arg in self.artifact.function(function).get("inputs", []):
+                if arg["type_name"] == "int":
+                    args[arg["name"]] = rng.randint(0, max_age)
+                elif arg["type_name"] == "bool":
+                    args[arg["name"]] = rng.random() < 0.5
+            result = self.spend(function, ctx, keys[signer], args)
+            result.update(signer=signer, recipient=recipient, age=age)
+            yield result
+
+
+def summarize_fuzz(results):
+    """{(function, signer, recipient): {"pass", "fail", "min_age", "max_age"}}
+    where the ages span the passing cases"""
+    summary = {}
+    for result in results:
+        key = (result["function"], result["signer"], result["recipient"])
+        entry = summary.setdefault(key, {"pass": 0, "fail": 0, "min_age": None, "max_age": None})
+        if result["ok"]:
+            entry["pass"] += 1
+            age = result["age"]
+            entry["min_age"] = age if entry["min_age"] is None else min(entry["min_age"], age)
+            entry["max_age"] = age if entry["max_age"] is None else max(entry["max_age"], age)
+        else:
+            entry["fail"] += 1
+    return summary
@@ -0,0 +1,244 @@
+"""
+Compact on-disk time-series store for dashboard metrics
+
+Every metric keeps three mmap-backed ring files of fixed-width records:
+raw samples plus 1-minute and 1-hour rollups. Each record is
+(timestamp, mean, min, max) as four little-endian doubles, so a range
+query binary-searches the ring and unpacks only the records it returns
+instead of loading the history into memory.
+"""
+
+import mmap
+import os
+import re
+import struct
+import threading
+
+MAGIC = b"KTSRING1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")  # magic, version, record size, capacity, records written
+HEADER_SIZE = 64
+RECORD = struct.Struct("<dddd")  # timestamp, mean, min, max
+
+# resolution name -> (bucket seconds, ring capacity)
+RESOLUTIONS = {
+    "raw": (0, 86400),
+    "1m": (60, 60 * 24 * 30),
+    "1h": (3600, 24 * 365 * 2),
+}
+
+_METRIC_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class RingFile:
+    """Fixed-capacity ring of RECORD entries in one mmap'd file"""
+
+    def __init__(self, path, capacity):
+        self.path = path
+        size = HEADER_SIZE + capacity * RECORD.size
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size == 0:
+                os.ftruncate(fd, size)
+                os.pwrite(fd, HEADER.pack(MAGIC, VERSION, RECORD.size, capacity, 0), 0)
+            self._mm = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+
+        magic, version, record_size, stored_capacity, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path}: not a time-series ring file")
+        # An existing file keeps the capacity it was created with
+        self.capacity = stored_capacity
+
+    @property
+    def written(self):
+        return HEADER.unpack_from(self._mm, 0)[4]
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def _offset(self, index):
+        """File offset of logical record index (0 = oldest retained)"""
+        written = self.written
+        first = written - min(written, self.capacity)
+        return HEADER_SIZE + ((first + index) % self.capacity) * RECORD.size
+
+    def record(self, index):
+        return RECORD.unpack_from(self._mm, self._offset(index))
+
+    def last(self):
+        n = len(self)
+        return self.record(n - 1) if n else None
+
+    def append(self, timestamp, mean, low, high):
+        written = self.written
+        offset = HEADER_SIZE + (written % self.capacity) * RECORD.size
+        RECORD.pack_into(self._mm, offset, timestamp, mean, low, high)
+        # Bump the counter only after the record is in place
+        struct.pack_into("<Q", self._mm, HEADER.size - 8, written + 1)
+
+    def bisect(self, timestamp):
+        """Index of the first retained record with time >= timestamp"""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid)[0] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start, end, limit=None):
+        """Records with start <= time <= end, oldest first"""
+        n = len(self)
+        index = self.bisect(start)
+        out = []
+        while index < n:
+            rec = self.record(index)
+            if rec[0] > end:
+                break
+            out.append(rec)
+            if limit and len(out) >= limit:
+                break
+            index += 1
+        return out
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        self._mm.close()
+
+
+class _Bucket:
+    """Running aggregate for one rollup interval"""
+
+    __slots__ = ("start", "total", "count", "low", "high")
+
+    def __init__(self, start):
+        self.start = start
+        self.total = 0.0
+        self.count = 0
+        self.low = float("inf")
+        self.high = float("-inf")
+
+    def add(self, mean, low, high):
+        self.total += mean
+        self.count += 1
+        self.low = min(self.low, low)
+        self.high = max(self.high, high)
+
+    def record(self):
+        return (self.start, self.total / self.count, self.low, self.high)
+
+
+class _Series:
+    def __init__(self, directory, metric):
+        self.rings = {
+            name: RingFile(os.path.join(directory, f"{metric}.{name}.ring"), capacity)
+            for name, (_, capacity) in RESOLUTIONS.items()
+        }
+        self.buckets = {}
+        last = self.rings["raw"].last()
+        self.last_time = last[0] if last else float("-inf")
+        if last:
+            self._reopen_buckets()
+
+    def _reopen_buckets(self):
+        # The open 1m/1h buckets only live in memory; after a restart,
+        # refold the raw samples of their intervals so the rollups written
+        # out later still cover the samples taken before the restart.
+        raw = self.rings["raw"]
+        for name in ("1m", "1h"):
+            seconds = RESOLUTIONS[name][0]
+            start = self.last_time - self.last_time % seconds
+            written = self.rings[name].last()
+            if written is not None and written[0] >= start:
+                continue
+            bucket = _Bucket(start)
+            for _, value, _, _ in raw.range(start, self.last_time):
+                bucket.add(value, value, value)
+            self.buckets[name] = bucket
+
+    def append(self, timestamp, value):
+        if timestamp <= self.last_time:
+            return False
+        self.last_time = timestamp
+        self.rings["raw"].append(timestamp, value, value, value)
+
+        # Fold the sample into the current 1m and 1h buckets; a bucket is
+        # written out once a sample lands in the next interval.
+        for name in ("1m", "1h"):
+            seconds = RESOLUTIONS[name][0]
+            start = timestamp - timestamp % seconds
+            bucket = self.buckets.get(name)
+            finished = None
+            if bucket is not None and bucket.start != start:
+                finished = bucket
+                bucket = None
+            if bucket is None:
+                bucket = self.buckets[name] = _Bucket(start)
+            bucket.add(value, value, value)
+            if finished is not None:
+                self.rings[name].append(*finished.record())
+        return True
+
+    def query(self, resolution, start, end, limit):
+        points = self.rings[resolution].range(start, end, limit)
+        # Include the rollup still being accumulated, so recent data shows up
+        bucket = self.buckets.get(resolution)
+        if bucket is not None and start <= bucket.start <= end and (not limit or len(points) < limit):
+            points.append(bucket.record())
+        return points
+
+
+class TimeSeriesStore:
+    """Directory of per-metric ring files with raw, 1m and 1h resolutions"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, metric):
+        if not _METRIC_NAME.match(metric):
+            raise ValueError(f"invalid metric name: {metric!r}")
+        series = self._series.get(metric)
+        if series is None:
+            series = self._series[metric] = _Series(self.directory, metric)
+        return series
+
+    def append(self, metric, timestamp, value):
+        """Record one sample; samples not newer than the last one are dropped"""
+        with self._lock:
+            return self._get(metric).append(float(timestamp), float(value))
+
+    def query(self, metric, start, end, resolution=None, limit=None):
+        """Return (resolution, [(timestamp, mean, min, max), ...]) for the
+        samples between start and end.
+
+        Without an explicit resolution, raw samples are used for spans up
+        to two hours, 1m rollups up to three days and 1h rollups beyond."""
+        if resolution is None:
+            span = end - start
+            resolution = "raw" if span <= 2 * 3600 else "1m" if span <= 3 * 86400 else "1h"
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"unknown resolution: {resolution!r}")
+        with self._lock:
+            return resolution, self._get(metric).query(resolution, start, end, limit)
+
+    def flush(self):
+        with self._lock:
+            for series in self._series.values():
+                for ring in series.rings.values():
+                    ring.flush()
+
+    def close(self):
+        with self._lock:
+            for series in self._series.values():
+                for ring in series.rings.values():
+                    ring.close()
+            self._series = {}
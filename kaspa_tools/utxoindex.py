@@ -0,0 +1,340 @@
+"""
+Local UTXO index kept current from node notifications
+
+UtxoIndex is a SQLite store of UTXOs keyed by outpoint and indexed by
+address, with per-address running totals so balance lookups are a single
+primary-key read. UtxoIndexer fills it once from getUTXOsByAddresses and
+then applies UTXO-changed notifications. When the notification stream
+breaks or a notification does not match the index, the indexer resyncs
+from a fresh snapshot so the index never drifts.
+
+Other processes (the CLI) can read the same database and trust it while
+the indexer's heartbeat is recent.
+"""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from .rpc import RpcClient, RpcError, entry_amount, utxos_by_addresses
+
+DEFAULT_PATH = os.path.expanduser("~/.kaspa_dashboard/utxoindex.sqlite3")
+
+SUBSCRIBE_METHOD = "notifyUtxosChanged"
+NOTIFICATION_METHOD = "utxosChangedNotification"
+
+# The index counts as live while the indexer has checked in this recently
+LIVE_WINDOW = 30
+HEARTBEAT_INTERVAL = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS utxos (
+    transaction_id TEXT NOT NULL,
+    output_index INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    block_daa_score INTEGER NOT NULL,
+    is_coinbase INTEGER NOT NULL,
+    script_public_key TEXT,
+    PRIMARY KEY (transaction_id, output_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS utxos_by_address_daa ON utxos (address, block_daa_score);
+CREATE TABLE IF NOT EXISTS addresses (
+    address TEXT PRIMARY KEY,
+    utxos INTEGER NOT NULL DEFAULT 0,
+    sompi INTEGER NOT NULL DEFAULT 0,
+    synced_at REAL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL
+) WITHOUT ROWID;
+"""
+
+
+def _outpoint(entry):
+    outpoint = entry.get("outpoint", {})
+    return outpoint.get("transactionId", ""), int(outpoint.get("index", 0))
+
+
+class UtxoIndex:
+    """SQLite UTXO set for a set of tracked addresses"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def track(self, addresses):
+        """Start tracking addresses; returns the ones that were new"""
+        with self._lock:
+            known = self._tracked_locked()
+            new = [a for a in dict.fromkeys(addresses) if a not in known]
+            self._db.executemany("INSERT OR IGNORE INTO addresses (address) VALUES (?)", [(a,) for a in new])
+        return new
+
+    def untrack(self, address):
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM utxos WHERE address = ?", (address,))
+            self._db.execute("DELETE FROM addresses WHERE address = ?", (address,))
+
+    def tracked(self):
+        with self._lock:
+            return self._tracked_locked()
+
+    def _tracked_locked(self):
+        return {row[0] for row in self._db.execute("SELECT address FROM addresses")}
+
+    def replace(self, by_address):
+        """Replace the stored UTXOs of each address with a fresh snapshot
+        ({address: [getUTXOsByAddresses entries]})"""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            for address, entries in by_address.items():
+                self._db.execute("DELETE FROM utxos WHERE address = ?", (address,))
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO utxos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(address, entry) for entry in entries],
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO addresses (address, utxos, sompi, synced_at) VALUES (?, ?, ?, ?)",
+                    (address, len(entries), sum(entry_amount(entry) for entry in entries), now),
+                )
+
+    def apply(self, added, removed):
+        """Apply one UTXO-changed notification.
+
+        Returns False (and changes nothing) if it does not fit the index:
+        a removal of an outpoint the index never saw, or an addition that
+        is already present. Either means a notification was missed."""
+        tracked = self.tracked()
+        added = [e for e in added if e.get("address") in tracked]
+        removed = [e for e in removed if e.get("address") in tracked]
+        if not added and not removed:
+            return True
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            deltas = {}
+            for entry in removed:
+                txid, index = _outpoint(entry)
+                row = self._db.execute(
+                    "SELECT amount FROM utxos WHERE transaction_id = ? AND output_index = ?", (txid, index)
+                ).fetchone()
+                if row is None:
+                    self._db.execute("ROLLBACK")
+                    return False
+                self._db.execute("DELETE FROM utxos WHERE transaction_id = ? AND output_index = ?", (txid, index))
+                count, sompi = deltas.get(entry["address"], (0, 0))
+                deltas[entry["address"]] = (count - 1, sompi - row[0])
+            for entry in added:
+                try:
+                    self._db.execute("INSERT INTO utxos VALUES (?, ?, ?, ?, ?, ?, ?)", self._row(entry["address"], entry))
+                except sqlite3.IntegrityError:
+                    self._db.execute("ROLLBACK")
+                    return False
+                count, sompi = deltas.get(entry["address"], (0, 0))
+                deltas[entry["address"]] = (count + 1, sompi + entry_amount(entry))
+            self._db.executemany(
+                "UPDATE addresses SET utxos = utxos + ?, sompi = sompi + ? WHERE address = ?",
+                [(count, sompi, address) for address, (count, sompi) in deltas.items()],
+            )
+        return True
+
+    def _row(self, address, entry):
+        utxo = entry.get("utxoEntry", entry)
+        txid, index = _outpoint(entry)
+        script = utxo.get("scriptPublicKey")
+        if isinstance(script, dict):
+            script = script.get("scriptPublicKey", script.get("script", ""))
+        return (
+            txid, index, address, entry_amount(entry),
+            int(utxo.get("blockDaaScore", 0) or 0), 1 if utxo.get("isCoinbase") else 0, script,
+        )
+
+    def balance(self, address):
+        """(utxo count, sompi) for a tracked address, or None if untracked
+        or not synced yet"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT utxos, sompi, synced_at FROM addresses WHERE address = ?", (address,)
+            ).fetchone()
+        if row is None or row[2] is None:
+            return None
+        return row[0], row[1]
+
+    def oldest_daa_score(self, address):
+        """DAA score of the oldest stored UTXO of address, or None if it has none"""
+        with self._lock:
+            row = self._db.execute("SELECT MIN(block_daa_score) FROM utxos WHERE address = ?", (address,)).fetchone()
+        return row[0]
+
+    def entries(self, address):
+        """Yield stored UTXOs of address in getUTXOsByAddresses entry form"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT transaction_id, output_index, amount, block_daa_score, is_coinbase, script_public_key "
+                "FROM utxos WHERE address = ? ORDER BY block_daa_score, transaction_id, output_index",
+                (address,),
+            ).fetchall()
+        for txid, index, amount, daa_score, coinbase, script in rows:
+            yield {
+                "address": address,
+                "outpoint": {"transactionId": txid, "index": index},
+                "utxoEntry": {
+                    "amount": amount,
+                    "blockDaaScore": daa_score,
+                    "isCoinbase": bool(coinbase),
+                    "scriptPublicKey": script,
+                },
+            }
+
+    def heartbeat(self, now=None):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('heartbeat', ?)", (now or time.time(),))
+
+    def is_live(self, window=LIVE_WINDOW):
+        """True while an indexer has checked in within window seconds"""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'heartbeat'").fetchone()
+        return row is not None and time.time() - row[0] < window
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class UtxoIndexer:
+    """Background thread keeping a UtxoIndex in step with the node.
+
+    Subscribes to UTXO changes for the tracked addresses before taking the
+    snapshot, so nothing that happens in between is lost (replaying a
+    change the snapshot already holds is harmless after a resync)."""
+
+    def __init__(self, index, client=None, resync_interval=3600):
+        self.index = index
+        self.client = client or RpcClient()
+        self.resync_interval = resync_interval
+        self.resyncs = 0
+        self.notifications = 0
+        self.last_error = None
+        self._pending = []
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Call callback(addresses) on the indexer thread after the UTXOs of
+        those addresses changed or were resynced"""
+        self._listeners.append(callback)
+
+    def _changed(self, addresses):
+        for callback in self._listeners:
+            try:
+                callback(addresses)
+            except Exception:
+                pass
+
+    def track(self, addresses):
+        """Track more addresses; picked up by the running indexer"""
+        new = self.index.track(addresses)
+        if new:
+            with self._lock:
+                self._pending.extend(new)
+        return new
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="utxo-indexer", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def resync(self, addresses=None):
+        """Reload addresses (default: all tracked) from getUTXOsByAddresses"""
+        addresses = list(addresses or self.index.tracked())
+        if not addresses:
+            return
+        self.index.replace(utxos_by_addresses(addresses, client=self.client))
+        self.resyncs += 1
+        self._changed(set(addresses))
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                self._follow()
+                backoff = 1
+            except (OSError, ValueError, RpcError) as e:
+                # Any break in the stream is a potential gap: reconnect and
+                # resync from a fresh snapshot
+                self.last_error = str(e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60)
+
+    def _subscribe(self, conn, addresses):
+        request = self.client._requests([(SUBSCRIBE_METHOD, {"addresses": list(addresses)})])
+        conn.send(self.client._payload(request, False))
+        return request[0]["id"]
+
+    def _follow(self):
+        conn = self.client._acquire(fresh=True)
+        try:
+            with self._lock:
+                self._pending.clear()
+            tracked = self.index.tracked()
+            if tracked:
+                self._subscribe(conn, tracked)
+            self.resync(tracked)
+            synced_at = last_beat = time.monotonic()
+            self.index.heartbeat()
+
+            while not self._stop.is_set():
+                with self._lock:
+                    pending, self._pending = self._pending, []
+                if pending:
+                    self._subscribe(conn, pending)
+                    self.resync(pending)
+
+                now = time.monotonic()
+                if now - last_beat >= HEARTBEAT_INTERVAL:
+                    self.index.heartbeat()
+                    last_beat = now
+                if self.resync_interval and now - synced_at >= self.resync_interval:
+                    self.resync()
+                    synced_at = now
+
+                try:
+                    message = conn.read_message()
+                except socket.timeout:
+                    continue
+                for item in (message if isinstance(message, list) else [message]):
+                    self._handle(item)
+        finally:
+            conn.close()
+
+    def _handle(self, message):
+        if not isinstance(message, dict):
+            return
+        if message.get("error") and message.get("id") is not None:
+            raise RpcError(f"{SUBSCRIBE_METHOD}: {message['error']}")
+        if message.get("method", "").lower() != NOTIFICATION_METHOD.lower():
+            return
+        params = message.get("params") or {}
+        added, removed = params.get("added", []), params.get("removed", [])
+        self.notifications += 1
+        if self.index.apply(added, removed):
+            self._changed({entry.get("address") for entry in added + removed} & self.index.tracked())
+        else:
+            self.resync()
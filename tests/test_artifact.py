@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from kaspa_tools.artifact import FORMATS, load_artifact, save_artifact
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "deadman.json")
+
+
+class TestArtifact(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        with open(SOURCE) as f:
+            self.expected = json.load(f)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.dir.name, name)
+
+    def test_binary_round_trip_is_mmapped(self):
+        with load_artifact(SOURCE) as artifact:
+            save_artifact(artifact, self.path("deadman.sila"))
+        with load_artifact(self.path("deadman.sila")) as artifact:
+            self.assertIsInstance(artifact.script, memoryview)
+            self.assertEqual(bytes(artifact.script), bytes(self.expected["script"]))
+            self.assertEqual(artifact.function("claim"), self.expected["abi"][1])
+            self.assertEqual(artifact.as_dict(), self.expected)
+
+    def test_ast_survives_close(self):
+        with load_artifact(SOURCE) as artifact:
+            save_artifact(artifact, self.path("deadman.sila"))
+        artifact = load_artifact(self.path("deadman.sila"))
+        artifact.close()
+        with self.assertRaises(ValueError):
+            bytes(artifact.script)
+        self.assertEqual(artifact.ast, self.expected["ast"])
+
+    def test_every_format_converts_back(self):
+        with load_artifact(SOURCE) as artifact:
+            for fmt in FORMATS:
+                save_artifact(artifact, self.path(f"deadman.{fmt}"), fmt)
+        for fmt in FORMATS:
+            with load_artifact(self.path(f"deadman.{fmt}")) as artifact:
+                save_artifact(artifact, self.path(f"back.{fmt}.json"))
+            with open(self.path(f"back.{fmt}.json")) as f:
+                self.assertEqual(json.load(f), self.expected, fmt)
+
+    def test_rejects_truncated_binary(self):
+        with load_artifact(SOURCE) as artifact:
+            save_artifact(artifact, self.path("deadman.sila"))
+        with open(self.path("deadman.sila"), "rb") as f:
+            data = f.read()
+        with open(self.path("short.sila"), "wb") as f:
+            f.write(data[:-10])
+        with self.assertRaises(ValueError):
+            load_artifact(self.path("short.sila"))
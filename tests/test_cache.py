@@ -0,0 +1,100 @@
+import threading
+import time
+from unittest import TestCase
+
+from kaspa_tools.cache import SingleFlightCache
+
+THREADS = 8
+
+
+class SlowLoader:
+    """Blocks every load until release() and counts how many ran"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.gate = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {"call": self.calls}
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.001)
+
+
+class TestSingleFlightCache(TestCase):
+    def run_threads(self, cache, loader):
+        results, errors = [], []
+
+        def worker():
+            try:
+                results.append(cache.get("wallet"))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: cache.stats()["wallet"]["coalesced"] == THREADS - 1)
+        loader.gate.set()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_concurrent_misses_load_once(self):
+        loader = SlowLoader()
+        cache = SingleFlightCache()
+        cache.add_source("wallet", loader, ttl=60)
+        results, errors = self.run_threads(cache, loader)
+        self.assertEqual(errors, [])
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(results, [{"call": 1}] * THREADS)
+        counts = cache.stats()["wallet"]
+        self.assertEqual((counts["misses"], counts["coalesced"], counts["refreshes"]), (1, THREADS - 1, 1))
+        self.assertEqual(cache.get("wallet"), {"call": 1})
+        self.assertEqual(cache.stats()["wallet"]["hits"], 1)
+
+    def test_waiters_share_the_error(self):
+        loader = SlowLoader(RuntimeError("rothschild timed out"))
+        cache = SingleFlightCache()
+        cache.add_source("wallet", loader, ttl=60)
+        results, errors = self.run_threads(cache, loader)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), THREADS)
+        self.assertEqual(loader.calls, 1)
+        self.assertEqual(cache.stats()["wallet"]["errors"], 1)
+
+    def test_stale_value_served_during_one_refresh(self):
+        loader = SlowLoader()
+        loader.gate.set()
+        cache = SingleFlightCache()
+        cache.add_source("wallet", loader, ttl=0, stale_ttl=60)
+        self.assertEqual(cache.get("wallet"), {"call": 1})
+        loader.gate.clear()
+        stale = [cache.get("wallet") for _ in range(THREADS)]
+        self.assertEqual(stale, [{"call": 1}] * THREADS)
+        loader.gate.set()
+        wait_for(lambda: cache.stats()["wallet"]["refreshes"] == 2)
+        self.assertEqual(loader.calls, 2)
+        self.assertEqual(cache.stats()["wallet"]["stale"], THREADS)
+
+    def test_refresh_joins_running_load(self):
+        loader = SlowLoader()
+        cache = SingleFlightCache()
+        cache.add_source("wallet", loader, ttl=60)
+        thread = threading.Thread(target=cache.get, args=("wallet",))
+        thread.start()
+        wait_for(lambda: loader.calls == 1)
+        threading.Timer(0.05, loader.gate.set).start()
+        self.assertEqual(cache.refresh("wallet"), {"call": 1})
+        thread.join(5)
+        self.assertEqual(cache.refresh("wallet"), {"call": 2})
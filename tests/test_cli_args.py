@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, "kaspa-cli.py")
+
+OWNER = "11" * 32
+BENEFICIARY = "22" * 32
+
+
+class TestArgsCommand(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.dir.name, "args")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def run_cli(self, rows):
+        path = os.path.join(self.dir.name, "rows.csv")
+        with open(path, "w") as f:
+            f.write("name,owner,beneficiary,timeout\n")
+            for name, timeout in rows:
+                f.write(f"{name},{OWNER},{BENEFICIARY},{timeout}\n")
+        return subprocess.run([sys.executable, CLI, "args", path, "-o", self.out],
+                              capture_output=True, text=True, cwd=ROOT, timeout=60)
+
+    def read(self, stem):
+        with open(os.path.join(self.out, f"{stem}_args.json")) as f:
+            return json.load(f)
+
+    def test_one_file_per_row(self):
+        result = self.run_cli([("alice", 100), ("bob", 200)])
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(sorted(os.listdir(self.out)), ["alice_args.json", "bob_args.json"])
+        self.assertEqual(self.read("bob")[2]["data"], 200)
+
+    def test_duplicate_stem_keeps_first_row(self):
+        # 28daafc: later rows used to overwrite the same <stem>_args.json
+        result = self.run_cli([("alice", 100), ("Alice", 200), ("al ice", 300), ("al/ice", 400)])
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("row 2: Alice_args.json already written by row 1", result.stderr)
+        self.assertIn("row 4: al_ice_args.json already written by row 3", result.stderr)
+        self.assertEqual(sorted(os.listdir(self.out)), ["al_ice_args.json", "alice_args.json"])
+        self.assertEqual(self.read("alice")[2]["data"], 100)
+        self.assertEqual(self.read("al_ice")[2]["data"], 300)
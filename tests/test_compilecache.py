@@ -0,0 +1,65 @@
+import os
+import stat
+import tempfile
+from unittest import TestCase, mock
+
+from kaspa_tools import compilecache
+from kaspa_tools.compilecache import CompileCache, CompileError
+
+# Stands in for silverc: hangs on sources named hang*, else writes a stub artifact
+FAKE_SILVERC = """#!/bin/sh
+case "$(basename "$1")" in
+    hang*) exec sleep 30 ;;
+    bad*) echo "syntax error" >&2; exit 1 ;;
+esac
+printf '{"contract_name": "%s"}' "$(basename "$1" .sil)" > "$3"
+"""
+
+
+class TestCompileCache(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.silverc = os.path.join(self.dir.name, "silverc")
+        with open(self.silverc, "w") as f:
+            f.write(FAKE_SILVERC)
+        os.chmod(self.silverc, stat.S_IRWXU)
+        self.src = os.path.join(self.dir.name, "src")
+        os.makedirs(self.src)
+        self.cache = CompileCache(os.path.join(self.dir.name, "cache"), silverc=self.silverc)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def source(self, name):
+        path = os.path.join(self.src, name + ".sil")
+        with open(path, "w") as f:
+            f.write(f"contract {name}() {{}}\n")
+        return path
+
+    def test_hit_after_miss(self):
+        source = self.source("vault")
+        output, hit = self.cache.compile(source)
+        self.assertFalse(hit)
+        self.assertEqual(self.cache.compile(source), (output, True))
+        with open(output) as f:
+            self.assertEqual(f.read(), '{"contract_name": "vault"}')
+
+    def test_hung_silverc_fails_only_its_job(self):
+        # b94f66d: TimeoutExpired used to escape compile_many and lose the batch
+        for name in ("hang", "bad", "vault"):
+            self.source(name)
+        with mock.patch.object(compilecache, "SILVERC_TIMEOUT", 0.5):
+            results = self.cache.compile_directory(self.src, os.path.join(self.dir.name, "out"))
+        by_name = {os.path.basename(source): (path, error) for source, path, _, error in results}
+        self.assertIn("timed out after 0.5s", by_name["hang.sil"][1])
+        self.assertIsNone(by_name["hang.sil"][0])
+        self.assertIn("syntax error", by_name["bad.sil"][1])
+        self.assertIsNone(by_name["vault.sil"][1])
+        self.assertTrue(os.path.exists(by_name["vault.sil"][0]))
+        # Nothing half-written is left in the cache
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_hung_silverc_raises_compile_error(self):
+        with mock.patch.object(compilecache, "SILVERC_TIMEOUT", 0.5):
+            with self.assertRaises(CompileError):
+                self.cache.compile(self.source("hang"))
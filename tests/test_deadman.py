@@ -0,0 +1,46 @@
+import os
+from unittest import TestCase
+
+from kaspa_tools.deadman import EXPIRED, EXPIRING, ContractWatcher
+from kaspa_tools.scriptvm import Simulator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestContractWatcher(TestCase):
+    def setUp(self):
+        self.funded = {}
+        self.watcher = ContractWatcher(self.funded.get, warn_seconds=1000, daa_per_second=1)
+
+    def test_upcoming_orders_by_deadline_across_states(self):
+        self.funded.update(a=0, b=0)
+        self.watcher.watch("a", 1200)
+        self.watcher.watch("b", 1100)
+        # b is already expiring, a is not warned yet
+        self.watcher.advance(150)
+        self.assertEqual([c["address"] for c in self.watcher.upcoming(1)], ["b"])
+        self.assertEqual([(c["address"], c["state"]) for c in self.watcher.upcoming()],
+                         [("b", EXPIRING), ("a", None)])
+
+    def test_expired_contracts_leave_upcoming(self):
+        self.funded.update(a=0, b=0)
+        self.watcher.watch("a", 1200)
+        self.watcher.watch("b", 1100)
+        self.watcher.advance(1100)
+        self.assertEqual([c["address"] for c in self.watcher.upcoming()], ["a"])
+        self.assertEqual(self.watcher.alerts[0]["type"], EXPIRED)
+
+    def test_deadline_matches_script_csv(self):
+        sim = Simulator.load(os.path.join(ROOT, "deadman.json"), os.path.join(ROOT, "deadman_args.json"))
+        timeout = sim.ctor["inactivityPeriod"]
+        self.funded["a"] = 5000
+        self.watcher.watch("a", timeout)
+        [contract] = self.watcher.upcoming()
+        age = contract["deadline"] - 5000
+
+        def claim(age):
+            ctx = sim.context("heir", age=age, daa_score=5000 + age)
+            return sim.spend("claim", ctx, "heir")["ok"]
+
+        self.assertTrue(claim(age))
+        self.assertFalse(claim(age - 1))
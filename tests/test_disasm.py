@@ -0,0 +1,52 @@
+import os
+from unittest import TestCase
+
+from kaspa_tools import disasm
+from kaspa_tools.artifact import load_artifact
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestCheckedInArtifacts(TestCase):
+    def setUp(self):
+        self.paths = disasm.artifact_paths(ROOT)
+        self.assertIn(os.path.join(ROOT, "deadman.json"), self.paths)
+
+    def test_every_artifact_decodes_and_splits(self):
+        for report in disasm.analyze_many(self.paths):
+            with self.subTest(path=report["path"]):
+                self.assertNotIn("error", report)
+                with load_artifact(report["path"]) as artifact:
+                    instructions = disasm.decode(artifact.script)
+                    names = [entry["name"] for entry in artifact.abi]
+                self.assertEqual(disasm.span(instructions), report["script_size"])
+                self.assertEqual([e["name"] for e in report["entrypoints"]], names)
+                end = report["prolog_size"]
+                for entry in report["entrypoints"]:
+                    # Branches follow each other in ABI order without overlapping
+                    self.assertGreaterEqual(entry["offset"], end)
+                    end = entry["offset"] + entry["size"]
+                    self.assertLessEqual(entry["sig_ops"], report["sig_ops"])
+                self.assertLessEqual(end, report["script_size"])
+
+    def test_deadman_report(self):
+        report = disasm.analyze(os.path.join(ROOT, "deadman.json"))
+        self.assertEqual((report["contract"], report["script_size"], report["sig_ops"]), ("DeadmanSwitch", 117, 2))
+        keep_alive, claim = report["entrypoints"]
+        self.assertEqual((keep_alive["name"], keep_alive["offset"], keep_alive["size"]), ("keepAlive", 0, 60))
+        self.assertEqual((claim["name"], claim["offset"], claim["size"]), ("claim", 61, 50))
+        self.assertEqual(claim["sig_ops"], 1)
+
+
+class TestDecode(TestCase):
+    def test_pushes(self):
+        script = bytes([0x00, 0x4F, 0x60, 0x02, 0xE8, 0x03, 0x01, 0x81, 0x4C, 0x01, 0x07, 0xAC])
+        instructions = disasm.decode(script)
+        self.assertEqual([disasm.push_int(i) for i in instructions], [0, -1, 16, 1000, -1, 7, None])
+        self.assertEqual(disasm.NAMES[instructions[-1][1]], "OpCheckSig")
+        self.assertEqual(disasm.span(instructions), len(script))
+
+    def test_truncated(self):
+        for script in (b"\x05\x01\x02", b"\x4d\x01"):
+            with self.assertRaises(disasm.DisasmError):
+                disasm.decode(script)
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from kaspa_tools import keys
+from kaspa_tools.address import (
+    VERSION_PUBKEY, VERSION_SCRIPT_HASH, address_from_private_key, decode_address, encode_address,
+)
+
+# TESTNET_WALLET.md
+WALLET_KEY = "39186751d974432cb50431befe5575e3d138f66c218a1018f8fa2959dc8de6aa"
+WALLET_ADDRESS = "kaspatest:qr6khmwdv9umd0wp3etenxv5c02s7zztse7lm98mnu3vugsun9j56lkrppy6j"
+
+GX = "79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798"
+GY = "483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8"
+
+
+def scalar(n):
+    return n.to_bytes(32, "big")
+
+
+class TestKeys(TestCase):
+    def test_generator(self):
+        self.assertEqual(keys.public_key(scalar(1), compressed=False).hex(), "04" + GX + GY)
+        self.assertEqual(keys.public_key(scalar(1)).hex(), "02" + GX)
+        # -G has the same x and the odd y
+        self.assertEqual(keys.public_key(scalar(keys.N - 1)).hex(), "03" + GX)
+
+    def test_small_multiples(self):
+        self.assertEqual(keys.xonly_public_key(scalar(2)).hex(),
+                         "c6047f9441ed7d6d3045406e95c07cd85c778e4b8cef3ca7abac09b95c709ee5")
+        self.assertEqual(keys.xonly_public_key(scalar(3)).hex(),
+                         "f9308a019258c31049344f85f89d5229b531c845836f99b08601f113bce036f9")
+
+    def test_pure_python_matches(self):
+        for n in (1, 2, 3, 0xDEADBEEF, keys.N - 1, int(WALLET_KEY, 16)):
+            x, y = keys._multiply_g(n)
+            self.assertEqual(keys._sec1(x, y, False), keys.public_key(scalar(n), compressed=False))
+
+    def test_generated_pairs_match(self):
+        for secret, compressed in keys.generate_keypairs(3):
+            self.assertEqual(keys.public_key(secret), compressed)
+
+    def test_rejects_out_of_range(self):
+        for bad in (scalar(0), scalar(keys.N), "zz" * 32, b"\x01" * 31):
+            with self.assertRaises(ValueError):
+                keys.parse_private_key(bad)
+
+
+class TestAddress(TestCase):
+    def test_wallet_address(self):
+        self.assertEqual(address_from_private_key(WALLET_KEY), WALLET_ADDRESS)
+
+    def test_round_trip(self):
+        prefix, version, payload = decode_address(WALLET_ADDRESS)
+        self.assertEqual((prefix, version), ("kaspatest", VERSION_PUBKEY))
+        self.assertEqual(payload, keys.xonly_public_key(WALLET_KEY))
+        self.assertEqual(encode_address(prefix, version, payload), WALLET_ADDRESS)
+        script_hash = bytes(range(32))
+        address = encode_address("kaspa", VERSION_SCRIPT_HASH, script_hash)
+        self.assertEqual(decode_address(address), ("kaspa", VERSION_SCRIPT_HASH, script_hash))
+        self.assertEqual(decode_address(address.upper())[2], script_hash)
+
+    def test_rejects_bad_checksum(self):
+        last = WALLET_ADDRESS[-1]
+        corrupted = WALLET_ADDRESS[:-1] + ("q" if last != "q" else "p")
+        with self.assertRaises(ValueError):
+            decode_address(corrupted)
+        # Same body under another network prefix
+        with self.assertRaises(ValueError):
+            decode_address("kaspa:" + WALLET_ADDRESS.partition(":")[2])
@@ -0,0 +1,47 @@
+import os
+from unittest import TestCase
+
+from kaspa_tools.scriptvm import Simulator, mock_signature
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestSimulator(TestCase):
+    def setUp(self):
+        self.sim = Simulator.load(os.path.join(ROOT, "deadman.json"), os.path.join(ROOT, "deadman_args.json"))
+        self.timeout = self.sim.ctor["inactivityPeriod"]
+
+    def test_csv_boundary(self):
+        result = self.sim.spend("claim", self.sim.context(age=self.timeout), "heir")
+        self.assertTrue(result["ok"], result["error"])
+        result = self.sim.spend("claim", self.sim.context(age=self.timeout - 1), "heir")
+        self.assertFalse(result["ok"])
+        self.assertIn("OpCheckSequenceVerify", result["error"])
+
+    def test_csv_uses_declared_sequence(self):
+        # An old enough UTXO still fails if the input declares a shorter lock
+        ctx = self.sim.context(age=self.timeout, sequence=self.timeout - 1)
+        self.assertFalse(self.sim.spend("claim", ctx, "heir")["ok"])
+
+    def test_check_sig(self):
+        self.assertTrue(self.sim.spend("keepAlive", self.sim.context(), "owner")["ok"])
+        ctx = self.sim.context()
+        wrong_digest = mock_signature(self.sim.key("owner"), bytes(32))
+        self.assertFalse(self.sim.spend("keepAlive", ctx, "owner", {"s": wrong_digest})["ok"])
+
+    def test_failing_require(self):
+        # checkSig(s, heir) is false for the owner's signature, so require() stops the script
+        result = self.sim.spend("claim", self.sim.context(age=self.timeout), "owner")
+        self.assertFalse(result["ok"])
+        self.assertIn("OpVerify", result["error"])
+        result = self.sim.spend("keepAlive", self.sim.context(), "heir")
+        self.assertFalse(result["ok"])
+        self.assertIn("OpVerify", result["error"])
+
+    def test_unknown_signer(self):
+        with self.assertRaisesRegex(ValueError, r"unknown signer 'nobody' \(constructor pubkeys in .*: owner, heir\)"):
+            self.sim.key("nobody")
+        sim = Simulator.load(os.path.join(ROOT, "deadman_simple.json"))
+        with self.assertRaisesRegex(ValueError, r"unknown signer 'beneficiary' \(no args file for DeadmanSwitchSimple\)"):
+            sim.spend("claim", sim.context(), "beneficiary")
+        self.assertEqual(sim.key("ab" * 32), bytes([0xAB]) * 32)
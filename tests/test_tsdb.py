@@ -0,0 +1,73 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from kaspa_tools.tsdb import RingFile, TimeSeriesStore
+
+
+class TestRingFile(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "m.raw.ring")
+        self.ring = RingFile(self.path, 5)
+
+    def tearDown(self):
+        self.ring.close()
+        self.dir.cleanup()
+
+    def fill(self, count):
+        for t in range(count):
+            self.ring.append(float(t), t * 10.0, t - 1.0, t + 1.0)
+
+    def test_wraparound_keeps_newest(self):
+        self.fill(13)
+        self.assertEqual(len(self.ring), 5)
+        self.assertEqual(self.ring.written, 13)
+        self.assertEqual([self.ring.record(i)[0] for i in range(5)], [8.0, 9.0, 10.0, 11.0, 12.0])
+        self.assertEqual(self.ring.last(), (12.0, 120.0, 11.0, 13.0))
+
+    def test_range_across_wrap_point(self):
+        # 8 records in 5 slots: 5..7 sit in slots 0..2, 3 and 4 in slots 3..4
+        self.fill(8)
+        self.assertEqual([r[0] for r in self.ring.range(0, 100)], [3.0, 4.0, 5.0, 6.0, 7.0])
+        self.assertEqual([r[0] for r in self.ring.range(4, 6)], [4.0, 5.0, 6.0])
+        self.assertEqual([r[0] for r in self.ring.range(3.5, 5.5)], [4.0, 5.0])
+        self.assertEqual([r[0] for r in self.ring.range(4, 100, limit=2)], [4.0, 5.0])
+        self.assertEqual(self.ring.range(8, 100), [])
+        self.assertEqual(self.ring.bisect(0), 0)
+        self.assertEqual(self.ring.bisect(5), 2)
+        self.assertEqual(self.ring.bisect(99), 5)
+
+    def test_reopen_keeps_records_and_capacity(self):
+        self.fill(7)
+        self.ring.close()
+        self.ring = RingFile(self.path, 100)
+        self.assertEqual(self.ring.capacity, 5)
+        self.assertEqual([r[0] for r in self.ring.range(0, 100)], [2.0, 3.0, 4.0, 5.0, 6.0])
+
+
+class TestTimeSeriesStore(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = TimeSeriesStore(self.dir.name)
+
+    def tearDown(self):
+        self.store.close()
+        self.dir.cleanup()
+
+    def test_rollups_survive_restart(self):
+        for t in range(0, 90, 10):
+            self.assertTrue(self.store.append("peers", 1000 + t, t))
+        self.assertFalse(self.store.append("peers", 1000, 1))
+        self.store.close()
+        self.store = TimeSeriesStore(self.dir.name)
+        self.store.append("peers", 1100, 100)
+        _, points = self.store.query("peers", 0, 2000, resolution="1m")
+        # The minute from 1080 was still open at close; it refolds 1080 from disk
+        self.assertEqual(points, [(960.0, 5.0, 0.0, 10.0), (1020.0, 45.0, 20.0, 70.0), (1080.0, 90.0, 80.0, 100.0)])
+
+    def test_rejects_bad_names_and_resolutions(self):
+        with self.assertRaises(ValueError):
+            self.store.append("../x", 1, 1)
+        with self.assertRaises(ValueError):
+            self.store.query("peers", 0, 1, resolution="1d")
@@ -0,0 +1,83 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from kaspa_tools.utxoindex import NOTIFICATION_METHOD, UtxoIndex, UtxoIndexer
+
+ADDRESS = "kaspatest:qr6khmwdv9umd0wp3etenxv5c02s7zztse7lm98mnu3vugsun9j56lkrppy6j"
+OTHER = "kaspatest:untracked"
+
+
+def utxo(txid, index, amount, daa_score=100, address=ADDRESS):
+    return {
+        "address": address,
+        "outpoint": {"transactionId": txid, "index": index},
+        "utxoEntry": {"amount": str(amount), "blockDaaScore": str(daa_score), "isCoinbase": False,
+                      "scriptPublicKey": "20ab"},
+    }
+
+
+class FakeClient:
+    """Answers getUTXOsByAddresses from a fixed node UTXO set"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.calls = 0
+
+    def batch(self, calls):
+        self.calls += 1
+        return [{"entries": [e for e in self.entries if e["address"] in params["addresses"]]}
+                for _, params in calls]
+
+
+class TestUtxoIndex(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.index = UtxoIndex(os.path.join(self.dir.name, "index.sqlite3"))
+        self.index.track([ADDRESS])
+        self.index.replace({ADDRESS: [utxo("aa", 0, 500, daa_score=50)]})
+
+    def tearDown(self):
+        self.index.close()
+        self.dir.cleanup()
+
+    def test_removes_before_adds(self):
+        # Spending a UTXO and receiving change arrive in one notification
+        self.assertTrue(self.index.apply([utxo("bb", 0, 300, daa_score=70)], [utxo("aa", 0, 500)]))
+        self.assertEqual(self.index.balance(ADDRESS), (1, 300))
+        self.assertEqual(self.index.oldest_daa_score(ADDRESS), 70)
+        # The same outpoint can come back in the notification that removes it
+        self.assertTrue(self.index.apply([utxo("bb", 0, 300, daa_score=80)], [utxo("bb", 0, 300)]))
+        self.assertEqual(self.index.oldest_daa_score(ADDRESS), 80)
+
+    def test_reapply_is_rejected_without_changes(self):
+        added = [utxo("bb", 0, 300), utxo("bb", 1, 200)]
+        self.assertTrue(self.index.apply(added, []))
+        self.assertEqual(self.index.balance(ADDRESS), (3, 1000))
+        self.assertFalse(self.index.apply(added, []))
+        self.assertFalse(self.index.apply([], [utxo("cc", 0, 1)]))
+        # A partly valid notification leaves nothing behind either
+        self.assertFalse(self.index.apply([utxo("dd", 0, 5)], [utxo("aa", 0, 500), utxo("cc", 0, 1)]))
+        self.assertEqual(self.index.balance(ADDRESS), (3, 1000))
+        self.assertEqual([e["outpoint"]["transactionId"] for e in self.index.entries(ADDRESS)], ["aa", "bb", "bb"])
+
+    def test_ignores_untracked_addresses(self):
+        self.assertTrue(self.index.apply([utxo("ee", 0, 9, address=OTHER)], [utxo("ff", 0, 9, address=OTHER)]))
+        self.assertEqual(self.index.balance(ADDRESS), (1, 500))
+        self.assertIsNone(self.index.balance(OTHER))
+
+    def test_mismatch_resyncs_from_snapshot(self):
+        node = [utxo("bb", 0, 300), utxo("cc", 2, 40)]
+        client = FakeClient(node)
+        indexer = UtxoIndexer(self.index, client=client)
+        changed = []
+        indexer.add_listener(changed.append)
+        notification = {"method": NOTIFICATION_METHOD, "params": {"added": [], "removed": [utxo("zz", 0, 1)]}}
+        indexer._handle(notification)
+        self.assertEqual((client.calls, indexer.resyncs), (1, 1))
+        self.assertEqual(self.index.balance(ADDRESS), (2, 340))
+        self.assertEqual(changed, [{ADDRESS}])
+        # Replaying a change the snapshot already holds also resyncs, to the same state
+        indexer._handle({"method": NOTIFICATION_METHOD, "params": {"added": [node[0]], "removed": []}})
+        self.assertEqual(indexer.resyncs, 2)
+        self.assertEqual(self.index.balance(ADDRESS), (2, 340))
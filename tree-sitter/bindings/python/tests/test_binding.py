@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest import TestCase
 
 from tree_sitter import Language, Parser
@@ -10,3 +12,103 @@ class TestLanguage(TestCase):
             Parser(Language(tree_sitter_silverscript.language()))
         except Exception:
             self.fail("Error loading SilverScript grammar")
+
+
+VALID = b"""pragma silverscript ^0.1.0;
+
+contract Vault(pubkey owner) {
+    function check(sig s) {
+        require(checkSig(s, owner));
+    }
+
+    entrypoint function spend(sig s) {
+        require(checkSig(s, owner));
+    }
+}
+"""
+
+BROKEN = b"contract Broken(int a) { entrypoint function f() { require(a == ); } }"
+
+
+class TestBulkParse(TestCase):
+    def test_summary(self):
+        summary = tree_sitter_silverscript.parse_source(("vault.sil", VALID))
+        self.assertEqual(summary.contract, "Vault")
+        self.assertEqual(summary.functions, ("check", "spend"))
+        self.assertEqual(summary.entrypoints, ("spend",))
+        self.assertTrue(summary.ok)
+
+    def test_error_spans(self):
+        summary = tree_sitter_silverscript.parse_source(BROKEN)
+        self.assertFalse(summary.ok)
+        self.assertEqual(summary.contract, "Broken")
+        self.assertTrue(all(issue.start[0] == 0 for issue in summary.errors))
+
+    def test_pool_keeps_order(self):
+        sources = [(f"{i}.sil", VALID if i % 2 else BROKEN) for i in range(40)]
+        summaries = list(tree_sitter_silverscript.parse_many(sources, workers=2))
+        self.assertEqual([s.path for s in summaries], [name for name, _ in sources])
+        self.assertEqual([s.ok for s in summaries], [i % 2 == 1 for i in range(40)])
+
+
+class TestEditSession(TestCase):
+    def test_edit_reports_diagnostic_changes(self):
+        session = tree_sitter_silverscript.EditSession(VALID)
+        self.assertEqual(session.diagnostics, ())
+        start = VALID.index(b"checkSig")
+        broken = session.edit(start, start + len(b"checkSig"), b"")
+        self.assertTrue(broken.added)
+        self.assertEqual(broken.removed, ())
+        self.assertTrue(broken.changed_ranges)
+        self.assertEqual(session.text, VALID[:start] + VALID[start + 8:])
+
+        fixed = session.edit(start, start, "checkSig")
+        self.assertEqual(fixed.added, ())
+        self.assertEqual(fixed.removed, broken.added)
+        self.assertEqual(session.text, VALID)
+        self.assertEqual(str(session.tree.root_node), str(tree_sitter_silverscript.EditSession(VALID).tree.root_node))
+
+    def test_set_text_and_points(self):
+        session = tree_sitter_silverscript.EditSession(VALID)
+        session.set_text(VALID.replace(b"spend", b"withdraw"))
+        self.assertIn(b"withdraw", session.text)
+        self.assertEqual(session.diagnostics, ())
+        row = VALID.count(b"\n", 0, VALID.index(b"check("))
+        result = session.replace((row, 13), (row, 18), "audit")
+        self.assertEqual(session.text, VALID.replace(b"spend", b"withdraw").replace(b"check(", b"audit("))
+        self.assertEqual(result.added, ())
+
+    def test_replace_points_match_a_fresh_parse(self):
+        session = tree_sitter_silverscript.EditSession(VALID)
+        row = VALID.count(b"\n", 0, VALID.index(b"checkSig"))
+        session.replace((row, 0), (row + 1, 0), "    require(\n")
+        fresh = tree_sitter_silverscript.EditSession(session.text)
+        self.assertEqual(str(session.tree.root_node), str(fresh.tree.root_node))
+        self.assertEqual(session.diagnostics, fresh.diagnostics)
+        summary = tree_sitter_silverscript.summarize(fresh.tree)
+        self.assertEqual([(d.kind, d.start, d.end) for d in session.diagnostics], list(summary.errors))
+        self.assertTrue(summary.errors)
+
+
+class TestSymbols(TestCase):
+    def test_query_is_cached(self):
+        self.assertIs(tree_sitter_silverscript.query("highlights"), tree_sitter_silverscript.query("highlights"))
+
+    def test_tags(self):
+        tree = Parser(Language(tree_sitter_silverscript.language())).parse(VALID)
+        found = [(t.kind, t.name, t.container) for t in tree_sitter_silverscript.tags(tree) if t.role == "definition"]
+        self.assertEqual(found[:3], [("class", "Vault", None), ("parameter", "owner", "Vault"), ("function", "check", "Vault")])
+
+    def test_index_refreshes_changed_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vault.sil")
+            with open(path, "wb") as f:
+                f.write(VALID)
+            with tree_sitter_silverscript.SymbolIndex(os.path.join(tmp, "index.db")) as index:
+                self.assertEqual(index.refresh_directory(tmp)["parsed"], 1)
+                self.assertEqual(index.refresh_directory(tmp)["unchanged"], 1)
+                with open(path, "wb") as f:
+                    f.write(VALID.replace(b"Vault", b"Safe"))
+                self.assertEqual(index.refresh_directory(tmp)["parsed"], 1)
+                self.assertEqual([s.kind for s in index.find("Safe")], ["class"])
+                self.assertEqual(index.find("Vault"), [])
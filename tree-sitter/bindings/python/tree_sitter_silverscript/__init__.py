@@ -14,6 +14,11 @@ def _get_query(name, file):
     return globals()[name]
 
 
+_BULK = ("FileSummary", "SyntaxIssue", "parse_directory", "parse_many", "parse_source", "summarize")
+_SESSION = ("Diagnostic", "EditResult", "EditSession")
+_SYMBOLS = ("Symbol", "SymbolIndex", "Tag", "query", "tags")
+
+
 def __getattr__(name):
     if name == "HIGHLIGHTS_QUERY":
         return _get_query("HIGHLIGHTS_QUERY", "queries/highlights.scm")
@@ -23,6 +28,19 @@ def __getattr__(name):
         return _get_query("LOCALS_QUERY", "queries/locals.scm")
     if name == "TAGS_QUERY":
         return _get_query("TAGS_QUERY", "queries/tags.scm")
+    if name in _BULK:
+        # Needs the tree-sitter package (the "core" extra); import on demand
+        from . import bulk
+
+        return getattr(bulk, name)
+    if name in _SESSION:
+        from . import session
+
+        return getattr(session, name)
+    if name in _SYMBOLS:
+        from . import symbols
+
+        return getattr(symbols, name)
 
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -33,6 +51,20 @@ __all__ = [
     "INJECTIONS_QUERY",
     "LOCALS_QUERY",
     "TAGS_QUERY",
+    "FileSummary",
+    "SyntaxIssue",
+    "parse_directory",
+    "parse_many",
+    "parse_source",
+    "summarize",
+    "Diagnostic",
+    "EditResult",
+    "EditSession",
+    "Symbol",
+    "SymbolIndex",
+    "Tag",
+    "query",
+    "tags",
 ]
 
 
@@ -1,6 +1,10 @@
-from typing import Final
+from collections.abc import Iterable, Iterator
+from os import PathLike
+from typing import Final, NamedTuple
 from typing_extensions import CapsuleType
 
+from tree_sitter import Language, Parser, Query, Tree
+
 HIGHLIGHTS_QUERY: Final[str] | None
 """The syntax highlighting query for this grammar."""
 
@@ -15,3 +19,106 @@ TAGS_QUERY: Final[str] | None
 
 def language() -> CapsuleType:
     """The tree-sitter language function for this grammar."""
+
+class SyntaxIssue(NamedTuple):
+    """An ERROR node or a node the parser had to insert (MISSING)."""
+    kind: str
+    start: tuple[int, int]
+    end: tuple[int, int]
+
+class FileSummary(NamedTuple):
+    """What bulk parsing reports for one source."""
+    path: str | None
+    contract: str | None
+    entrypoints: tuple[str, ...]
+    functions: tuple[str, ...]
+    errors: tuple[SyntaxIssue, ...]
+    read_error: str | None = None
+    @property
+    def ok(self) -> bool: ...
+
+Source = str | PathLike[str] | bytes | tuple[str, bytes]
+
+def summarize(tree: Tree, path: str | None = None) -> FileSummary:
+    """Contract name, entrypoints, functions and error spans of a parsed tree."""
+
+def parse_source(source: Source) -> FileSummary:
+    """Parse and summarize one path, bytes, or (name, bytes) source."""
+
+def parse_many(sources: Iterable[Source], workers: int | None = None, chunksize: int = 16) -> Iterator[FileSummary]:
+    """Parse sources across a process pool (one Parser per worker), in input order."""
+
+def parse_directory(
+    directory: str | PathLike[str], pattern: str = "*.sil", workers: int | None = None, chunksize: int = 16
+) -> Iterator[FileSummary]:
+    """parse_many over every file under directory matching pattern."""
+
+class Diagnostic(NamedTuple):
+    """A syntax error or missing node, with byte and (row, column) spans."""
+    kind: str
+    start_byte: int
+    end_byte: int
+    start: tuple[int, int]
+    end: tuple[int, int]
+
+class EditResult(NamedTuple):
+    """What one edit changed."""
+    changed_ranges: tuple[tuple[int, int, tuple[int, int], tuple[int, int]], ...]
+    added: tuple[Diagnostic, ...]
+    removed: tuple[Diagnostic, ...]
+    parse_seconds: float
+
+class EditSession:
+    """A source buffer and its syntax tree, reparsed incrementally on each edit."""
+    parser: Parser
+    text: bytes
+    tree: Tree
+    diagnostics: tuple[Diagnostic, ...]
+    def __init__(self, source: str | bytes = b"", parser: Parser | None = None) -> None: ...
+    def edit(self, start_byte: int, old_end_byte: int, new_text: str | bytes) -> EditResult:
+        """Replace text[start_byte:old_end_byte] with new_text and reparse."""
+    def byte_offset(self, point: tuple[int, int]) -> int:
+        """Byte offset of a (row, column) point, column counted in bytes."""
+    def replace(self, start: tuple[int, int], end: tuple[int, int], new_text: str | bytes) -> EditResult:
+        """edit() addressed by (row, column) points."""
+    def set_text(self, source: str | bytes) -> EditResult:
+        """Switch to a new buffer, reparsing only the span that differs."""
+
+def query(name: str, lang: Language | None = None) -> Query:
+    """Compiled Query for queries/<name>.scm, compiled once per Language."""
+
+class Tag(NamedTuple):
+    """A definition or reference found by TAGS_QUERY."""
+    kind: str
+    role: str
+    name: str
+    container: str | None
+    start: tuple[int, int]
+    end: tuple[int, int]
+
+def tags(tree: Tree, lang: Language | None = None) -> list[Tag]:
+    """Tags of a parsed tree, in source order."""
+
+class Symbol(NamedTuple):
+    """A definition stored in a SymbolIndex."""
+    path: str
+    kind: str
+    name: str
+    container: str | None
+    row: int
+    column: int
+
+class SymbolIndex:
+    """Definitions across many .sil files, persisted in SQLite."""
+    path: str
+    def __init__(self, path: str | PathLike[str]) -> None: ...
+    def refresh(self, paths: Iterable[str | PathLike[str]]) -> dict[str, int]:
+        """Reparse only files whose size, mtime and hash changed."""
+    def refresh_directory(self, directory: str | PathLike[str], pattern: str = "*.sil") -> dict[str, int]:
+        """refresh() a directory and drop files that are gone."""
+    def find(self, name: str, kind: str | None = None) -> list[Symbol]: ...
+    def symbols(self, path: str | PathLike[str] | None = None, kind: str | None = None) -> list[Symbol]: ...
+    def files(self) -> list[str]: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> SymbolIndex: ...
+    def __exit__(self, *exc: object) -> None: ...
@@ -0,0 +1,137 @@
+"""Parse many SilverScript sources at once.
+
+Sources are spread over a process pool; each worker builds one Parser on
+start-up and reuses it for every file it is handed. Results come back as
+small picklable summaries instead of trees, so only names and error
+spans cross process boundaries.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from tree_sitter import Language, Parser
+
+from ._binding import language
+
+# Below this many sources the pool costs more than it saves
+MIN_PARALLEL = 32
+
+
+class SyntaxIssue(NamedTuple):
+    """An ERROR node or a node the parser had to insert (MISSING)"""
+
+    kind: str
+    start: tuple
+    end: tuple
+
+
+class FileSummary(NamedTuple):
+    """What bulk parsing reports for one source"""
+
+    path: str | None
+    contract: str | None
+    entrypoints: tuple
+    functions: tuple
+    errors: tuple
+    read_error: str | None = None
+
+    @property
+    def ok(self):
+        return not self.errors and self.read_error is None
+
+
+_parser = None
+
+
+def _get_parser():
+    global _parser
+    if _parser is None:
+        _parser = Parser(Language(language()))
+    return _parser
+
+
+def _error_nodes(node):
+    """Yield (kind, node) for every ERROR and MISSING node under node"""
+    # Only descend into subtrees that contain an error
+    if node.is_error:
+        yield "error", node
+        return
+    if node.is_missing:
+        yield f"missing {node.type}", node
+        return
+    for child in node.children:
+        if child.has_error:
+            yield from _error_nodes(child)
+
+
+def summarize(tree, path=None):
+    """FileSummary of a parsed tree"""
+    root = tree.root_node
+    contract = None
+    entrypoints = []
+    functions = []
+    for node in root.named_children:
+        if node.type != "contract_definition":
+            continue
+        name = node.child_by_field_name("name")
+        contract = name.text.decode() if name is not None else None
+        for item in node.named_children:
+            if item.type != "contract_item":
+                continue
+            for function in item.named_children:
+                if function.type != "function_definition":
+                    continue
+                name = function.child_by_field_name("name")
+                if name is None:
+                    continue
+                functions.append(name.text.decode())
+                if function.children and function.children[0].type == "entrypoint":
+                    entrypoints.append(functions[-1])
+        break
+    errors = ()
+    if root.has_error:
+        errors = tuple(
+            SyntaxIssue(kind, tuple(node.start_point), tuple(node.end_point)) for kind, node in _error_nodes(root)
+        )
+    return FileSummary(path, contract, tuple(entrypoints), tuple(functions), errors)
+
+
+def parse_source(source):
+    """Parse one source and summarize it.
+
+    source is a path, raw bytes, or a (name, bytes) pair."""
+    if isinstance(source, tuple):
+        path, data = source
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        path, data = None, bytes(source)
+    else:
+        path = os.fspath(source)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            return FileSummary(path, None, (), (), (), read_error=str(e))
+    return summarize(_get_parser().parse(data), path)
+
+
+def parse_many(sources, workers=None, chunksize=16):
+    """Yield a FileSummary per source, in input order.
+
+    workers defaults to the CPU count; workers=1 (or a short input)
+    parses in this process with a single reused Parser."""
+    sources = list(sources)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sources) < MIN_PARALLEL:
+        for source in sources:
+            yield parse_source(source)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_get_parser) as pool:
+        yield from pool.map(parse_source, sources, chunksize=chunksize)
+
+
+def parse_directory(directory, pattern="*.sil", workers=None, chunksize=16):
+    """parse_many over every file under directory matching pattern"""
+    paths = sorted(str(p) for p in Path(directory).rglob(pattern) if p.is_file())
+    return parse_many(paths, workers, chunksize)
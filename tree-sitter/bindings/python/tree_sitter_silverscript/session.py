@@ -0,0 +1,157 @@
+"""Incremental reparsing for live editing.
+
+An EditSession keeps the current source and tree. Each edit is applied
+to the old tree as an InputEdit and parsed against it, so tree-sitter
+only re-examines the changed region. Each edit reports the ranges whose
+syntax changed and the diagnostics that appeared or went away.
+
+Reparsing is proportional to the edit. Splicing the buffer and locating
+the edit's row/column are still linear in the source, though as bytes
+operations (copy, count) rather than Python loops.
+"""
+
+import re
+import time
+from bisect import bisect_right
+from typing import NamedTuple
+
+from tree_sitter import Language, Parser
+
+from ._binding import language
+from .bulk import _error_nodes
+
+_NEWLINE = re.compile(b"\n")
+
+
+class Diagnostic(NamedTuple):
+    """A syntax error or missing node, with byte and (row, column) spans"""
+
+    kind: str
+    start_byte: int
+    end_byte: int
+    start: tuple
+    end: tuple
+
+
+class EditResult(NamedTuple):
+    """What one edit changed"""
+
+    changed_ranges: tuple  # ((start_byte, end_byte, start, end), ...)
+    added: tuple  # new Diagnostics
+    removed: tuple  # Diagnostics that no longer apply (old positions)
+    parse_seconds: float
+
+
+def _point(text, offset):
+    row = text.count(b"\n", 0, offset)
+    return row, offset - (text.rfind(b"\n", 0, offset) + 1)
+
+
+def _common_prefix(a, b):
+    # Binary search on slice equality: memcmp speed instead of a Python loop
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class EditSession:
+    """A source buffer and its syntax tree, kept in step edit by edit"""
+
+    def __init__(self, source=b"", parser=None):
+        self.parser = parser or Parser(Language(language()))
+        self.text = source.encode() if isinstance(source, str) else bytes(source)
+        self.tree = self.parser.parse(self.text)
+        self.diagnostics = self._collect()
+        self._line_starts = None
+
+    def _collect(self):
+        root = self.tree.root_node
+        if not root.has_error:
+            return ()
+        return tuple(
+            Diagnostic(kind, node.start_byte, node.end_byte, tuple(node.start_point), tuple(node.end_point))
+            for kind, node in _error_nodes(root)
+        )
+
+    def _point(self, offset):
+        # replace() has already indexed the lines; otherwise counting
+        # newlines once is cheaper than building the index for one lookup
+        if self._line_starts is None:
+            return _point(self.text, offset)
+        row = bisect_right(self._line_starts, offset) - 1
+        return row, offset - self._line_starts[row]
+
+    def edit(self, start_byte, old_end_byte, new_text):
+        """Replace text[start_byte:old_end_byte] with new_text and reparse"""
+        if isinstance(new_text, str):
+            new_text = new_text.encode()
+        if not 0 <= start_byte <= old_end_byte <= len(self.text):
+            raise ValueError(f"edit range {start_byte}..{old_end_byte} is outside the {len(self.text)}-byte source")
+        old_text = self.text
+        new_end_byte = start_byte + len(new_text)
+        start_point = self._point(start_byte)
+        old_end_point = self._point(old_end_byte)
+        lines = new_text.count(b"\n")
+        if lines:
+            new_end_point = (start_point[0] + lines, len(new_text) - new_text.rfind(b"\n") - 1)
+        else:
+            new_end_point = (start_point[0], start_point[1] + len(new_text))
+
+        old_tree = self.tree
+        old_tree.edit(start_byte, old_end_byte, new_end_byte, start_point, old_end_point, new_end_point)
+        self.text = old_text[:start_byte] + new_text + old_text[old_end_byte:]
+        started = time.perf_counter()
+        self.tree = self.parser.parse(self.text, old_tree)
+        elapsed = time.perf_counter() - started
+        self._line_starts = None
+
+        changed = tuple(
+            (r.start_byte, r.end_byte, tuple(r.start_point), tuple(r.end_point))
+            for r in old_tree.changed_ranges(self.tree)
+        )
+        old_diagnostics = self.diagnostics
+        self.diagnostics = self._collect()
+
+        # Map old diagnostics through the edit; ones touching it count as gone
+        delta = new_end_byte - old_end_byte
+        mapped = []
+        for d in old_diagnostics:
+            if d.end_byte < start_byte:
+                mapped.append((d, (d.kind, d.start_byte, d.end_byte)))
+            elif d.start_byte > old_end_byte:
+                mapped.append((d, (d.kind, d.start_byte + delta, d.end_byte + delta)))
+            else:
+                mapped.append((d, None))
+        surviving = {key for _, key in mapped if key}
+        current = {(d.kind, d.start_byte, d.end_byte) for d in self.diagnostics}
+        added = tuple(d for d in self.diagnostics if (d.kind, d.start_byte, d.end_byte) not in surviving)
+        removed = tuple(d for d, key in mapped if key not in current)
+        return EditResult(changed, added, removed, elapsed)
+
+    def byte_offset(self, point):
+        """Byte offset of a (row, column) point, column counted in bytes"""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in _NEWLINE.finditer(self.text)]
+        row, column = point
+        if not 0 <= row < len(self._line_starts):
+            raise ValueError(f"row {row} is outside the {len(self._line_starts)}-line source")
+        return min(self._line_starts[row] + column, len(self.text))
+
+    def replace(self, start, end, new_text):
+        """edit() addressed by (row, column) points, as editors send them"""
+        return self.edit(self.byte_offset(start), self.byte_offset(end), new_text)
+
+    def set_text(self, source):
+        """Switch to a whole new buffer, reparsing only the span that differs
+        (for editors that sync full documents)"""
+        new = source.encode() if isinstance(source, str) else bytes(source)
+        old = self.text
+        prefix = _common_prefix(old, new)
+        limit = min(len(old), len(new)) - prefix
+        suffix = _common_prefix(old[::-1][:limit], new[::-1][:limit])
+        return self.edit(prefix, len(old) - suffix, new[prefix:len(new) - suffix])
@@ -0,0 +1,237 @@
+"""Compiled queries, tags and a persistent symbol index.
+
+query() compiles each queries/*.scm file once per Language and hands the
+same Query back on every later call. tags() runs TAGS_QUERY over a tree.
+SymbolIndex keeps the definitions from many files in SQLite and reparses
+a file only when its size, mtime and content hash say it changed.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+from tree_sitter import Language, Query
+
+try:
+    from tree_sitter import QueryCursor
+except ImportError:  # tree-sitter 0.24: matches() lives on Query
+    QueryCursor = None
+
+from ._binding import language
+from .bulk import _get_parser
+
+QUERY_NAMES = ("highlights", "injections", "locals", "tags")
+
+_language = None
+_queries = {}
+_lock = threading.Lock()
+
+
+def get_language():
+    """The SilverScript Language, created once"""
+    global _language
+    if _language is None:
+        _language = Language(language())
+    return _language
+
+
+def query(name, lang=None):
+    """Compiled Query for queries/<name>.scm, cached per Language"""
+    if name not in QUERY_NAMES:
+        raise ValueError(f"unknown query {name!r} (expected one of {', '.join(QUERY_NAMES)})")
+    lang = lang or get_language()
+    key = (lang, name)
+    compiled = _queries.get(key)
+    if compiled is None:
+        text = getattr(sys.modules[__package__], f"{name.upper()}_QUERY")
+        if text is None:
+            raise ValueError(f"queries/{name}.scm is not installed")
+        with _lock:
+            compiled = _queries.get(key)
+            if compiled is None:
+                compiled = _queries[key] = Query(lang, text)
+    return compiled
+
+
+def matches(compiled, node):
+    """[(pattern index, {capture: [nodes]})] across tree-sitter versions"""
+    if QueryCursor is None:
+        return compiled.matches(node)
+    return QueryCursor(compiled).matches(node)
+
+
+class Tag(NamedTuple):
+    """A definition or reference found by TAGS_QUERY"""
+
+    kind: str  # class, function, constant, field, parameter, call
+    role: str  # definition or reference
+    name: str
+    container: str | None  # enclosing function or contract
+    start: tuple
+    end: tuple
+
+
+def _container(node):
+    parent = node.parent
+    while parent is not None:
+        if parent.type in ("function_definition", "contract_definition"):
+            name = parent.child_by_field_name("name")
+            return name.text.decode() if name is not None else None
+        parent = parent.parent
+    return None
+
+
+def tags(tree, lang=None):
+    """Tags of a parsed tree, in source order"""
+    found = []
+    for _, captures in matches(query("tags", lang), tree.root_node):
+        names = captures.get("name")
+        if not names:
+            continue
+        for capture, nodes in captures.items():
+            role, _, kind = capture.partition(".")
+            if role not in ("definition", "reference") or not kind:
+                continue
+            name = names[0]
+            found.append(Tag(kind, role, name.text.decode(), _container(nodes[0]),
+                             tuple(name.start_point), tuple(name.end_point)))
+    found.sort(key=lambda tag: tag.start)
+    return found
+
+
+class Symbol(NamedTuple):
+    """A definition stored in a SymbolIndex"""
+
+    path: str
+    kind: str
+    name: str
+    container: str | None
+    row: int
+    column: int
+
+
+class SymbolIndex:
+    """Definitions across many .sil files, persisted in SQLite"""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT);
+            CREATE TABLE IF NOT EXISTS symbols (
+                path TEXT, kind TEXT, name TEXT, container TEXT, row INTEGER, col INTEGER);
+            CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+            CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+        """)
+
+    def refresh(self, paths):
+        """Bring the given files up to date; returns counts of parsed,
+        unchanged and removed (no longer readable) files"""
+        stats = {"parsed": 0, "unchanged": 0, "removed": 0}
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for path in paths:
+                    stats[self._refresh_file(os.path.abspath(path))] += 1
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return stats
+
+    def refresh_directory(self, directory, pattern="*.sil"):
+        """refresh() every matching file under directory and drop files
+        that were indexed there but are gone"""
+        directory = os.path.abspath(directory)
+        paths = sorted(str(p) for p in Path(directory).rglob(pattern) if p.is_file())
+        stats = self.refresh(paths)
+        current = set(paths)
+        prefix = directory.rstrip(os.sep) + os.sep
+        with self._lock:
+            known = [row[0] for row in self._db.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix))]
+            gone = [path for path in known if path not in current]
+            if gone:
+                self._db.execute("BEGIN")
+                for path in gone:
+                    self._forget(path)
+                self._db.execute("COMMIT")
+        stats["removed"] += len(gone)
+        return stats
+
+    def _forget(self, path):
+        self._db.execute("DELETE FROM files WHERE path = ?", (path,))
+        self._db.execute("DELETE FROM symbols WHERE path = ?", (path,))
+
+    def _refresh_file(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._forget(path)
+            return "removed"
+        row = self._db.execute("SELECT size, mtime_ns, sha256 FROM files WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return "unchanged"
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._forget(path)
+            return "removed"
+        digest = hashlib.sha256(data).hexdigest()
+        if row and row[2] == digest:
+            # Touched but not edited
+            self._db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                             (st.st_size, st.st_mtime_ns, path))
+            return "unchanged"
+        self._forget(path)
+        self._db.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (path, st.st_size, st.st_mtime_ns, digest))
+        self._db.executemany(
+            "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?)",
+            [(path, tag.kind, tag.name, tag.container, tag.start[0], tag.start[1])
+             for tag in tags(_get_parser().parse(data)) if tag.role == "definition"])
+        return "parsed"
+
+    def find(self, name, kind=None):
+        """Every definition called name, optionally of one kind"""
+        sql = "SELECT path, kind, name, container, row, col FROM symbols WHERE name = ?"
+        params = [name]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        with self._lock:
+            return [Symbol(*row) for row in self._db.execute(sql + " ORDER BY path, row, col", params)]
+
+    def symbols(self, path=None, kind=None):
+        """Definitions in one file (or all files), optionally of one kind"""
+        sql = "SELECT path, kind, name, container, row, col FROM symbols WHERE 1"
+        params = []
+        if path is not None:
+            sql += " AND path = ?"
+            params.append(os.path.abspath(path))
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        with self._lock:
+            return [Symbol(*row) for row in self._db.execute(sql + " ORDER BY path, row, col", params)]
+
+    def files(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT path FROM files ORDER BY path")]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,17 @@
+(contract_definition
+  name: (identifier) @name) @definition.class
+
+(function_definition
+  name: (identifier) @name) @definition.function
+
+(constant_definition
+  name: (identifier) @name) @definition.constant
+
+(contract_field_definition
+  name: (identifier) @name) @definition.field
+
+(parameter
+  (identifier) @name) @definition.parameter
+
+(function_call
+  (identifier) @name) @reference.call